@@ -1,5 +1,7 @@
+from .base_collector import BaseCollector
 from .mongodb_collector import MongoDBCollector
 from .newrelic_collector import NewRelicCollector
 from .postgres_collector import PostgresCollector
+from .runner import CollectorRunner
 
-__all__ = ['MongoDBCollector', 'NewRelicCollector', 'PostgresCollector']
+__all__ = ['BaseCollector', 'MongoDBCollector', 'NewRelicCollector', 'PostgresCollector', 'CollectorRunner']
@@ -1,123 +1,296 @@
-import logging
-from typing import Dict, Any, List
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Iterator, List, Optional
 import pandas as pd
+import pyarrow as pa
+import logging
 from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import ConnectionError, OperationFailure
-from .base_collector import BaseCollector
+from ..utils.arrow_utils import RAW_METRIC_SCHEMA, frame_to_record_batch
+from ..utils.health import HealthRegistry
+from ..utils.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
-class MongoDBCollector(BaseCollector):
-    """Collects metrics from MongoDB."""
+class BaseCollector(ABC):
+    """Base class for all collectors."""
+
+    # Columns every collected chunk must carry; set by subclasses
+    output_columns: List[str] = ['timestamp', 'value']
+
+    # Source columns mapped onto RAW_METRIC_SCHEMA's metric_name and metadata
+    metric_column: str = 'metric_name'
+    metadata_column: str = 'metadata'
 
     def __init__(self, config: Dict[str, Any]):
-        """Initialize MongoDB collector.
+        """Initialize base collector.
+
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        self.metrics = {
+            'last_collection_time': None,
+            'records_collected': 0,
+            'collection_errors': 0,
+            'average_collection_time': 0
+        }
+        self._collection_count = 0
+        self.health = HealthRegistry.get_instance(config)
+
+        # Watermarks and snapshots staged by collect_iter(); persisted by commit_state()
+        self.state = StateStore(config)
+        self.auto_commit = True
+        self._pending_state = {}
+
+    @abstractmethod
+    def collect_iter(self, chunk_rows: Optional[int] = None, commit: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+        """Stream collected data in fixed-size chunks.
+
+        Args:
+            chunk_rows: Maximum rows per chunk
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+
+        Yields:
+            pd.DataFrame: Collected data chunk
+
+        Raises:
+            NotImplementedError: Must be implemented by subclasses
+        """
+        raise NotImplementedError("Collectors must implement collect_iter method")
+
+    def combine_chunks(self, chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """Combine streamed chunks into a single DataFrame.
+
+        Args:
+            chunks: Chunks yielded by ``collect_iter()``
+
+        Returns:
+            pd.DataFrame: Collected data
+        """
+        if not chunks:
+            return pd.DataFrame(columns=self.output_columns)
+        return pd.concat(chunks, ignore_index=True)
+
+    def collect(self) -> pd.DataFrame:
+        """Collect data from the source.
+
+        Returns:
+            pd.DataFrame: Collected data
+
+        Raises:
+            Exception: If collection fails
+        """
+        return self.combine_chunks(list(self.collect_iter()))
+
+    def to_record_batch(self, df: pd.DataFrame, extra: Optional[Dict[str, str]] = None) -> pa.RecordBatch:
+        """Convert a collected chunk into ``RAW_METRIC_SCHEMA``.
         
         Args:
-            config: Configuration dictionary containing MongoDB connection details
+            df: Chunk yielded by ``collect_iter()``
+            extra: Entries added to every row's metadata
+        
+        Returns:
+            pa.RecordBatch: Metrics batch
         """
-        super().__init__(config)
-        self.uri = config['collectors']['mongodb']['uri']
-        self.database = config['collectors']['mongodb']['database']
-        self.collection = config['collectors']['mongodb']['collection']
-        self.batch_size = config['collectors'].get('batch_size', 1000)
+        return frame_to_record_batch(df, self.metric_column, self.metadata_column, extra)
 
-    def connect(self) -> MongoClient:
-        """Create MongoDB connection.
+    def collect_arrow_iter(
+        self,
+        chunk_rows: Optional[int] = None,
+        commit: Optional[bool] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream collected data as Arrow record batches in ``RAW_METRIC_SCHEMA``.
+        
+        The default converts each ``collect_iter()`` chunk once; collectors
+        that receive columnar data override this to build batches directly.
+        
+        Args:
+            chunk_rows: Maximum rows per batch
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pa.RecordBatch: Collected metrics batch
+        """
+        for df in self.collect_iter(chunk_rows, commit=commit):
+            yield self.to_record_batch(df)
+
+    def collect_arrow(self) -> pa.Table:
+        """Collect data from the source as an Arrow table.
         
         Returns:
-            MongoClient: MongoDB client instance
+            pa.Table: Collected data in ``RAW_METRIC_SCHEMA``
         
         Raises:
-            ConnectionError: If connection fails
+            Exception: If collection fails
         """
-        try:
-            return MongoClient(self.uri)
-        except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            raise ConnectionError(f"MongoDB connection failed: {str(e)}")
+        return pa.Table.from_batches(list(self.collect_arrow_iter()), schema=RAW_METRIC_SCHEMA)
 
-    def collect(self) -> pd.DataFrame:
-        """Collect metrics from MongoDB.
+    def validate_batch(self, batch: pa.RecordBatch) -> bool:
+        """Validate a collected record batch.
+        
+        Args:
+            batch: Record batch to validate
         
         Returns:
-            pd.DataFrame: Collected metrics data
+            bool: True if validation passes
         
         Raises:
-            ConnectionError: If connection fails
-            OperationFailure: If query fails
-            ValueError: If data validation fails
-        """
-        start_time = datetime.now()
-        client = None
-        try:
-            client = self.connect()
-            db = client[self.database]
-            collection = db[self.collection]
-
-            # Query metrics with batch processing
-            metrics = []
-            cursor = collection.find(
-                {},
-                batch_size=self.batch_size
-            )
-
-            for document in cursor:
-                metrics.append({
-                    'timestamp': document['timestamp'],
-                    'metric_id': document['metric_id'],
-                    'value': document['value'],
-                    'metadata': document['metadata']
-                })
-
-            # Convert to DataFrame
-            if not metrics:
-                df = pd.DataFrame(columns=['timestamp', 'metric_id', 'value', 'metadata'])
-                self.update_metrics(start_time, 0)
-                return df
-
-            df = pd.DataFrame(metrics)
-            
-            # Validate data types
-            if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Validate the collected data
-            self.validate_data(df)
-            
-            # Update metrics
-            self.update_metrics(start_time, len(df))
-            
-            return df
-
-        except (ConnectionError, OperationFailure) as e:
-            self.update_metrics(start_time, 0, error=True)
-            logger.error(f"MongoDB collection error: {str(e)}")
-            raise
-        except Exception as e:
-            self.update_metrics(start_time, 0, error=True)
-            logger.error(f"Unexpected error in MongoDB collector: {str(e)}")
-            raise
-        finally:
-            if client:
-                client.close()
-
-    def health_check(self) -> bool:
-        """Check MongoDB connection health.
-        
+            ValueError: If the batch does not match ``RAW_METRIC_SCHEMA``
+        """
+        if not batch.schema.equals(RAW_METRIC_SCHEMA):
+            raise ValueError(f"Record batch schema does not match RAW_METRIC_SCHEMA: {batch.schema}")
+        return True
+
+    def validate_data(self, df: pd.DataFrame) -> bool:
+        """Validate a collected chunk.
+
+        Args:
+            df: DataFrame to validate
+
         Returns:
-            bool: True if connection is healthy
+            bool: True if validation passes
+
+        Raises:
+            ValueError: If validation fails
         """
-        client = None
-        try:
-            client = self.connect()
-            # Try to execute a simple command
-            client.admin.command('ping')
+        missing_columns = set(self.output_columns) - set(df.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        if df.empty:
             return True
-        except Exception as e:
-            logger.error(f"MongoDB health check failed: {str(e)}")
-            return False
-        finally:
-            if client:
-                client.close()
+
+        # Validate data types
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            raise ValueError("timestamp column must be datetime type")
+
+        if not pd.api.types.is_numeric_dtype(df['value']):
+            raise ValueError("value column must be numeric type")
+
+        return True
+
+    def stage_state(self, key: str, value: Any) -> None:
+        """Stage a state value to persist once the current collection is committed.
+
+        Args:
+            key: State key
+            value: JSON-serializable value
+        """
+        self._pending_state[key] = value
+
+    def discard_state(self, key: Optional[str] = None) -> None:
+        """Drop staged state so it is never committed.
+
+        Args:
+            key: State key to drop (defaults to everything staged)
+        """
+        if key is None:
+            self._pending_state = {}
+        else:
+            self._pending_state.pop(key, None)
+
+    def should_commit(self, commit: Optional[bool]) -> bool:
+        """Whether a stream commits its staged state once exhausted.
+
+        Args:
+            commit: Flag passed to ``collect_iter()``; None falls back to ``auto_commit``
+
+        Returns:
+            bool: True if the stream should call ``commit_state()``
+        """
+        return self.auto_commit if commit is None else commit
+
+    def commit_state(self) -> None:
+        """Persist the watermarks and snapshots staged by the last successful collection.
+
+        Called automatically once ``collect_iter()`` is exhausted unless
+        ``auto_commit_watermark`` is disabled or the stream was started with
+        ``commit=False``, in which case the caller should commit once the
+        collected batch has been stored.
+        """
+        for key, value in list(self._pending_state.items()):
+            self.state.save(key, value)
+        self._pending_state = {}
+
+    def update_metrics(self, start_time: datetime, records: int, error: bool = False) -> None:
+        """Update collector metrics.
+
+        Args:
+            start_time: Collection start time
+            records: Number of records collected
+            error: Whether an error occurred
+        """
+        end_time = datetime.now()
+        collection_time = (end_time - start_time).total_seconds()
+
+        self.metrics['last_collection_time'] = end_time
+        self.metrics['records_collected'] += records
+
+        if error:
+            self.metrics['collection_errors'] += 1
+
+        # Update average collection time
+        self._collection_count += 1
+        self.metrics['average_collection_time'] = (
+            (self.metrics['average_collection_time'] * (self._collection_count - 1) + collection_time)
+            / self._collection_count
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get collector metrics.
+
+        Returns:
+            Dict[str, Any]: Collector metrics
+        """
+        return self.metrics
+
+    def reset_metrics(self) -> None:
+        """Reset collector metrics."""
+        self.metrics = {
+            'last_collection_time': None,
+            'records_collected': 0,
+            'collection_errors': 0,
+            'average_collection_time': 0
+        }
+        self._collection_count = 0
+
+    @property
+    def health_key(self) -> str:
+        """Dependency name under which probe results and the circuit breaker are kept."""
+        return f"{self.__class__.__name__}@{id(self):x}"
+
+    @abstractmethod
+    def probe(self) -> bool:
+        """Run a cheap, read-only check against the source.
+        
+        Returns:
+            bool: True if the source is reachable
+        
+        Raises:
+            NotImplementedError: Must be implemented by subclasses
+        """
+        raise NotImplementedError("Collectors must implement probe method")
+
+    def health_check(self, force: bool = False) -> bool:
+        """Check collector health, reusing a recent probe result.
+        
+        A source whose circuit is open is reported unhealthy without being probed.
+        
+        Args:
+            force: Probe even if a cached result is still fresh
+        
+        Returns:
+            bool: True if the source is reachable
+        """
+        return self.health.check(self.health_key, self.probe, force)
+
+    def __str__(self) -> str:
+        """String representation of the collector.
+
+        Returns:
+            str: Collector description
+        """
+        return (
+            f"{self.__class__.__name__}("
+            f"records={self.metrics['records_collected']}, "
+            f"errors={self.metrics['collection_errors']})"
+        )
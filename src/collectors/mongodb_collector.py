@@ -1,16 +1,71 @@
 import logging
-from typing import Dict, Any, List
+import re
+from collections import deque
+from itertools import chain
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import ConnectionError, OperationFailure
+from functools import partial
+import threading
+import time
+import bson
+from bson import json_util
+from bson.codec_options import CodecOptions, DatetimeConversion
+import pymongo
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from .base_collector import BaseCollector
+from ..utils.connection_registry import ConnectionRegistry
+from ..utils.fan_out import fan_out
 
 logger = logging.getLogger(__name__)
 
+METRIC_COLUMNS = ['timestamp', 'metric_id', 'value', 'metadata']
+
+# Server-side projection: only the fields the pipeline uses (plus _id for the watermark)
+METRIC_PROJECTION = {'timestamp': 1, 'metric_id': 1, 'value': 1, 'metadata': 1}
+
+AGGREGATED_COLUMNS = [
+    'timestamp', 'metric_name', 'dimensions', 'value', 'value_min', 'value_max', 'value_count'
+]
+
+# pandas offset aliases -> $dateTrunc units
+WINDOW_UNITS = {
+    's': 'second', 'S': 'second', 'sec': 'second',
+    'T': 'minute', 'min': 'minute',
+    'H': 'hour', 'h': 'hour',
+    'D': 'day', 'd': 'day',
+    'W': 'week',
+    'M': 'month', 'MS': 'month'
+}
+
+# Decode BSON datetimes as raw epoch milliseconds instead of datetime objects
+RAW_CODEC_OPTIONS = CodecOptions(datetime_conversion=DatetimeConversion.DATETIME_MS)
+
+def parse_window(window: str) -> Tuple[int, str]:
+    """Translate a pandas-style window (e.g. ``15min``) into a $dateTrunc bin.
+
+    Args:
+        window: Aggregation window
+
+    Returns:
+        Tuple[int, str]: Bin size and $dateTrunc unit
+
+    Raises:
+        ValueError: If the window cannot be expressed with $dateTrunc
+    """
+    match = re.fullmatch(r'\s*(\d*)\s*([A-Za-z]+)\s*', window)
+    if not match or match.group(2) not in WINDOW_UNITS:
+        raise ValueError(f"Unsupported aggregation window: {window}")
+    return int(match.group(1) or 1), WINDOW_UNITS[match.group(2)]
+
 class MongoDBCollector(BaseCollector):
     """Collects metrics from MongoDB."""
 
+    output_columns = METRIC_COLUMNS
+    metric_column = 'metric_id'
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize MongoDB collector.
         
@@ -22,74 +77,441 @@ class MongoDBCollector(BaseCollector):
         self.database = config['collectors']['mongodb']['database']
         self.collection = config['collectors']['mongodb']['collection']
         self.batch_size = config['collectors'].get('batch_size', 1000)
+        self.chunk_rows = config['collectors'].get('chunk_rows', 50000)
+        self.incremental = config['collectors']['mongodb'].get('incremental', True)
+        self.auto_commit = config['collectors']['mongodb'].get('auto_commit_watermark', True)
+        self.raw_batches = config['collectors']['mongodb'].get('raw_batches', False)
+        self.parallel_scans = config['collectors']['mongodb'].get('parallel_scans', 1)
+        self.partition_field = config['collectors']['mongodb'].get('partition_field', 'timestamp')
+        self.read_preference = config['collectors']['mongodb'].get('read_preference')
+        self.prefetch_chunks = config['collectors']['mongodb'].get('prefetch_chunks', 2)
+        if self.partition_field not in ('timestamp', '_id'):
+            raise ValueError(f"Unsupported MongoDB partition field: {self.partition_field}")
+        self.connections = ConnectionRegistry.get_instance(config)
+        self.watermark_key = f"mongodb.{self.database}.{self.collection}.watermark"
+        self.resume_token_key = f"mongodb.{self.database}.{self.collection}.resume_token"
+
+        tail_config = config['collectors']['mongodb'].get('tail', {})
+        self.tail_max_batch_rows = tail_config.get('max_batch_rows', 1000)
+        self.tail_max_batch_seconds = tail_config.get('max_batch_seconds', 5)
+
+    def load_watermark(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted high-watermark for this collection.
+
+        Returns:
+            Optional[Dict[str, Any]]: Last ``timestamp``/``_id`` pair, or None on first run
+        """
+        raw = self.state.load(self.watermark_key)
+        if raw is None:
+            return None
+        return json_util.loads(raw)
+
+    def reset_watermark(self) -> None:
+        """Forget the watermark so the next run rescans the whole collection."""
+        self.state.delete(self.watermark_key)
+        self.discard_state(self.watermark_key)
+
+    def build_query(self, watermark: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build a range query for documents strictly past the watermark.
+
+        Documents are ordered by ``(timestamp, _id)``; the ``_id`` tie-breaker
+        keeps documents sharing the watermark timestamp from being skipped or
+        re-read. Served by a compound index on ``{timestamp: 1, _id: 1}``.
+
+        Args:
+            watermark: Last ``timestamp``/``_id`` pair, or None
+
+        Returns:
+            Dict[str, Any]: MongoDB filter
+        """
+        if not watermark:
+            return {}
+        return {
+            '$or': [
+                {'timestamp': {'$gt': watermark['timestamp']}},
+                {
+                    'timestamp': watermark['timestamp'],
+                    '_id': {'$gt': watermark['_id']}
+                }
+            ]
+        }
 
     def connect(self) -> MongoClient:
-        """Create MongoDB connection.
+        """Get the shared, pooled MongoDB client for this collector's URI.
         
         Returns:
-            MongoClient: MongoDB client instance
+            MongoClient: MongoDB client instance (owned by the connection registry)
         
         Raises:
             ConnectionError: If connection fails
         """
         try:
-            return MongoClient(self.uri)
+            options = {}
+            if self.read_preference:
+                # e.g. secondaryPreferred to move scan load onto secondaries
+                options['readPreference'] = self.read_preference
+            return self.connections.get_mongo_client(self.uri, **options)
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise ConnectionError(f"MongoDB connection failed: {str(e)}")
 
-    def collect(self) -> pd.DataFrame:
-        """Collect metrics from MongoDB.
-        
+    def _sort_spec(self) -> List[Tuple[str, int]]:
+        """Sort order matching the watermark key."""
+        return [('timestamp', ASCENDING), ('_id', ASCENDING)]
+
+    def _iter_documents(
+        self,
+        collection,
+        query: Dict[str, Any],
+        chunk_rows: int
+    ) -> Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        """Read matching documents one at a time through a regular cursor.
+
+        Args:
+            collection: MongoDB collection
+            query: MongoDB filter
+            chunk_rows: Maximum rows per chunk
+
+        Yields:
+            Tuple[pd.DataFrame, Optional[Dict[str, Any]]]: Metrics chunk and its last document
+        """
+        metrics = []
+        cursor = collection.find(
+            query,
+            projection=METRIC_PROJECTION,
+            sort=self._sort_spec(),
+            batch_size=self.batch_size
+        )
+
+        for document in cursor:
+            metrics.append({
+                'timestamp': document['timestamp'],
+                'metric_id': document['metric_id'],
+                'value': document['value'],
+                'metadata': document['metadata']
+            })
+            if len(metrics) >= chunk_rows:
+                yield pd.DataFrame(metrics, columns=METRIC_COLUMNS), document
+                metrics = []
+            last_document = document
+
+        if metrics:
+            yield pd.DataFrame(metrics, columns=METRIC_COLUMNS), last_document
+
+    def _iter_raw_batches(
+        self,
+        collection,
+        query: Dict[str, Any],
+        chunk_rows: int
+    ) -> Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        """Read matching documents as raw BSON batches copied into typed arrays.
+
+        Documents are still decoded into one dict each by ``bson.decode_all``;
+        what this path avoids is ``datetime`` objects (datetimes stay epoch
+        milliseconds) and building chunks from row dicts. Timestamps and
+        values are copied into int64/float64 arrays per batch, and each
+        chunk's arrays are concatenated once, when the chunk is emitted.
+
+        Args:
+            collection: MongoDB collection
+            query: MongoDB filter
+            chunk_rows: Maximum rows per chunk
+
+        Yields:
+            Tuple[pd.DataFrame, Optional[Dict[str, Any]]]: Metrics chunk and its last document
+        """
+        # Decoded batches not yet emitted: (timestamps, values, metric ids, metadata)
+        pending = deque()
+        buffered = 0
+        last_document = None
+
+        def build_chunk(rows: int) -> pd.DataFrame:
+            nonlocal buffered
+            parts = []
+            needed = rows
+            while needed:
+                batch = pending[0]
+                if len(batch[0]) <= needed:
+                    parts.append(pending.popleft())
+                    needed -= len(batch[0])
+                else:
+                    # Split the batch; array slices are views, so nothing is copied yet
+                    parts.append(tuple(column[:needed] for column in batch))
+                    pending[0] = tuple(column[needed:] for column in batch)
+                    needed = 0
+            buffered -= rows
+
+            timestamps, values, metric_ids, metadata = zip(*parts)
+            return pd.DataFrame({
+                'timestamp': pd.to_datetime(np.concatenate(timestamps), unit='ms'),
+                'metric_id': list(chain.from_iterable(metric_ids)),
+                'value': np.concatenate(values),
+                'metadata': list(chain.from_iterable(metadata))
+            }, columns=METRIC_COLUMNS)
+
+        cursor = collection.find_raw_batches(
+            query,
+            projection=METRIC_PROJECTION,
+            sort=self._sort_spec(),
+            batch_size=self.batch_size
+        )
+
+        for batch in cursor:
+            documents = bson.decode_all(batch, RAW_CODEC_OPTIONS)
+            if not documents:
+                continue
+
+            count = len(documents)
+            pending.append((
+                np.fromiter((int(doc['timestamp']) for doc in documents), dtype=np.int64, count=count),
+                np.fromiter((doc['value'] for doc in documents), dtype=np.float64, count=count),
+                [doc['metric_id'] for doc in documents],
+                [doc['metadata'] for doc in documents]
+            ))
+            buffered += count
+
+            while buffered >= chunk_rows:
+                # Only the final chunk of a batch ends on the batch's last document
+                remainder = buffered - chunk_rows
+                chunk_last = documents[count - 1 - remainder] if remainder < count else None
+                yield build_chunk(chunk_rows), self._raw_watermark(chunk_last)
+
+            last_document = documents[-1]
+
+        if buffered:
+            yield build_chunk(buffered), self._raw_watermark(last_document)
+
+    def _raw_watermark(self, document: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Convert a raw-decoded document into a watermark candidate."""
+        if document is None:
+            return None
+        return {
+            'timestamp': document['timestamp'].as_datetime(CodecOptions()),
+            '_id': document['_id']
+        }
+
+    def _iter_range(
+        self,
+        collection,
+        query: Dict[str, Any],
+        chunk_rows: int
+    ) -> Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        """Read one query range with the configured decoding path."""
+        if self.raw_batches:
+            return self._iter_raw_batches(collection, query, chunk_rows)
+        return self._iter_documents(collection, query, chunk_rows)
+
+    def _partition_bounds(self, collection, query: Dict[str, Any]) -> List[Tuple[Any, Any]]:
+        """Split the query space into disjoint ranges on the partition field.
+
+        Timestamp ranges are equal-width buckets between the first and last
+        matching timestamp. ``_id`` ranges come from ``$bucketAuto``, which
+        balances documents across buckets.
+
+        Args:
+            collection: MongoDB collection
+            query: MongoDB filter the ranges must cover
+
         Returns:
-            pd.DataFrame: Collected metrics data
-        
+            List[Tuple[Any, Any]]: Lower-inclusive bounds; the last upper bound is inclusive
+        """
+        if self.partition_field == '_id':
+            buckets = collection.aggregate([
+                {'$match': query},
+                {'$bucketAuto': {'groupBy': '$_id', 'buckets': self.parallel_scans}}
+            ])
+            return [(bucket['_id']['min'], bucket['_id']['max']) for bucket in buckets]
+
+        first = collection.find_one(query, projection={'timestamp': 1}, sort=[('timestamp', ASCENDING)])
+        last = collection.find_one(query, projection={'timestamp': 1}, sort=[('timestamp', DESCENDING)])
+        if first is None or last is None:
+            return []
+
+        low, high = first['timestamp'], last['timestamp']
+        if low == high:
+            return [(low, high)]
+
+        step = (high - low) / self.parallel_scans
+        edges = [low + step * i for i in range(self.parallel_scans)] + [high]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _partition_queries(self, collection, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build one filter per partition range.
+
+        Args:
+            collection: MongoDB collection
+            query: Base MongoDB filter
+
+        Returns:
+            List[Dict[str, Any]]: Disjoint filters covering the base filter
+        """
+        bounds = self._partition_bounds(collection, query)
+        queries = []
+        for i, (low, high) in enumerate(bounds):
+            upper = '$lte' if i == len(bounds) - 1 else '$lt'
+            range_filter = {self.partition_field: {'$gte': low, upper: high}}
+            queries.append({'$and': [query, range_filter]} if query else range_filter)
+        return queries
+
+    def _merge_by_timestamp(
+        self,
+        streams: List[Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]],
+        chunk_rows: int
+    ) -> Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        """Merge range streams that overlap in time into one stream in timestamp order.
+
+        Each stream is already sorted. Rows are released once every live
+        stream has buffered a later timestamp, so besides its prefetch queue
+        a stream holds at most the rows it has read past that frontier.
+
+        Args:
+            streams: Per-range chunk streams, each sorted by timestamp
+            chunk_rows: Maximum rows per chunk
+
+        Yields:
+            Tuple[pd.DataFrame, Optional[Dict[str, Any]]]: Metrics chunk and the furthest document read so far
+        """
+        buffers = [pd.DataFrame(columns=METRIC_COLUMNS) for _ in streams]
+        live = set(range(len(streams)))
+        # Last documents of the chunks read since the previous yield
+        candidates = []
+
+        def pull(i: int) -> None:
+            try:
+                df, last_document = next(streams[i])
+            except StopIteration:
+                live.discard(i)
+                return
+            if last_document is not None:
+                candidates.append(last_document)
+            buffers[i] = pd.concat([buffers[i], df], ignore_index=True) if len(buffers[i]) else df
+
+        try:
+            while True:
+                for i in sorted(live):
+                    while i in live and buffers[i].empty:
+                        pull(i)
+
+                # No live stream can still produce a row before the frontier
+                frontier = min((buffers[i]['timestamp'].iloc[-1] for i in live), default=None)
+                ready = []
+                for i, buffer in enumerate(buffers):
+                    cut = len(buffer) if frontier is None else buffer['timestamp'].searchsorted(frontier)
+                    if cut:
+                        ready.append(buffer.iloc[:cut])
+                        buffers[i] = buffer.iloc[cut:].reset_index(drop=True)
+
+                if ready:
+                    merged = pd.concat(ready, ignore_index=True).sort_values(
+                        'timestamp', kind='stable', ignore_index=True
+                    )
+                    for start in range(0, len(merged), chunk_rows):
+                        watermark = max(candidates, key=lambda doc: (doc['timestamp'], doc['_id']), default=None)
+                        candidates = []
+                        yield merged.iloc[start:start + chunk_rows].reset_index(drop=True), watermark
+
+                if frontier is None:
+                    return
+                # Streams ending at the frontier may still hold more rows with that timestamp
+                for i in sorted(live):
+                    if buffers[i]['timestamp'].iloc[-1] == frontier:
+                        pull(i)
+        finally:
+            for stream in streams:
+                stream.close()
+
+    def _iter_partitioned(
+        self,
+        collection,
+        query: Dict[str, Any],
+        chunk_rows: int
+    ) -> Iterator[Tuple[pd.DataFrame, Optional[Dict[str, Any]]]]:
+        """Read disjoint ranges concurrently, each on its own thread and cursor.
+
+        Every range feeds a bounded queue of ``prefetch_chunks`` chunks, so a
+        range that runs ahead blocks instead of buffering its whole result.
+        Timestamp ranges are yielded range by range in partition order;
+        ``_id`` ranges overlap in time and are merged by timestamp, so the
+        stream is in timestamp order either way.
+
+        Args:
+            collection: MongoDB collection
+            query: MongoDB filter
+            chunk_rows: Maximum rows per chunk
+
+        Yields:
+            Tuple[pd.DataFrame, Optional[Dict[str, Any]]]: Metrics chunk and its last document
+        """
+        queries = self._partition_queries(collection, query)
+        producers = [partial(self._iter_range, collection, range_query, chunk_rows) for range_query in queries]
+        if self.partition_field == 'timestamp':
+            return fan_out(producers, max_workers=len(producers), queue_size=self.prefetch_chunks, ordered=True)
+
+        streams = [fan_out([producer], max_workers=1, queue_size=self.prefetch_chunks) for producer in producers]
+        return self._merge_by_timestamp(streams, chunk_rows)
+
+    def collect_iter(self, chunk_rows: Optional[int] = None, commit: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+        """Stream metrics from MongoDB in fixed-size chunks.
+
+        The watermark only advances once the stream has been fully consumed.
+
+        Args:
+            chunk_rows: Maximum rows per chunk (defaults to ``collectors.chunk_rows``)
+            commit: Commit the watermark once exhausted (defaults to ``auto_commit``)
+
+        Yields:
+            pd.DataFrame: Collected metrics chunk
+
         Raises:
             ConnectionError: If connection fails
             OperationFailure: If query fails
             ValueError: If data validation fails
         """
+        chunk_rows = chunk_rows or self.chunk_rows
         start_time = datetime.now()
-        client = None
+        records = 0
         try:
             client = self.connect()
             db = client[self.database]
             collection = db[self.collection]
 
-            # Query metrics with batch processing
-            metrics = []
-            cursor = collection.find(
-                {},
-                batch_size=self.batch_size
-            )
+            # Only read documents past the persisted watermark
+            watermark = self.load_watermark() if self.incremental else None
+            query = self.build_query(watermark)
+
+            if self.parallel_scans > 1:
+                chunks = self._iter_partitioned(collection, query, chunk_rows)
+            else:
+                chunks = self._iter_range(collection, query, chunk_rows)
+
+            next_watermark = None
+            for df, last_document in chunks:
+                # Validate data types
+                if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+                # Validate the collected data
+                self.validate_data(df)
+
+                if last_document is not None and '_id' in last_document:
+                    candidate = {'timestamp': last_document['timestamp'], '_id': last_document['_id']}
+                    if next_watermark is None or (
+                        (candidate['timestamp'], candidate['_id'])
+                        > (next_watermark['timestamp'], next_watermark['_id'])
+                    ):
+                        next_watermark = candidate
+
+                records += len(df)
+                yield df
+
+            # Advance the watermark to the last document read
+            if self.incremental and next_watermark is not None:
+                self.stage_state(self.watermark_key, json_util.dumps(next_watermark))
+            if self.should_commit(commit):
+                self.commit_state()
 
-            for document in cursor:
-                metrics.append({
-                    'timestamp': document['timestamp'],
-                    'metric_id': document['metric_id'],
-                    'value': document['value'],
-                    'metadata': document['metadata']
-                })
-
-            # Convert to DataFrame
-            if not metrics:
-                df = pd.DataFrame(columns=['timestamp', 'metric_id', 'value', 'metadata'])
-                self.update_metrics(start_time, 0)
-                return df
-
-            df = pd.DataFrame(metrics)
-            
-            # Validate data types
-            if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Validate the collected data
-            self.validate_data(df)
-            
             # Update metrics
-            self.update_metrics(start_time, len(df))
-            
-            return df
+            self.update_metrics(start_time, records)
 
         except (ConnectionError, OperationFailure) as e:
             self.update_metrics(start_time, 0, error=True)
@@ -99,25 +521,240 @@ class MongoDBCollector(BaseCollector):
             self.update_metrics(start_time, 0, error=True)
             logger.error(f"Unexpected error in MongoDB collector: {str(e)}")
             raise
-        finally:
-            if client:
-                client.close()
 
-    def health_check(self) -> bool:
-        """Check MongoDB connection health.
-        
+    def build_aggregation_pipeline(
+        self,
+        window: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Compile window/metric/dimension grouping into an aggregation pipeline.
+
+        Args:
+            window: Aggregation window (e.g. ``1H``, ``5min``, ``1D``)
+            start: Inclusive lower timestamp bound
+            end: Exclusive upper timestamp bound
+
         Returns:
-            bool: True if connection is healthy
+            List[Dict[str, Any]]: MongoDB aggregation pipeline
         """
-        client = None
+        bin_size, unit = parse_window(window)
+
+        match = {}
+        if start is not None or end is not None:
+            match['timestamp'] = {}
+            if start is not None:
+                match['timestamp']['$gte'] = start
+            if end is not None:
+                match['timestamp']['$lt'] = end
+
+        return [
+            {'$match': match},
+            {'$group': {
+                '_id': {
+                    'timestamp': {
+                        '$dateTrunc': {'date': '$timestamp', 'unit': unit, 'binSize': bin_size}
+                    },
+                    'metric_name': '$metric_id',
+                    'dimensions': '$metadata'
+                },
+                'value': {'$avg': '$value'},
+                'value_min': {'$min': '$value'},
+                'value_max': {'$max': '$value'},
+                'value_count': {'$sum': {'$cond': [{'$isNumber': '$value'}, 1, 0]}}
+            }},
+            {'$project': {
+                '_id': 0,
+                'timestamp': '$_id.timestamp',
+                'metric_name': '$_id.metric_name',
+                'dimensions': '$_id.dimensions',
+                'value': 1,
+                'value_min': 1,
+                'value_max': 1,
+                'value_count': 1
+            }},
+            {'$sort': {'timestamp': 1, 'metric_name': 1}}
+        ]
+
+    def collect_aggregated(
+        self,
+        window: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Collect metrics pre-aggregated by MongoDB.
+
+        Grouping by window, metric and dimensions runs server-side, so only
+        one row per group crosses the network. Rows have the same shape as
+        ``UnifiedProcessor`` output. Outlier filtering is not applied, and
+        the incremental watermark is neither read nor advanced; pass
+        ``start``/``end`` to bound the scan to closed windows.
+
+        Args:
+            window: Aggregation window (defaults to ``processors.unified.aggregation_window``)
+            start: Inclusive lower timestamp bound
+            end: Exclusive upper timestamp bound
+
+        Returns:
+            pd.DataFrame: Aggregated metrics data
+
+        Raises:
+            ConnectionError: If connection fails
+            OperationFailure: If aggregation fails
+        """
+        window = window or self.config.get('processors', {}).get('unified', {}).get('aggregation_window', '1H')
+        start_time = datetime.now()
         try:
             client = self.connect()
-            # Try to execute a simple command
-            client.admin.command('ping')
-            return True
+            collection = client[self.database][self.collection]
+
+            cursor = collection.aggregate(
+                self.build_aggregation_pipeline(window, start, end),
+                allowDiskUse=True,
+                batchSize=self.batch_size
+            )
+            df = pd.DataFrame(list(cursor), columns=AGGREGATED_COLUMNS)
+            df['source'] = 'mongodb'
+            df = df[[
+                'timestamp', 'metric_name', 'source', 'dimensions',
+                'value', 'value_min', 'value_max', 'value_count'
+            ]]
+
+            if not df.empty:
+                df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+            self.update_metrics(start_time, len(df))
+            return df
+
+        except (ConnectionError, OperationFailure) as e:
+            self.update_metrics(start_time, 0, error=True)
+            logger.error(f"MongoDB aggregation error: {str(e)}")
+            raise
         except Exception as e:
-            logger.error(f"MongoDB health check failed: {str(e)}")
-            return False
-        finally:
-            if client:
-                client.close()
+            self.update_metrics(start_time, 0, error=True)
+            logger.error(f"Unexpected error in MongoDB aggregation: {str(e)}")
+            raise
+
+    def load_resume_token(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted change stream resume token.
+
+        Returns:
+            Optional[Dict[str, Any]]: Resume token, or None if tailing has never run
+        """
+        raw = self.state.load(self.resume_token_key)
+        if raw is None:
+            return None
+        return json_util.loads(raw)
+
+    def tail(
+        self,
+        handler: Callable[[pd.DataFrame], None],
+        stop_event: Optional[threading.Event] = None,
+        max_batch_rows: Optional[int] = None,
+        max_batch_seconds: Optional[float] = None
+    ) -> None:
+        """Continuously ingest inserted metric documents from a change stream.
+
+        Inserts are micro-batched and handed to ``handler`` whenever the batch
+        reaches ``max_batch_rows`` rows or ``max_batch_seconds`` has elapsed.
+        The resume token is persisted only after the handler returns, so a
+        restart resumes after the last delivered batch (at-least-once).
+        Tailing does not read or advance the polling watermark.
+
+        Args:
+            handler: Callable receiving each micro-batch DataFrame
+            stop_event: Event that ends tailing once set
+            max_batch_rows: Rows that trigger a flush (defaults to ``tail.max_batch_rows``)
+            max_batch_seconds: Seconds that trigger a flush (defaults to ``tail.max_batch_seconds``)
+
+        Raises:
+            ConnectionError: If connection fails
+            OperationFailure: If the change stream fails
+        """
+        max_batch_rows = max_batch_rows or self.tail_max_batch_rows
+        max_batch_seconds = max_batch_seconds or self.tail_max_batch_seconds
+        stop_event = stop_event or threading.Event()
+
+        pipeline = [
+            {'$match': {'operationType': 'insert'}},
+            {'$project': {f'fullDocument.{field}': 1 for field in METRIC_PROJECTION}}
+        ]
+
+        try:
+            collection = self.connect()[self.database][self.collection]
+            with collection.watch(
+                pipeline,
+                resume_after=self.load_resume_token(),
+                batch_size=self.batch_size,
+                max_await_time_ms=int(min(max_batch_seconds, 1.0) * 1000)
+            ) as stream:
+                metrics = []
+                batch_started = time.monotonic()
+
+                while not stop_event.is_set():
+                    change = stream.try_next()
+                    if change is not None:
+                        document = change['fullDocument']
+                        metrics.append({
+                            'timestamp': document['timestamp'],
+                            'metric_id': document['metric_id'],
+                            'value': document['value'],
+                            'metadata': document['metadata']
+                        })
+
+                    elapsed = time.monotonic() - batch_started
+                    if len(metrics) >= max_batch_rows or (metrics and elapsed >= max_batch_seconds):
+                        self._flush_tail_batch(metrics, handler, stream.resume_token)
+                        metrics = []
+                        batch_started = time.monotonic()
+                    elif not metrics:
+                        batch_started = time.monotonic()
+
+                # Deliver whatever arrived before the stop was requested
+                if metrics:
+                    self._flush_tail_batch(metrics, handler, stream.resume_token)
+
+        except (ConnectionError, OperationFailure) as e:
+            self.update_metrics(datetime.now(), 0, error=True)
+            logger.error(f"MongoDB change stream error: {str(e)}")
+            raise
+        except Exception as e:
+            self.update_metrics(datetime.now(), 0, error=True)
+            logger.error(f"Unexpected error tailing MongoDB: {str(e)}")
+            raise
+
+    def _flush_tail_batch(
+        self,
+        metrics: List[Dict[str, Any]],
+        handler: Callable[[pd.DataFrame], None],
+        resume_token: Optional[Dict[str, Any]]
+    ) -> None:
+        """Validate a micro-batch, hand it off, then persist the resume token."""
+        start_time = datetime.now()
+        df = pd.DataFrame(metrics, columns=METRIC_COLUMNS)
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+        self.validate_data(df)
+
+        handler(df)
+
+        if resume_token is not None:
+            self.state.save(self.resume_token_key, json_util.dumps(resume_token))
+        self.update_metrics(start_time, len(df))
+
+    @property
+    def health_key(self) -> str:
+        """Dependency name for health results and the circuit breaker."""
+        return f"mongodb.{self.database}"
+
+    def probe(self) -> bool:
+        """Ping MongoDB over the pooled client.
+        
+        Returns:
+            bool: True if the server answered within ``health.probe_timeout_seconds``
+        """
+        client = self.connect()
+        # Bound server selection so a dead host fails fast
+        with pymongo.timeout(self.health.probe_timeout):
+            client.admin.command('ping')
+        return True
@@ -1,16 +1,38 @@
+import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import pandas as pd
+import pyarrow as pa
 import requests
-from datetime import datetime, timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
 import backoff
+try:
+    import orjson
+except ImportError:  # optional: faster JSON decoding
+    orjson = None
 from .base_collector import BaseCollector
+from ..utils.arrow_utils import build_record_batch
+from ..utils.rate_limiter import get_token_bucket
+from ..utils.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+METRIC_COLUMNS = ['timestamp', 'name', 'value', 'attributes']
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised when NewRelic keeps answering 429 after all retries."""
+
 class NewRelicCollector(BaseCollector):
     """Collects metrics from NewRelic."""
 
+    output_columns = METRIC_COLUMNS
+    metric_column = 'name'
+    metadata_column = 'attributes'
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize NewRelic collector.
         
@@ -20,17 +42,244 @@ class NewRelicCollector(BaseCollector):
         super().__init__(config)
         self.api_key = config['collectors']['newrelic']['api_key']
         self.account_id = config['collectors']['newrelic']['account_id']
-        self.base_url = "https://api.newrelic.com/v2"
+        self.chunk_rows = config['collectors'].get('chunk_rows', 50000)
+        self._attributes = {}
+        self.metric_definitions = config['collectors']['newrelic'].get('metrics', [])
+
+        # Windowed fetching of the configured metrics; query_limit caps timeslices per metric per request
+        self.query_limit = config['collectors']['newrelic'].get('query_limit', 1000)
+        window_config = config['collectors']['newrelic'].get('window', {})
+        self.period = window_config.get('period_seconds', 60)
+        self.summarize = window_config.get('summarize', False)
+        self.lookback = timedelta(minutes=window_config.get('lookback_minutes', 60))
+        # Timeslices keep changing until late data has been ingested
+        self.lag = timedelta(seconds=window_config.get('lag_seconds', 120))
+        self.auto_commit = config['collectors']['newrelic'].get('auto_commit_watermark', True)
+        self.watermark_key = f"newrelic.{self.account_id}.watermarks"
+
+        # rest: paginated v2 metric API; nrql: batched NerdGraph TIMESERIES queries
+        self.query_backend = config['collectors']['newrelic'].get('query_backend', 'rest')
+        nrql_config = config['collectors']['newrelic'].get('nrql', {})
+        self.nrql_endpoint = nrql_config.get('endpoint', "https://api.newrelic.com/graphql")
+        self.nrql_metrics_per_query = nrql_config.get('metrics_per_query', 10)
+        self.nrql_function = nrql_config.get('function', 'average')
+        self.nrql_facets = nrql_config.get('facets', [])
+        # NerdGraph rejects TIMESERIES queries with more buckets than this
+        self.nrql_max_buckets = nrql_config.get('max_buckets', 366)
+        self.base_url = config['collectors']['newrelic'].get('base_url', "https://api.newrelic.com/v2")
         self.headers = {
             "Api-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self.concurrency = max(config['collectors']['newrelic'].get('concurrency', 1), 1)
+        # A stalled connection would otherwise hold a fetch thread forever
+        self.request_timeout = config['collectors']['newrelic'].get('request_timeout_seconds', 30)
+
+        # Request budget shared by every fetch against this account
+        rate_limit = config['collectors']['newrelic'].get('rate_limit', {})
+        self.max_retries = rate_limit.get('max_retries', 3)
+        self.backoff_seconds = rate_limit.get('backoff_seconds', 1.0)
+        self.rate_limiter = get_token_bucket(
+            f"newrelic:{self.account_id}",
+            rate=rate_limit.get('requests_per_minute', 600) / 60.0,
+            capacity=rate_limit.get('burst', 10),
+            jitter=rate_limit.get('jitter_seconds', 0.5)
+        )
+
+        # Local response cache; closed timeslice windows are cached without expiry
+        cache_config = config['collectors']['newrelic'].get('cache', {})
+        self.cache = None
+        self.cache_ttl = cache_config.get('ttl_seconds', 60)
+        if cache_config.get('enabled', False):
+            self.cache = ResponseCache(
+                cache_config.get('path', '.cache/newrelic'),
+                max_bytes=int(cache_config.get('max_megabytes', 100) * 1024 * 1024)
+            )
+
+        # Keep-alive session shared by all page fetches
+        self.session = requests.Session()
+        self.session.mount(
+            'https://',
+            requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        )
+
+    def _retry_after(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait after a 429, from ``Retry-After`` or exponential backoff.
+        
+        Args:
+            response: Rate-limited response
+            attempt: Attempt number (1-based)
+        
+        Returns:
+            float: Delay in seconds
+        """
+        header = response.headers.get('Retry-After') if isinstance(response.headers, Mapping) else None
+        if header is not None:
+            try:
+                return max(float(header), 0.0)
+            except (TypeError, ValueError):
+                try:
+                    retry_at = parsedate_to_datetime(header)
+                    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+        return self.backoff_seconds * (2 ** (attempt - 1))
 
     @backoff.on_exception(
         backoff.expo,
         requests.exceptions.RequestException,
-        max_tries=3
+        max_tries=3,
+        giveup=lambda e: isinstance(e, RateLimitExceeded)
     )
+    def _request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any] = None,
+        json_body: Dict[str, Any] = None,
+        headers: Dict[str, str] = None
+    ) -> requests.Response:
+        """Make HTTP request to NewRelic API over the keep-alive session.
+        
+        Every attempt first takes a token from the account's shared bucket.
+        A 429 pauses the whole bucket for the ``Retry-After`` delay, so
+        concurrent fetches back off together instead of piling on.
+        
+        Args:
+            endpoint: API endpoint, or an absolute URL
+            params: Query parameters
+            json_body: JSON body; when given the request is a POST
+            headers: Extra request headers (e.g. conditional request validators)
+        
+        Returns:
+            requests.Response: API response
+        
+        Raises:
+            RateLimitExceeded: If still rate limited after ``max_retries`` attempts
+            requests.exceptions.RequestException: If request fails
+        """
+        url = self._url(endpoint)
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        for attempt in range(1, self.max_retries + 1):
+            self.rate_limiter.acquire()
+            if json_body is not None:
+                response = self.session.post(
+                    url, headers=request_headers, params=params, json=json_body, timeout=self.request_timeout
+                )
+            else:
+                response = self.session.get(url, headers=request_headers, params=params, timeout=self.request_timeout)
+            
+            if response.status_code != 429:
+                response.raise_for_status()
+                return response
+
+            delay = self._retry_after(response, attempt)
+            logger.warning(f"Rate limit exceeded, pausing requests for {delay:.1f}s...")
+            self.rate_limiter.pause(delay)
+
+        raise RateLimitExceeded("Rate limit exceeded")
+
+    def _url(self, endpoint: str) -> str:
+        """Resolve an endpoint against ``base_url`` unless it is already absolute."""
+        if endpoint.startswith(('http://', 'https://')):
+            return endpoint
+        return f"{self.base_url}/{endpoint}"
+
+    def _loads(self, body: bytes) -> Dict[str, Any]:
+        """Decode raw JSON bytes, using orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+
+    def _decode_json(self, response: requests.Response) -> Dict[str, Any]:
+        """Decode a JSON response body, using orjson when it is installed.
+        
+        Args:
+            response: API response
+        
+        Returns:
+            Dict[str, Any]: Decoded body
+        """
+        if isinstance(response.content, (bytes, bytearray)):
+            return self._loads(response.content)
+        return response.json()
+
+    def _links(self, response: requests.Response) -> Dict[str, Dict[str, str]]:
+        """Parsed ``Link`` header of a response, keyed by rel."""
+        links = getattr(response, 'links', None)
+        return links if isinstance(links, dict) else {}
+
+    def _cache_ttl_for(self, params: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Freshness lifetime for a response.
+        
+        Windows that ended more than ``lag_seconds`` ago can no longer change,
+        so they are cached without expiry; everything else gets ``ttl_seconds``.
+        
+        Args:
+            params: Query parameters of the request
+        
+        Returns:
+            Optional[float]: TTL in seconds, or None for immutable responses
+        """
+        window_end = (params or {}).get('to')
+        if window_end is not None and datetime.fromisoformat(window_end) <= datetime.now(timezone.utc) - self.lag:
+            return None
+        return self.cache_ttl
+
+    def _cached_request(
+        self,
+        endpoint: str,
+        params: Dict[str, Any] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, str]]]:
+        """GET an endpoint through the response cache.
+        
+        Fresh entries are served from disk. Stale entries are revalidated
+        with ``If-None-Match``/``If-Modified-Since`` and reused on a 304.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+        
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Dict[str, str]]]: Decoded body and pagination links
+        
+        Raises:
+            requests.exceptions.RequestException: If request fails
+        """
+        if self.cache is None:
+            response = self._request(endpoint, params)
+            return self._decode_json(response), self._links(response)
+
+        key = self.cache.make_key('GET', self._url(endpoint), params)
+        entry = self.cache.get(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            return self._loads(entry['body']), entry['extra'].get('links', {})
+
+        conditional = {}
+        if entry is not None:
+            if entry.get('etag'):
+                conditional['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                conditional['If-Modified-Since'] = entry['last_modified']
+
+        response = self._request(endpoint, params, headers=conditional)
+        ttl = self._cache_ttl_for(params)
+        if entry is not None and response.status_code == 304:
+            self.cache.refresh(key, entry, ttl)
+            return self._loads(entry['body']), entry['extra'].get('links', {})
+
+        links = self._links(response)
+        if isinstance(response.content, (bytes, bytearray)):
+            headers = response.headers if isinstance(response.headers, Mapping) else {}
+            self.cache.put(
+                key,
+                bytes(response.content),
+                ttl=ttl,
+                etag=headers.get('ETag'),
+                last_modified=headers.get('Last-Modified'),
+                extra={'links': links}
+            )
+        return self._decode_json(response), links
+
     def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """Make HTTP request to NewRelic API.
         
@@ -44,65 +293,427 @@ class NewRelicCollector(BaseCollector):
         Raises:
             requests.exceptions.RequestException: If request fails
         """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params)
+        return self._cached_request(endpoint, params)[0]
+
+    def _fetch_page(
+        self,
+        page: int,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Fetch one metrics page.
         
-        if response.status_code == 429:
-            logger.warning("Rate limit exceeded, backing off...")
-            raise requests.exceptions.RequestException("Rate limit exceeded")
-            
-        response.raise_for_status()
-        return response.json()
+        Args:
+            page: Page number
+            params: Extra query parameters (metric names and time window)
+        
+        Returns:
+            Tuple[Dict[str, Any], Optional[int]]: Page body and the last page number, if advertised
+        """
+        body, links = self._cached_request(
+            f"accounts/{self.account_id}/metrics",
+            params={**(params or {}), "page": page}
+        )
+        last_page = None
+        if 'last' in links:
+            query = parse_qs(urlparse(links['last'].get('url', '')).query)
+            if query.get('page'):
+                last_page = int(query['page'][0])
+        return body, last_page
 
-    def collect(self) -> pd.DataFrame:
-        """Collect metrics from NewRelic.
+    def _iter_pages(self, params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Fetch metrics pages concurrently and yield them in page order.
+        
+        Pages are requested in windows of ``concurrency`` pages. When the API
+        advertises the last page (``Link: rel="last"``) no request is made past
+        it; otherwise the window is speculative and pages after the first one
+        without ``next_page`` are discarded.
+        
+        Args:
+            params: Extra query parameters sent with every page
+        
+        Yields:
+            Dict[str, Any]: Page bodies in order
+        """
+        first, last_page = self._fetch_page(1, params)
+        yield first
+        next_page = first.get('next_page')
+
+        def fetch(page: int) -> Any:
+            # Errors surface only if the page is consumed
+            try:
+                return self._fetch_page(page, params)[0]
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while next_page:
+                end = next_page + self.concurrency
+                if last_page is not None:
+                    end = min(end, last_page + 1)
+                window = list(range(next_page, max(end, next_page + 1)))
+
+                for response in executor.map(fetch, window):
+                    if isinstance(response, Exception):
+                        raise response
+                    yield response
+                    next_page = response.get('next_page')
+                    if not next_page:
+                        break
+
+    def load_watermarks(self) -> Dict[str, datetime]:
+        """Load the per-metric last-fetched timestamps.
+        
+        Returns:
+            Dict[str, datetime]: End of the last fetched window per metric name
+        """
+        raw = self.state.load(self.watermark_key, {})
+        return {name: datetime.fromisoformat(value) for name, value in raw.items()}
+
+    def _stage_watermarks(self, names: List[str], end: datetime) -> None:
+        """Stage the end of a fetched window as the watermark of its metrics."""
+        staged = self._pending_state.get(self.watermark_key) or self.state.load(self.watermark_key, {})
+        self.stage_state(self.watermark_key, {**staged, **{name: end.isoformat() for name in names}})
+
+    def reset_watermarks(self) -> None:
+        """Forget the per-metric watermarks so the next run starts from the lookback window."""
+        self.state.delete(self.watermark_key)
+        self.discard_state(self.watermark_key)
+
+    def build_request_windows(
+        self,
+        now: Optional[datetime] = None
+    ) -> List[Tuple[List[str], datetime, datetime]]:
+        """Plan the requests needed to bring every configured metric up to date.
+        
+        Windows end at the last period closed at least ``lag_seconds`` ago,
+        so timeslices still receiving late data are never fetched. Metrics sharing a watermark are requested together
+        via ``names[]``, and long catch-up ranges are split so a request never
+        asks for more than ``query_limit`` timeslices per metric.
+        
+        Args:
+            now: Current time (defaults to the UTC clock)
         
         Returns:
-            pd.DataFrame: Collected metrics data
+            List[Tuple[List[str], datetime, datetime]]: Metric names, window start and window end
+        """
+        now = now or datetime.now(timezone.utc)
+        period = timedelta(seconds=self.period)
+        settled = (now - self.lag).timestamp()
+        end = datetime.fromtimestamp(settled // self.period * self.period, timezone.utc)
+        watermarks = self.load_watermarks()
+
+        groups = {}
+        for metric in self.metric_definitions:
+            start = watermarks.get(metric['name'], end - self.lookback)
+            if start < end:
+                groups.setdefault(start, []).append(metric['name'])
+
+        # NRQL windows are bucketed by period, so they must stay under the bucket limit
+        limit = self.nrql_max_buckets if self.query_backend == 'nrql' else self.query_limit
+        span = period * max(limit, 1)
+        windows = []
+        for start, names in sorted(groups.items()):
+            window_start = start
+            while window_start < end:
+                window_end = min(window_start + span, end)
+                windows.append((names, window_start, window_end))
+                window_start = window_end
+        return windows
+
+    def _window_params(self, names: List[str], start: datetime, end: datetime) -> Dict[str, Any]:
+        """Server-side filter parameters for one metric window."""
+        params = {
+            'names[]': names,
+            'from': start.isoformat(),
+            'to': end.isoformat(),
+            'period': self.period
+        }
+        if self.summarize:
+            params['summarize'] = 'true'
+        return params
+
+    def _intern_attributes(self, metric_type: str, unit: str) -> Dict[str, str]:
+        """Return the shared attributes dict for a metric type/unit pair.
+        
+        Args:
+            metric_type: NewRelic metric type
+            unit: Metric unit
+        
+        Returns:
+            Dict[str, str]: Attributes dict reused by every row with these values
+        """
+        key = (metric_type, unit)
+        attributes = self._attributes.get(key)
+        if attributes is None:
+            attributes = {'metric_type': metric_type, 'unit': unit}
+            self._attributes[key] = attributes
+        return attributes
+
+    def _build_frame(self, columns: Dict[str, List[Any]], rows: int) -> pd.DataFrame:
+        """Build a DataFrame from the first ``rows`` buffered column values.
+        
+        Timestamps are parsed in one vectorized call with a known ISO format.
+        The consumed values are removed from ``columns``.
+        
+        Args:
+            columns: Buffered column lists, modified in place
+            rows: Number of rows to take
+        
+        Returns:
+            pd.DataFrame: Metrics chunk
+        """
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(columns['timestamp'][:rows], format='ISO8601', utc=True),
+            'name': columns['name'][:rows],
+            'value': columns['value'][:rows],
+            'attributes': columns['attributes'][:rows]
+        }, columns=METRIC_COLUMNS)
+
+        for values in columns.values():
+            del values[:rows]
+        return df
+
+    def _build_record_batch(self, columns: Dict[str, List[Any]], rows: int) -> pa.RecordBatch:
+        """Build a ``RAW_METRIC_SCHEMA`` record batch from the first ``rows`` buffered values.
+        
+        The buffered lists go straight into Arrow, skipping the DataFrame.
+        The consumed values are removed from ``columns``.
+        
+        Args:
+            columns: Buffered column lists, modified in place
+            rows: Number of rows to take
+        
+        Returns:
+            pa.RecordBatch: Metrics batch
+        """
+        batch = build_record_batch(
+            pa.array(columns['timestamp'][:rows], pa.string()).cast(pa.timestamp('us', tz='UTC')),
+            columns['name'][:rows],
+            columns['value'][:rows],
+            columns['attributes'][:rows]
+        )
+
+        for values in columns.values():
+            del values[:rows]
+        return batch
+
+    def _iter_rest_frames(self, chunk_rows: int, arrow: bool = False) -> Iterator[Any]:
+        """Flatten paginated REST v2 timeslices into fixed-size frames.
+        
+        Windows completed here are staged as watermarks.
+        
+        Args:
+            chunk_rows: Maximum rows per frame
+            arrow: Build Arrow record batches instead of DataFrames
+        
+        Yields:
+            pd.DataFrame or pa.RecordBatch: Metrics chunk
+        """
+        build = self._build_record_batch if arrow else self._build_frame
+        columns = {'timestamp': [], 'name': [], 'value': [], 'attributes': []}
+        buffered = 0
+
+        # Only the configured metrics, and only windows past their watermarks;
+        # without a metric list every metric is fetched unfiltered
+        windows = self.build_request_windows() if self.metric_definitions else [None]
+
+        for window in windows:
+            params = self._window_params(*window) if window else None
+            for response in self._iter_pages(params):
+                for metric in response['metric_data']['metrics']:
+                    timeslices = metric['timeslices']
+                    if not timeslices:
+                        continue
+
+                    # One shared attributes dict per metric instead of a copy per row
+                    attributes = self._intern_attributes(
+                        metric.get('metric_type', 'unknown'),
+                        metric.get('unit', 'unknown')
+                    )
+                    count = len(timeslices)
+                    columns['timestamp'].extend(timeslice['from'] for timeslice in timeslices)
+                    columns['value'].extend(
+                        next(iter(timeslice['values'].values())) for timeslice in timeslices
+                    )
+                    columns['name'].extend([metric['name']] * count)
+                    columns['attributes'].extend([attributes] * count)
+                    buffered += count
+
+                    # Emit full chunks as soon as they are available
+                    while buffered >= chunk_rows:
+                        yield build(columns, chunk_rows)
+                        buffered -= chunk_rows
+
+            if window:
+                names, _, window_end = window
+                self._stage_watermarks(names, window_end)
+
+        if buffered:
+            yield build(columns, buffered)
+
+    def _nrql_interval(self) -> str:
+        """TIMESERIES bucket size matching ``period_seconds``, in NRQL units."""
+        for seconds, unit in ((86400, 'day'), (3600, 'hour'), (60, 'minute'), (1, 'second')):
+            if self.period % seconds == 0:
+                count = self.period // seconds
+                return f"{count} {unit}" if count == 1 else f"{count} {unit}s"
+
+    def build_nrql_queries(
+        self,
+        windows: Optional[List[Tuple[List[str], datetime, datetime]]] = None
+    ) -> List[Tuple[List[str], str]]:
+        """Build batched NRQL TIMESERIES queries for the configured metrics.
+        
+        Every query covers one closed window from ``build_request_windows()``
+        as ``SINCE``/``UNTIL`` epoch milliseconds, so runs resume at the
+        watermarks instead of re-reading a relative range. Buckets are one
+        ``period_seconds`` wide and windows span at most ``max_buckets`` of
+        them. Several metrics
+        are aggregated per query (one aliased column each) and faceted by
+        the configured dimensions.
+        
+        Args:
+            windows: Metric names, window start and window end (defaults to the planned windows)
+        
+        Returns:
+            List[Tuple[List[str], str]]: Metric names and NRQL text per query
+        """
+        if windows is None:
+            windows = self.build_request_windows()
+
+        interval = self._nrql_interval()
+        queries = []
+        for names, start, end in windows:
+            since = int(start.timestamp() * 1000)
+            until = int(end.timestamp() * 1000)
+            for i in range(0, len(names), self.nrql_metrics_per_query):
+                batch = names[i:i + self.nrql_metrics_per_query]
+                selects = ', '.join(f"{self.nrql_function}(`{name}`) AS `{name}`" for name in batch)
+                nrql = f"SELECT {selects} FROM Metric"
+                if self.nrql_facets:
+                    nrql += " FACET " + ', '.join(f"`{facet}`" for facet in self.nrql_facets)
+                nrql += f" SINCE {since} UNTIL {until} TIMESERIES {interval} LIMIT MAX"
+                queries.append((batch, nrql))
+        return queries
+
+    def _run_nrql(self, nrql: str) -> List[Dict[str, Any]]:
+        """Run an NRQL query through NerdGraph.
+        
+        Args:
+            nrql: NRQL query text
+        
+        Returns:
+            List[Dict[str, Any]]: Query result rows
+        
+        Raises:
+            ValueError: If NerdGraph reports query errors
+        """
+        body = {
+            'query': (
+                'query($accountId: Int!, $nrql: Nrql!) '
+                '{ actor { account(id: $accountId) { nrql(query: $nrql) { results } } } }'
+            ),
+            'variables': {'accountId': int(self.account_id), 'nrql': nrql}
+        }
+        response = self._decode_json(self._request(self.nrql_endpoint, json_body=body))
+        if response.get('errors'):
+            raise ValueError(f"NerdGraph query failed: {response['errors'][0].get('message')}")
+        return response['data']['actor']['account']['nrql']['results']
+
+    def _nrql_frame(self, names: List[str], results: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Reshape TIMESERIES results into the REST collector schema.
+        
+        Args:
+            names: Metric aliases selected by the query
+            results: NRQL result rows (one per time bucket and facet)
+        
+        Returns:
+            pd.DataFrame: Metrics in long format
+        """
+        if not results:
+            return pd.DataFrame(columns=METRIC_COLUMNS)
+
+        wide = pd.DataFrame(results)
+        wide['timestamp'] = pd.to_datetime(wide['beginTimeSeconds'], unit='s', utc=True)
+        facets = [facet for facet in self.nrql_facets if facet in wide.columns]
+        wide['attributes'] = wide[facets].to_dict('records') if facets else [{}] * len(wide)
+
+        value_columns = [name for name in names if name in wide.columns]
+        df = wide.melt(
+            id_vars=['timestamp', 'attributes'],
+            value_vars=value_columns,
+            var_name='name',
+            value_name='value'
+        )
+        df = df.dropna(subset=['value'])
+        return df[METRIC_COLUMNS].reset_index(drop=True)
+
+    def _iter_nrql_frames(self, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Run batched NRQL queries window by window and yield fixed-size frames.
+        
+        Windows completed here are staged as watermarks.
+        
+        Args:
+            chunk_rows: Maximum rows per frame
+        
+        Yields:
+            pd.DataFrame: Metrics chunk
+        
+        Raises:
+            ValueError: If no metrics are configured
+        """
+        if not self.metric_definitions:
+            raise ValueError("NRQL backend requires collectors.newrelic.metrics")
+
+        for window in self.build_request_windows():
+            for names, nrql in self.build_nrql_queries([window]):
+                df = self._nrql_frame(names, self._run_nrql(nrql))
+                for start in range(0, len(df), chunk_rows):
+                    yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+
+            names, _, window_end = window
+            self._stage_watermarks(names, window_end)
+
+    def _stream(self, chunk_rows: Optional[int], arrow: bool, commit: Optional[bool]) -> Iterator[Any]:
+        """Stream validated chunks and commit watermarks once exhausted.
+        
+        Args:
+            chunk_rows: Maximum rows per chunk (defaults to ``collectors.chunk_rows``)
+            arrow: Yield Arrow record batches instead of DataFrames
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pd.DataFrame or pa.RecordBatch: Collected metrics chunk
         
         Raises:
             Exception: If collection fails
         """
+        chunk_rows = chunk_rows or self.chunk_rows
         start_time = datetime.now()
+        records = 0
         try:
-            metrics = []
-            next_page = 1
+            if self.query_backend == 'nrql':
+                frames = self._iter_nrql_frames(chunk_rows)
+                if arrow:
+                    frames = (self.to_record_batch(df) for df in frames)
+            else:
+                frames = self._iter_rest_frames(chunk_rows, arrow)
 
-            while next_page:
-                # Fetch metrics with pagination
-                response = self._make_request(
-                    f"accounts/{self.account_id}/metrics",
-                    params={"page": next_page}
-                )
+            for chunk in frames:
+                # Validate the collected data
+                if arrow:
+                    self.validate_batch(chunk)
+                else:
+                    self.validate_data(chunk)
+                records += len(chunk)
+                yield chunk
 
-                for metric in response['metric_data']['metrics']:
-                    for timeslice in metric['timeslices']:
-                        metrics.append({
-                            'timestamp': pd.to_datetime(timeslice['from']),
-                            'name': metric['name'],
-                            'value': next(iter(timeslice['values'].values())),
-                            'attributes': {
-                                'metric_type': metric.get('metric_type', 'unknown'),
-                                'unit': metric.get('unit', 'unknown')
-                            }
-                        })
-
-                next_page = response.get('next_page')
-
-            if not metrics:
-                df = pd.DataFrame(columns=['timestamp', 'name', 'value', 'attributes'])
-                self.update_metrics(start_time, 0)
-                return df
-
-            df = pd.DataFrame(metrics)
-            
-            # Validate the collected data
-            self.validate_data(df)
+            # Advance per-metric watermarks past the fetched windows
+            if self.should_commit(commit):
+                self.commit_state()
             
             # Update metrics
-            self.update_metrics(start_time, len(df))
-            
-            return df
+            self.update_metrics(start_time, records)
 
         except requests.exceptions.RequestException as e:
             self.update_metrics(start_time, 0, error=True)
@@ -113,16 +724,64 @@ class NewRelicCollector(BaseCollector):
             logger.error(f"Unexpected error in NewRelic collector: {str(e)}")
             raise
 
-    def health_check(self) -> bool:
-        """Check NewRelic API health.
+    def collect_iter(self, chunk_rows: Optional[int] = None, commit: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+        """Stream metrics from NewRelic in fixed-size chunks.
+        
+        Watermarks only advance once the stream has been fully consumed.
+        
+        Args:
+            chunk_rows: Maximum rows per chunk (defaults to ``collectors.chunk_rows``)
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pd.DataFrame: Collected metrics chunk
+        
+        Raises:
+            Exception: If collection fails
+        """
+        yield from self._stream(chunk_rows, arrow=False, commit=commit)
+
+    def collect_arrow_iter(
+        self,
+        chunk_rows: Optional[int] = None,
+        commit: Optional[bool] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream metrics from NewRelic as ``RAW_METRIC_SCHEMA`` record batches.
+        
+        REST timeslices are buffered as column lists and converted to Arrow
+        directly; NRQL results are converted from their reshaped frames.
+        
+        Args:
+            chunk_rows: Maximum rows per batch (defaults to ``collectors.chunk_rows``)
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pa.RecordBatch: Collected metrics batch
+        
+        Raises:
+            Exception: If collection fails
+        """
+        yield from self._stream(chunk_rows, arrow=True, commit=commit)
+
+    @property
+    def health_key(self) -> str:
+        """Dependency name for health results and the circuit breaker."""
+        return f"newrelic.{self.account_id}"
+
+    def probe(self) -> bool:
+        """Check the NewRelic API with a single uncached request.
+        
+        Unlike collection requests there are no retries, so an outage is
+        reported within ``health.probe_timeout_seconds``.
         
         Returns:
-            bool: True if API is accessible
+            bool: True if the API answered successfully
         """
-        try:
-            # Try to fetch a simple health endpoint
-            self._make_request(f"accounts/{self.account_id}/applications")
-            return True
-        except Exception as e:
-            logger.error(f"NewRelic health check failed: {str(e)}")
-            return False
+        self.rate_limiter.acquire()
+        response = self.session.get(
+            self._url(f"accounts/{self.account_id}/applications"),
+            headers=self.headers,
+            timeout=self.health.probe_timeout
+        )
+        response.raise_for_status()
+        return True
@@ -1,17 +1,157 @@
+import json
 import logging
-from typing import Dict, Any, List, Tuple
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import pandas as pd
 import psycopg2
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from .base_collector import BaseCollector
+from ..utils.arrow_utils import build_record_batch
+from ..utils.connection_registry import ConnectionRegistry
+from ..utils.fan_out import fan_out
+from ..utils.health import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
+METRIC_COLUMNS = ['timestamp', 'metric_name', 'value', 'metadata']
+
+# Collected frames are tagged with the target they came from
+OUTPUT_COLUMNS = METRIC_COLUMNS + ['target']
+
+CONNECTION_KEYS = ('host', 'port', 'database', 'user', 'password')
+
+SNAPSHOT_COLUMNS = ['taken_at', 'stats_reset', 'statement_key', 'queryid', 'calls', 'total_exec_time']
+
+# Arrow types for COPY output; metadata stays raw JSON text
+COPY_COLUMN_TYPES = {
+    'timestamp': pa.timestamp('us', tz='UTC'),
+    'metric_name': pa.string(),
+    'value': pa.float64(),
+    'metadata': pa.string()
+}
+
+FETCH_MODES = ('cursor', 'copy')
+
+# Cumulative per-statement counters; converted to per-interval deltas in delta mode
+STATEMENT_METRICS_SQL = """
+        -- Query Performance
+        SELECT
+            'query_time' as metric_name,
+            EXTRACT(EPOCH FROM mean_exec_time) as metric_value,
+            jsonb_build_object(
+                'query_type', queryid::text,
+                'calls', calls
+            ) as metric_metadata
+        FROM pg_stat_statements
+"""
+
+CATALOG_METRICS_SQL = [
+    """
+        -- Connection Stats
+        SELECT
+            'connections' as metric_name,
+            count(*) as metric_value,
+            jsonb_build_object(
+                'state', state,
+                'database', datname
+            ) as metric_metadata
+        FROM pg_stat_activity
+        GROUP BY state, datname
+""",
+    """
+        -- Table Statistics
+        SELECT
+            'table_stats' as metric_name,
+            n_live_tup as metric_value,
+            jsonb_build_object(
+                'table', relname,
+                'schema', schemaname
+            ) as metric_metadata
+        FROM pg_stat_user_tables
+"""
+]
+
+STATEMENTS_SNAPSHOT_QUERY = """
+    SELECT
+        current_timestamp as taken_at,
+        (SELECT stats_reset FROM pg_stat_statements_info) as stats_reset,
+        userid::text || ':' || dbid::text || ':' || queryid::text as statement_key,
+        queryid::text as queryid,
+        calls,
+        total_exec_time
+    FROM pg_stat_statements
+"""
+
+STATEMENT_MODES = ('snapshot', 'delta')
+
+# catalog: built-in pg_catalog metrics; query: the configured metrics_query
+QUERY_MODES = ('catalog', 'query')
+
+# ``:name`` placeholders, but not ``::type`` casts
+NAMED_PARAM = re.compile(r'(?<![:\w]):([A-Za-z_]\w*)')
+
+def bind_named_params(query: str) -> str:
+    """Translate ``:name`` placeholders into psycopg2 ``%(name)s`` parameters.
+    
+    Args:
+        query: SQL query using ``:start_time``-style placeholders
+    
+    Returns:
+        str: Query for ``cursor.execute(query, params)``
+    """
+    return NAMED_PARAM.sub(r'%(\1)s', query.replace('%', '%%'))
+
+def build_metrics_query(include_statements: bool = True) -> str:
+    """Build the catalog metrics query.
+    
+    Args:
+        include_statements: Whether to include raw ``pg_stat_statements`` rows
+    
+    Returns:
+        str: SQL query producing ``METRIC_COLUMNS``
+    """
+    parts = ([STATEMENT_METRICS_SQL] if include_statements else []) + CATALOG_METRICS_SQL
+    return """
+    SELECT
+        current_timestamp as timestamp,
+        metric_name,
+        metric_value as value,
+        metric_metadata::text as metadata
+    FROM (""" + "\n        UNION ALL\n".join(parts) + """    ) metrics
+"""
+
+METRICS_QUERY = build_metrics_query()
+
+def decode_metadata(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse the raw JSON ``metadata`` column into dicts.
+    
+    Collection keeps metadata as text; call this only where dicts are needed.
+    
+    Args:
+        df: Collected metrics
+    
+    Returns:
+        pd.DataFrame: Copy of ``df`` with decoded metadata
+    """
+    return df.assign(metadata=[
+        json.loads(value) if isinstance(value, str) else value
+        for value in df['metadata']
+    ])
+
 class PostgresCollector(BaseCollector):
     """Collects metrics from PostgreSQL."""
 
+    output_columns = OUTPUT_COLUMNS
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize PostgreSQL collector.
         
@@ -19,135 +159,661 @@ class PostgresCollector(BaseCollector):
             config: Configuration dictionary containing PostgreSQL connection details
         """
         super().__init__(config)
-        self.host = config['collectors']['postgres']['host']
-        self.port = config['collectors']['postgres']['port']
-        self.database = config['collectors']['postgres']['database']
-        self.user = config['collectors']['postgres']['user']
-        self.password = config['collectors']['postgres']['password']
+        self.chunk_rows = config['collectors'].get('chunk_rows', 50000)
+
+        # cursor: server-side named cursor; copy: COPY ... TO STDOUT parsed into Arrow
+        self.fetch_mode = config['collectors']['postgres'].get('fetch_mode', 'cursor')
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Unsupported fetch_mode: {self.fetch_mode}")
+        self.connections = ConnectionRegistry.get_instance(config)
+
+        # Instances queried concurrently; targets inherit unset connection settings
+        self.targets = self._build_targets(config['collectors']['postgres'])
+        self.host = self.targets[0]['host']
+        self.port = self.targets[0]['port']
+        self.database = self.targets[0]['database']
+        self.user = self.targets[0]['user']
+        self.password = self.targets[0]['password']
+        # Every running task holds one pooled connection; more workers than the pool would exhaust it
+        self.max_workers = max(min(
+            config['collectors']['postgres'].get('max_workers', 8),
+            self.connections.postgres_options.get('max_connections', 10)
+        ), 1)
+        self.target_timeout = config['collectors']['postgres'].get('target_timeout_seconds', 300)
+        self.connect_timeout = config['collectors']['postgres'].get('connect_timeout_seconds', 10)
+        self.failed_targets = {}
+
+        # snapshot: re-emit cumulative pg_stat_statements rows; delta: only what moved since the last run
+        statements_config = config['collectors']['postgres'].get('statements', {})
+        self.statements_mode = statements_config.get('mode', 'snapshot')
+        if self.statements_mode not in STATEMENT_MODES:
+            raise ValueError(f"Unsupported statements mode: {self.statements_mode}")
+        self.metrics_query = build_metrics_query(include_statements=self.statements_mode == 'snapshot')
+        self.auto_commit = config['collectors']['postgres'].get('auto_commit_watermark', True)
+
+        # Incremental reads of metrics_query over [start_time, end_time) windows
+        self.query_mode = config['collectors']['postgres'].get('query_mode', 'catalog')
+        if self.query_mode not in QUERY_MODES:
+            raise ValueError(f"Unsupported query_mode: {self.query_mode}")
+        self.batch_size = config['collectors']['postgres'].get('batch_size')
+        if self.query_mode == 'query':
+            self.metrics_query = self._build_incremental_query(
+                config['collectors']['postgres']['metrics_query']
+            )
+        incremental_config = config['collectors']['postgres'].get('incremental', {})
+        self.initial_lookback = timedelta(hours=incremental_config.get('initial_lookback_hours', 24))
+        self.lag = timedelta(seconds=incremental_config.get('lag_seconds', 0))
+        self.range_split = timedelta(hours=incremental_config.get('range_split_hours', 6))
+
+    def _build_targets(self, postgres_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Resolve the configured targets, defaulting to the single top-level instance.
+        
+        Args:
+            postgres_config: ``collectors.postgres`` section
+        
+        Returns:
+            List[Dict[str, Any]]: Connection settings plus a unique ``name`` per target
+        """
+        defaults = {key: postgres_config.get(key) for key in CONNECTION_KEYS}
+        targets = []
+        for target in postgres_config.get('targets') or [defaults]:
+            resolved = {key: target.get(key, defaults[key]) for key in CONNECTION_KEYS}
+            resolved['name'] = target.get(
+                'name', f"{resolved['host']}:{resolved['port']}/{resolved['database']}"
+            )
+            targets.append(resolved)
+
+        names = [target['name'] for target in targets]
+        if len(set(names)) != len(names):
+            raise ValueError("PostgreSQL target names must be unique")
+        return targets
 
     @contextmanager
-    def get_connection(self):
-        """Create PostgreSQL connection context manager.
+    def get_connection(self, target: Optional[Dict[str, Any]] = None):
+        """Borrow a pooled PostgreSQL connection.
+        
+        Args:
+            target: Target settings (defaults to the first target)
         
         Yields:
-            psycopg2.extensions.connection: Database connection
+            psycopg2.extensions.connection: Database connection, returned to the pool on exit
         
         Raises:
             psycopg2.Error: If connection fails
         """
-        conn = None
+        target = target or self.targets[0]
         try:
-            conn = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            yield conn
+            with self.connections.postgres_connection(
+                host=target['host'],
+                port=target['port'],
+                database=target['database'],
+                user=target['user'],
+                password=target['password'],
+                # Bound both a dead host and a runaway query
+                connect_timeout=self.connect_timeout,
+                options=f"-c statement_timeout={int(self.target_timeout * 1000)}"
+            ) as conn:
+                yield conn
         except psycopg2.Error as e:
             logger.error(f"PostgreSQL connection error: {str(e)}")
             raise
+
+    def _iter_cursor_frames(
+        self,
+        conn,
+        query: str,
+        chunk_rows: int,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Read a query through a server-side named cursor.
+        
+        Rows stay on the server until fetched, so only one chunk is held
+        client-side at a time.
+        
+        Args:
+            conn: Database connection
+            query: SQL query
+            chunk_rows: Maximum rows per chunk
+            params: Query parameters
+        
+        Yields:
+            pd.DataFrame: Query results chunk
+        """
+        fetch_rows = min(self.batch_size or chunk_rows, chunk_rows)
+        with conn.cursor(name=f"metrics_{uuid.uuid4().hex}") as cur:
+            cur.itersize = fetch_rows
+            cur.execute(query, params)
+            # User queries may return their columns in any order
+            if self.query_mode == 'query':
+                columns = [column[0] for column in cur.description]
+            else:
+                columns = METRIC_COLUMNS
+
+            buffered = []
+            while True:
+                # batch_size rows per round trip, emitted in chunk_rows frames
+                results = cur.fetchmany(fetch_rows)
+                buffered.extend(results)
+                while len(buffered) >= chunk_rows or (buffered and not results):
+                    rows, buffered = buffered[:chunk_rows], buffered[chunk_rows:]
+
+                    # Convert results to DataFrame
+                    df = pd.DataFrame(rows, columns=columns)
+                    
+                    # Ensure proper data types
+                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    df['value'] = pd.to_numeric(df['value'])
+                    yield df
+
+                if not results:
+                    break
+
+    def _iter_copy_batches(
+        self,
+        conn,
+        query: str,
+        chunk_rows: int,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream a query with ``COPY ... TO STDOUT`` parsed straight into Arrow.
+        
+        The COPY runs on a helper thread writing CSV into a pipe, while the
+        Arrow CSV reader turns it into typed column batches without building
+        per-row Python objects.
+        
+        Args:
+            conn: Database connection
+            query: SQL query
+            chunk_rows: Maximum rows per chunk
+            params: Query parameters, inlined since COPY cannot take bind parameters
+        
+        Yields:
+            pa.RecordBatch: Query results batch typed by ``COPY_COLUMN_TYPES``
+        
+        Raises:
+            psycopg2.Error: If the COPY fails
+        """
+        read_fd, write_fd = os.pipe()
+        errors = []
+
+        def copy():
+            try:
+                with os.fdopen(write_fd, 'wb') as sink:
+                    with conn.cursor() as cur:
+                        sql = cur.mogrify(query, params).decode() if params else query
+                        cur.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER true)", sink)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=copy, daemon=True)
+        thread.start()
+        failure = None
+        try:
+            with os.fdopen(read_fd, 'rb') as source:
+                reader = pa_csv.open_csv(
+                    source,
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types=COPY_COLUMN_TYPES,
+                        strings_can_be_null=True
+                    )
+                )
+                for batch in reader:
+                    for offset in range(0, batch.num_rows, chunk_rows):
+                        yield batch.slice(offset, chunk_rows)
+        except Exception as e:
+            failure = e
         finally:
-            if conn is not None:
-                conn.close()
+            # The pipe is closed by now, so an unfinished COPY fails fast and
+            # the connection is idle again before it goes back to the pool
+            thread.join()
+
+        # A failed COPY truncates the stream; report the database error
+        if errors:
+            raise errors[0]
+        if failure is not None:
+            raise failure
+
+    def _snapshot_key(self, target: Dict[str, Any]) -> str:
+        """State key of a target's last ``pg_stat_statements`` snapshot."""
+        return f"postgres.{target['name']}.pg_stat_statements"
+
+    def _fetch_statement_snapshot(self, conn) -> pd.DataFrame:
+        """Read the current cumulative ``pg_stat_statements`` counters.
+        
+        The view is bounded by ``pg_stat_statements.max``, so it is read in
+        one round trip. Requires PostgreSQL 14+ for ``pg_stat_statements_info``.
+        
+        Args:
+            conn: Database connection
+        
+        Returns:
+            pd.DataFrame: One row per statement with ``SNAPSHOT_COLUMNS``
+        """
+        with conn.cursor() as cur:
+            cur.execute(STATEMENTS_SNAPSHOT_QUERY)
+            return pd.DataFrame(cur.fetchall(), columns=SNAPSHOT_COLUMNS)
+
+    def compute_statement_deltas(
+        self,
+        current: pd.DataFrame,
+        previous: Optional[Dict[str, Any]]
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Turn cumulative statement counters into per-interval deltas.
+        
+        Only statements whose ``calls`` moved are emitted, as ``query_count``
+        (calls in the interval), ``query_time`` (mean ms per call in the
+        interval) and ``query_rate`` (calls per second). A changed
+        ``stats_reset`` means ``pg_stat_statements_reset()`` ran, so counters
+        are taken as counts since the reset. A single counter going backwards
+        (statement reset or evicted and re-added) is handled the same way.
+        The first snapshot only records a baseline.
+        
+        Args:
+            current: Counters with ``SNAPSHOT_COLUMNS``
+            previous: Snapshot returned by the previous call, or None
+        
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, Any]]: Delta rows with ``METRIC_COLUMNS`` and the new snapshot
+        """
+        if current.empty:
+            taken_at = pd.Timestamp(datetime.now(timezone.utc))
+            stats_reset = previous.get('stats_reset') if previous else None
+        else:
+            taken_at = pd.Timestamp(current['taken_at'].iloc[0])
+            stats_reset = current['stats_reset'].iloc[0]
+            stats_reset = None if pd.isna(stats_reset) else pd.Timestamp(stats_reset).isoformat()
+
+        snapshot = {
+            'taken_at': taken_at.isoformat(),
+            'stats_reset': stats_reset,
+            'counters': {
+                key: [calls, total]
+                for key, calls, total in zip(
+                    current['statement_key'], current['calls'].tolist(), current['total_exec_time'].tolist()
+                )
+            }
+        }
+        if previous is None or current.empty:
+            return pd.DataFrame(columns=METRIC_COLUMNS), snapshot
+
+        interval_start = pd.Timestamp(previous['taken_at'])
+        reset = stats_reset != previous.get('stats_reset')
+        if reset and stats_reset is not None:
+            interval_start = max(interval_start, pd.Timestamp(stats_reset))
+        interval = max((taken_at - interval_start).total_seconds(), 1e-6)
+
+        prev = pd.DataFrame.from_dict(
+            {} if reset else previous['counters'],
+            orient='index',
+            columns=['prev_calls', 'prev_total']
+        )
+        df = current.join(prev, on='statement_key')
+        # Statements new since the last snapshot count from zero
+        df[['prev_calls', 'prev_total']] = df[['prev_calls', 'prev_total']].fillna(0)
+        restarted = df['calls'] < df['prev_calls']
+        df.loc[restarted, ['prev_calls', 'prev_total']] = 0
+
+        calls = df['calls'] - df['prev_calls']
+        moved = calls > 0
+        df, calls = df[moved], calls[moved]
+        exec_time = df['total_exec_time'] - df['prev_total']
 
-    def collect(self) -> pd.DataFrame:
-        """Collect metrics from PostgreSQL.
+        metadata = (
+            '{"queryid": "' + df['queryid'].astype(str)
+            + f'", "interval_seconds": {interval}}}'
+        )
+        frames = [
+            pd.DataFrame({'metric_name': name, 'value': values.astype(float), 'metadata': metadata})
+            for name, values in (
+                ('query_count', calls),
+                ('query_time', exec_time / calls),
+                ('query_rate', calls / interval)
+            )
+        ]
+        deltas = pd.concat(frames, ignore_index=True)
+        deltas.insert(0, 'timestamp', taken_at)
+        return deltas[METRIC_COLUMNS], snapshot
+
+    def _iter_statement_deltas(self, conn, target: Dict[str, Any], chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Yield a target's ``pg_stat_statements`` deltas and stage its new snapshot.
+        
+        Args:
+            conn: Database connection
+            target: Target settings
+            chunk_rows: Maximum rows per chunk
+        
+        Yields:
+            pd.DataFrame: Delta rows chunk
+        """
+        key = self._snapshot_key(target)
+        deltas, snapshot = self.compute_statement_deltas(
+            self._fetch_statement_snapshot(conn),
+            self.state.load(key)
+        )
+        self.stage_state(key, snapshot)
+        for offset in range(0, len(deltas), chunk_rows):
+            yield deltas.iloc[offset:offset + chunk_rows].reset_index(drop=True)
+
+    def _build_incremental_query(self, metrics_query: str) -> str:
+        """Bind ``metrics_query`` placeholders and bound it above by ``:end_time``.
+        
+        Queries that only filter on ``:start_time`` are wrapped with
+        ``timestamp < :end_time`` so each window reads a disjoint range;
+        PostgreSQL pushes the bound into the subquery, keeping partition pruning.
+        
+        Args:
+            metrics_query: User query with a ``:start_time`` placeholder
         
         Returns:
-            pd.DataFrame: Collected metrics data
+            str: Query taking ``start_time``/``end_time`` parameters
         
         Raises:
-            Exception: If collection fails
+            ValueError: If the query has no ``:start_time`` placeholder
         """
-        start_time = datetime.now()
-        metrics_query = """
-            SELECT
-                current_timestamp as timestamp,
-                metric_name,
-                metric_value as value,
-                metric_metadata as metadata
-            FROM (
-                -- Query Performance
-                SELECT
-                    'query_time' as metric_name,
-                    EXTRACT(EPOCH FROM mean_exec_time) as metric_value,
-                    jsonb_build_object(
-                        'query_type', queryid::text,
-                        'calls', calls
-                    ) as metric_metadata
-                FROM pg_stat_statements
-                
-                UNION ALL
-                
-                -- Connection Stats
-                SELECT
-                    'connections' as metric_name,
-                    count(*) as metric_value,
-                    jsonb_build_object(
-                        'state', state,
-                        'database', datname
-                    ) as metric_metadata
-                FROM pg_stat_activity
-                GROUP BY state, datname
-                
-                UNION ALL
-                
-                -- Table Statistics
-                SELECT
-                    'table_stats' as metric_name,
-                    n_live_tup as metric_value,
-                    jsonb_build_object(
-                        'table', relname,
-                        'schema', schemaname
-                    ) as metric_metadata
-                FROM pg_stat_user_tables
-            ) metrics
+        placeholders = set(NAMED_PARAM.findall(metrics_query))
+        if 'start_time' not in placeholders:
+            raise ValueError("metrics_query must filter on :start_time")
+        if 'end_time' not in placeholders:
+            metrics_query = f"SELECT * FROM ({metrics_query}) bounded WHERE timestamp < :end_time"
+        return bind_named_params(metrics_query)
+
+    def _watermark_key(self, target: Dict[str, Any]) -> str:
+        """State key of a target's ``start_time`` watermark."""
+        return f"postgres.{target['name']}.start_time"
+
+    def load_watermark(self, target: Dict[str, Any]) -> Optional[datetime]:
+        """Load the start of the next window for a target.
+        
+        Args:
+            target: Target settings
+        
+        Returns:
+            Optional[datetime]: Persisted ``start_time``, or None on first run
+        """
+        raw = self.state.load(self._watermark_key(target))
+        return datetime.fromisoformat(raw) if raw else None
+
+    def plan_query_ranges(
+        self,
+        target: Dict[str, Any],
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, datetime]]:
+        """Plan the ``[start_time, end_time)`` sub-ranges to read for a target.
+        
+        The window runs from the stored watermark (or ``initial_lookback_hours``
+        ago) to ``now - lag_seconds``, split into ``range_split_hours`` pieces
+        that are read in parallel on separate connections.
+        
+        Args:
+            target: Target settings
+            now: Current time (defaults to the UTC clock)
+        
+        Returns:
+            List[Dict[str, datetime]]: Query parameters per sub-range
+        """
+        end = (now or datetime.now(timezone.utc)) - self.lag
+        start = self.load_watermark(target) or end - self.initial_lookback
+
+        ranges = []
+        while start < end:
+            range_end = min(start + self.range_split, end)
+            ranges.append({'start_time': start, 'end_time': range_end})
+            start = range_end
+        return ranges
+
+    def _iter_target(
+        self,
+        target: Dict[str, Any],
+        query: str,
+        chunk_rows: int,
+        params: Optional[Dict[str, Any]] = None,
+        arrow: bool = False
+    ) -> Iterator[Any]:
+        """Stream a query from one target, tagging every chunk with its name.
+        
+        DataFrames get a ``target`` column; Arrow batches carry the name as a
+        ``target`` metadata entry since ``RAW_METRIC_SCHEMA`` has no such column.
+        
+        Args:
+            target: Target settings
+            query: SQL query
+            chunk_rows: Maximum rows per chunk
+            params: Query parameters (one incremental sub-range)
+            arrow: Yield ``RAW_METRIC_SCHEMA`` record batches instead of DataFrames
+        
+        Yields:
+            pd.DataFrame or pa.RecordBatch: Query results chunk
         """
+        tag = {'target': target['name']}
 
+        def emit(df: pd.DataFrame) -> Any:
+            if arrow:
+                return self.to_record_batch(df, tag)
+            df['target'] = target['name']
+            return df
+
+        with self.get_connection(target) as conn:
+            if self.fetch_mode == 'copy':
+                for batch in self._iter_copy_batches(conn, query, chunk_rows, params):
+                    if arrow:
+                        # COPY output is already Arrow; no DataFrame in between
+                        yield build_record_batch(
+                            batch.column('timestamp'),
+                            batch.column('metric_name'),
+                            batch.column('value'),
+                            batch.column('metadata'),
+                            tag
+                        )
+                    else:
+                        yield emit(batch.to_pandas())
+            else:
+                for df in self._iter_cursor_frames(conn, query, chunk_rows, params):
+                    yield emit(df)
+
+            if self.query_mode == 'catalog' and self.statements_mode == 'delta':
+                for df in self._iter_statement_deltas(conn, target, chunk_rows):
+                    yield emit(df)
+
+    def _iter_targets(self, query: str, chunk_rows: int, arrow: bool = False) -> Iterator[Any]:
+        """Run a query against every target concurrently and merge the chunks.
+        
+        In query mode every planned sub-range is a separate task. At most
+        ``max_workers`` tasks, capped at the pool's ``max_connections``, run
+        at once. Chunks are yielded as they arrive,
+        so a slow target never holds up the others. A target with a task that
+        fails or exceeds ``target_timeout_seconds`` is recorded in
+        ``failed_targets`` and skipped, and neither its watermark nor its
+        ``pg_stat_statements`` snapshot advances. Outcomes feed each target's
+        circuit breaker; targets with an open circuit are skipped without
+        connecting.
+        
+        Args:
+            query: SQL query
+            chunk_rows: Maximum rows per chunk
+            arrow: Yield Arrow record batches instead of DataFrames
+        
+        Yields:
+            pd.DataFrame or pa.RecordBatch: Query results chunk from any target
+        
+        Raises:
+            Exception: The first target error, if every target failed
+        """
+        self.failed_targets = {}
+        errors = []
+
+        tasks = []
+        for target in self.targets:
+            if self.query_mode == 'query':
+                ranges = self.plan_query_ranges(target)
+            else:
+                ranges = [None]
+            if not ranges:
+                continue
+
+            # Skip a target whose circuit is open instead of waiting out its timeouts
+            if not self.health.breaker(self._health_key(target)).allow():
+                error = CircuitOpenError(f"circuit open for {target['name']}")
+                logger.warning(f"Skipping PostgreSQL target {target['name']}: circuit open")
+                self.failed_targets[target['name']] = str(error)
+                errors.append(error)
+                continue
+
+            if self.query_mode == 'query':
+                self.stage_state(self._watermark_key(target), ranges[-1]['end_time'].isoformat())
+            tasks.extend((target, params) for params in ranges)
+        if not tasks:
+            if errors and len(self.failed_targets) == len(self.targets):
+                raise errors[0]
+            return
+        remaining = {}
+        for target, _ in tasks:
+            remaining[target['name']] = remaining.get(target['name'], 0) + 1
+
+        def fail(task: int, error: Exception) -> None:
+            target = tasks[task][0]
+            logger.error(f"PostgreSQL target {target['name']} failed: {str(error)}")
+            self.failed_targets[target['name']] = str(error)
+            self.discard_state(self._watermark_key(target))
+            self.discard_state(self._snapshot_key(target))
+            self.health.record_failure(self._health_key(target))
+            errors.append(error)
+
+        def finish(task: int) -> None:
+            target = tasks[task][0]
+            remaining[target['name']] -= 1
+            if not remaining[target['name']] and target['name'] not in self.failed_targets:
+                self.health.record_success(self._health_key(target))
+
+        # Abandoned tasks are bounded by statement_timeout; do not wait on them
+        yield from fan_out(
+            [partial(self._iter_target, target, query, chunk_rows, params, arrow) for target, params in tasks],
+            max_workers=self.max_workers,
+            queue_size=self.max_workers * 2,
+            task_timeout=self.target_timeout,
+            on_done=finish,
+            on_error=fail,
+            wait=False
+        )
+
+        if errors and len(self.failed_targets) == len(self.targets):
+            raise errors[0]
+
+    def _stream(self, chunk_rows: Optional[int], arrow: bool, commit: Optional[bool]) -> Iterator[Any]:
+        """Stream validated chunks from every target and commit state once exhausted.
+        
+        Args:
+            chunk_rows: Maximum rows per chunk (defaults to ``collectors.chunk_rows``)
+            arrow: Yield Arrow record batches instead of DataFrames
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pd.DataFrame or pa.RecordBatch: Collected metrics chunk
+        
+        Raises:
+            Exception: If collection fails
+        """
+        chunk_rows = chunk_rows or self.chunk_rows
+        start_time = datetime.now()
+        records = 0
         try:
-            with self.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(metrics_query)
-                    results = cur.fetchall()
+            for chunk in self._iter_targets(self.metrics_query, chunk_rows, arrow):
+                # Validate the collected data
+                if arrow:
+                    self.validate_batch(chunk)
+                else:
+                    self.validate_data(chunk)
+                records += len(chunk)
+                yield chunk
 
-                    if not results:
-                        df = pd.DataFrame(columns=['timestamp', 'metric_name', 'value', 'metadata'])
-                        self.update_metrics(start_time, 0)
-                        return df
+            # Snapshots and watermarks only advance once the stream has been fully consumed
+            if self.should_commit(commit):
+                self.commit_state()
 
-                    # Convert results to DataFrame
-                    df = pd.DataFrame(results, columns=['timestamp', 'metric_name', 'value', 'metadata'])
-                    
-                    # Ensure proper data types
-                    df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    df['value'] = pd.to_numeric(df['value'])
-                    
-                    # Validate the collected data
-                    self.validate_data(df)
-                    
-                    # Update metrics
-                    self.update_metrics(start_time, len(df))
-                    
-                    return df
+            # Update metrics
+            self.update_metrics(start_time, records)
 
         except Exception as e:
             self.update_metrics(start_time, 0, error=True)
             logger.error(f"Error collecting PostgreSQL metrics: {str(e)}")
             raise
 
-    def health_check(self) -> bool:
-        """Check PostgreSQL connection health.
+    def collect_iter(self, chunk_rows: Optional[int] = None, commit: Optional[bool] = None) -> Iterator[pd.DataFrame]:
+        """Stream metrics from every PostgreSQL target in fixed-size chunks.
         
-        Returns:
-            bool: True if connection is healthy
+        Args:
+            chunk_rows: Maximum rows per chunk (defaults to ``collectors.chunk_rows``)
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pd.DataFrame: Collected metrics chunk
+        
+        Raises:
+            Exception: If collection fails
         """
+        yield from self._stream(chunk_rows, arrow=False, commit=commit)
+
+    def collect_arrow_iter(
+        self,
+        chunk_rows: Optional[int] = None,
+        commit: Optional[bool] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """Stream metrics from every PostgreSQL target as ``RAW_METRIC_SCHEMA`` record batches.
+        
+        With ``fetch_mode: copy`` batches go from the COPY parser to the
+        caller without a DataFrame in between.
+        
+        Args:
+            chunk_rows: Maximum rows per batch (defaults to ``collectors.chunk_rows``)
+            commit: Commit staged state once exhausted (defaults to ``auto_commit``)
+        
+        Yields:
+            pa.RecordBatch: Collected metrics batch
+        
+        Raises:
+            Exception: If collection fails
+        """
+        yield from self._stream(chunk_rows, arrow=True, commit=commit)
+
+    def _health_key(self, target: Dict[str, Any]) -> str:
+        """Dependency name of a target for health results and its circuit breaker."""
+        return f"postgres.{target['name']}"
+
+    @property
+    def health_key(self) -> str:
+        """Dependency name for health results and the circuit breaker."""
+        return self._health_key(self.targets[0])
+
+    def _check_target(self, target: Dict[str, Any]) -> bool:
+        """Check a single target's connection health."""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(target) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT 1")
                     return cur.fetchone()[0] == 1
         except Exception as e:
-            logger.error(f"PostgreSQL health check failed: {str(e)}")
+            logger.error(f"PostgreSQL health check failed for {target['name']}: {str(e)}")
             return False
+
+    def probe(self) -> bool:
+        """Run ``SELECT 1`` on every target over pooled connections.
+        
+        Returns:
+            bool: True if every target answered
+        """
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.targets))) as executor:
+            return all(executor.map(self._check_target, self.targets))
+
+    def health_check(self, force: bool = False) -> bool:
+        """Check PostgreSQL connection health, with results cached per target.
+        
+        Args:
+            force: Probe even if cached results are still fresh
+        
+        Returns:
+            bool: True if every target is healthy
+        """
+        def check(target: Dict[str, Any]) -> bool:
+            return self.health.check(self._health_key(target), lambda: self._check_target(target), force)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.targets))) as executor:
+            return all(executor.map(check, self.targets))
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any
+import pandas as pd
+from .base_collector import BaseCollector
+from ..utils.health import CircuitOpenError, HealthRegistry
+
+logger = logging.getLogger(__name__)
+
+class _Cancelled(Exception):
+    """Raised inside a collector's thread once the runner has given up on it."""
+
+class CollectorRunner:
+    """Run collectors concurrently with a per-collector time budget and retries.
+
+    Every collector streams on its own thread, so end-to-end collection time
+    is that of the slowest source rather than the sum of all of them. A
+    collector that keeps failing or runs past ``timeout_seconds`` is recorded
+    in ``failed_collectors`` and the others' results are still returned.
+    Each collector has a circuit breaker; once it opens the collector is
+    skipped immediately until a trial run is due.
+
+    The runner takes over committing the collectors' watermarks and
+    snapshots: collectors stream with ``commit=False`` and state is only
+    committed for results the runner accepts, never for a collector that ran
+    past its budget. Collectors configured with ``auto_commit_watermark:
+    false`` are left for the caller to commit.
+    """
+
+    def __init__(self, config: Dict[str, Any], collectors: Dict[str, BaseCollector]):
+        """Initialize collector runner.
+
+        Args:
+            config: Configuration dictionary; limits are read from ``collectors``
+            collectors: Collectors keyed by source name
+        """
+        self.config = config
+        self.collectors = collectors
+        # Budget for all attempts of one collector
+        self.timeout = config['collectors'].get('timeout_seconds', 30)
+        self.retry_attempts = max(config['collectors'].get('retry_attempts', 3), 1)
+        self.retry_backoff = config['collectors'].get('retry_backoff_seconds', 1.0)
+        self.max_workers = config['collectors'].get('max_workers') or max(len(collectors), 1)
+        self.failed_collectors = {}
+        self.health = HealthRegistry.get_instance(config)
+        self._lock = threading.Lock()
+        self._finished = set()
+
+    def _breaker_key(self, name: str) -> str:
+        """Dependency name of a collector's circuit breaker."""
+        return f"collector.{name}"
+
+    def _collect(self, name: str, collector: BaseCollector, cancel: threading.Event) -> pd.DataFrame:
+        """Collect from one source, retrying failed attempts within its budget.
+
+        The stream is checked for cancellation between chunks and once more
+        when it is exhausted; a cancelled attempt drops the state it staged.
+
+        Args:
+            name: Source name
+            collector: Collector to run
+            cancel: Set once the collector's time budget is spent
+
+        Returns:
+            pd.DataFrame: Collected data
+
+        Raises:
+            _Cancelled: If cancelled
+            Exception: The last collection error once retries are exhausted
+        """
+        for attempt in range(1, self.retry_attempts + 1):
+            chunks = []
+            # run() commits accepted results itself
+            frames = collector.collect_iter(commit=False)
+            try:
+                for df in frames:
+                    if cancel.is_set():
+                        raise _Cancelled(f"{name} collection exceeded {self.timeout}s")
+                    chunks.append(df)
+
+                # Claim the result unless the budget ran out while the stream finished
+                with self._lock:
+                    if cancel.is_set():
+                        raise _Cancelled(f"{name} collection exceeded {self.timeout}s")
+                    self._finished.add(name)
+                return collector.combine_chunks(chunks)
+            except _Cancelled:
+                collector.discard_state()
+                raise
+            except Exception as e:
+                collector.discard_state()
+                if attempt == self.retry_attempts:
+                    raise
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                logger.warning(
+                    f"{name} collection attempt {attempt} failed: {str(e)}, retrying in {delay:.1f}s"
+                )
+                # Waiting on the event lets a timeout interrupt the backoff
+                if cancel.wait(delay):
+                    raise _Cancelled(f"{name} collection exceeded {self.timeout}s")
+            finally:
+                frames.close()
+
+    def run(self) -> Dict[str, pd.DataFrame]:
+        """Run every collector concurrently.
+
+        Returns:
+            Dict[str, pd.DataFrame]: Collected data for each source that succeeded
+
+        Raises:
+            Exception: The first collector error, if every collector failed
+        """
+        self.failed_collectors = {}
+        self._finished = set()
+        if not self.collectors:
+            return {}
+
+        results = {}
+        errors = []
+        started_at = {}
+        cancels = {name: threading.Event() for name in self.collectors}
+
+        def run_one(name: str) -> pd.DataFrame:
+            started_at[name] = time.monotonic()
+            return self._collect(name, self.collectors[name], cancels[name])
+
+        def fail(name: str, error: Exception) -> None:
+            logger.error(f"Collector {name} failed: {str(error)}")
+            self.failed_collectors[name] = str(error)
+            if not isinstance(error, CircuitOpenError):
+                self.health.record_failure(self._breaker_key(name))
+            errors.append(error)
+
+        # Skip collectors whose circuit is open instead of waiting out their timeouts
+        runnable = []
+        for name in self.collectors:
+            if self.health.breaker(self._breaker_key(name)).allow():
+                runnable.append(name)
+            else:
+                fail(name, CircuitOpenError(f"circuit open for {name}"))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {executor.submit(run_one, name): name for name in runnable}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                        if self.collectors[name].auto_commit:
+                            self.collectors[name].commit_state()
+                        results[name] = result
+                        self.health.record_success(self._breaker_key(name))
+                    except Exception as e:
+                        fail(name, e)
+
+                # Stop waiting on collectors that have spent their budget
+                now = time.monotonic()
+                for future in list(pending):
+                    name = futures[future]
+                    started = started_at.get(name)
+                    if started is not None and now - started > self.timeout:
+                        with self._lock:
+                            # Finished within its budget; accepted on the next wait
+                            if name in self._finished:
+                                continue
+                            cancels[name].set()
+                        pending.discard(future)
+                        fail(name, TimeoutError(f"{name} collection exceeded {self.timeout}s"))
+        finally:
+            for cancel in cancels.values():
+                cancel.set()
+            # Cancelled collectors stop at their next chunk; do not wait on them
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if errors and len(self.failed_collectors) == len(self.collectors):
+            raise errors[0]
+        return results
+
+    def health_check(self) -> Dict[str, bool]:
+        """Check every collector's source concurrently, reusing recent probe results.
+
+        Returns:
+            Dict[str, bool]: Health per source name
+        """
+        if not self.collectors:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            checks = {name: executor.submit(collector.health_check) for name, collector in self.collectors.items()}
+            return {name: future.result() for name, future in checks.items()}
@@ -0,0 +1,238 @@
+import logging
+from typing import Dict, List, Optional
+import pandas as pd
+import pyarrow as pa
+from ..utils.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Columns identifying a series; a window is a series plus its window start
+SERIES_KEYS = ['metric_name', 'source', 'dimension_id']
+WINDOW_KEYS = ['timestamp', *SERIES_KEYS]
+
+# Partial aggregate column -> how two partials of the same window combine
+PARTIAL_MERGES = {
+    'value_sum': 'sum',
+    'value_count': 'sum',
+    'value_min': 'min',
+    'value_max': 'max',
+    'value_sumsq': 'sum'
+}
+PARTIAL_COLUMNS = [*WINDOW_KEYS, *PARTIAL_MERGES]
+
+DAY = pd.Timedelta('1D')
+
+def window_size(window: str) -> pd.Timedelta:
+    """Duration of a fixed-size window such as ``1min``, ``h`` or ``1D``.
+
+    Args:
+        window: Window as a pandas frequency
+
+    Returns:
+        pd.Timedelta: Window duration
+
+    Raises:
+        ValueError: If the window is not a fixed duration
+    """
+    offset = pd.tseries.frequencies.to_offset(window)
+    if not isinstance(offset, (pd.offsets.Tick, pd.offsets.Day)):
+        raise ValueError(f"Window {window} is not a fixed duration")
+    epoch = pd.Timestamp(0)
+    return (epoch + offset) - epoch
+
+def day_aligned_size(name: str, window: str) -> pd.Timedelta:
+    """Size of a window that must evenly divide a day, so bins line up across runs.
+
+    Args:
+        name: What the window belongs to, for error messages
+        window: Window as a pandas frequency
+
+    Returns:
+        pd.Timedelta: Window duration
+
+    Raises:
+        ValueError: If the window is not a fixed size dividing a day
+    """
+    try:
+        size = window_size(window)
+    except ValueError:
+        raise ValueError(f"{name} window {window} is not a fixed duration")
+    if size <= pd.Timedelta(0) or DAY % size:
+        raise ValueError(f"{name} window {window} must evenly divide one day")
+    return size
+
+def resolve_rollups(rollups: Dict[str, str]) -> Dict[str, str]:
+    """Order rollup resolutions from finest to coarsest and check they nest.
+
+    Every window must divide a day so bins line up across runs, and every
+    coarser window must be a multiple of the finest so it can be built by
+    merging finest-resolution partials.
+
+    Args:
+        rollups: Resolution label (e.g. ``1h``) -> pandas frequency
+
+    Returns:
+        Dict[str, str]: The same resolutions, finest first
+
+    Raises:
+        ValueError: If a window is not a fixed size dividing a day, or does not nest
+    """
+    sizes = {label: day_aligned_size(f"Rollup {label}", window) for label, window in rollups.items()}
+
+    ordered = sorted(rollups, key=sizes.get)
+    if ordered:
+        finest = sizes[ordered[0]]
+        for label in ordered[1:]:
+            if sizes[label] % finest:
+                raise ValueError(f"Rollup {label} window {rollups[label]} is not a multiple of {rollups[ordered[0]]}")
+    return {label: rollups[label] for label in ordered}
+
+def partial_aggregates(df: pd.DataFrame, window: str) -> pd.DataFrame:
+    """Reduce raw rows to mergeable partial aggregates per window and series.
+
+    Missing values (e.g. outliers blanked to NaN) are left out of every
+    partial, so a window of only missing values has a zero count.
+
+    Args:
+        df: Rows with ``timestamp``, ``value`` and the series key columns
+        window: Window size as a pandas frequency (e.g. ``1min``, ``1h``)
+
+    Returns:
+        pd.DataFrame: One row per window with ``PARTIAL_COLUMNS``
+    """
+    values = pd.to_numeric(df['value']).astype(float)
+    return df.assign(value=values, value_sumsq=values * values).groupby(
+        [pd.Grouper(key='timestamp', freq=window), *SERIES_KEYS], observed=True
+    ).agg(
+        value_sum=('value', 'sum'),
+        value_count=('value', 'count'),
+        value_min=('value', 'min'),
+        value_max=('value', 'max'),
+        value_sumsq=('value_sumsq', 'sum')
+    ).reset_index()[PARTIAL_COLUMNS]
+
+def merge_partials(partials: pd.DataFrame, window: Optional[str] = None) -> pd.DataFrame:
+    """Combine partial aggregates that belong to the same window.
+
+    Args:
+        partials: Partial aggregates, possibly several per window
+        window: Coarser window to roll up to; None keeps the existing windows
+
+    Returns:
+        pd.DataFrame: One row per window with ``PARTIAL_COLUMNS``
+    """
+    window_key = pd.Grouper(key='timestamp', freq=window) if window else 'timestamp'
+    return partials.groupby(
+        [window_key, *SERIES_KEYS], observed=True
+    ).agg(PARTIAL_MERGES).reset_index()[PARTIAL_COLUMNS]
+
+def finalize_partials(partials: pd.DataFrame) -> pd.DataFrame:
+    """Turn partial aggregates into output statistics.
+
+    Args:
+        partials: Partial aggregates
+
+    Returns:
+        pd.DataFrame: Window keys with ``value`` (mean), ``value_min``, ``value_max`` and ``value_count``
+    """
+    counts = partials['value_count'].astype('int64')
+    return partials[WINDOW_KEYS].assign(
+        value=partials['value_sum'] / counts.where(counts > 0),
+        value_min=partials['value_min'],
+        value_max=partials['value_max'],
+        value_count=counts
+    )
+
+class WindowStateStore:
+    """Persisted partial aggregates so each run only folds in new data.
+
+    State is partitioned by window day; a run loads and rewrites only the
+    days its new rows fall in, so its cost follows the size of the delta
+    rather than the whole history. Rows delivered twice are counted twice,
+    which is why the collectors feeding the processor read incrementally.
+
+    Folded partitions are staged rather than written, like collector
+    watermarks: ``commit()`` persists them once the emitted windows have
+    been stored and ``discard()`` drops them, so a batch whose output was
+    never stored can be reprocessed without being counted twice.
+    """
+
+    def __init__(self, state: StateStore, name: str = 'unified.windows'):
+        """Initialize window state store.
+
+        Args:
+            state: Store used to persist partitions
+            name: Key prefix of the partitions
+        """
+        self.state = state
+        self.name = name
+        # Day partition key -> folded partials not yet committed
+        self._pending: Dict[str, pd.DataFrame] = {}
+
+    def _key(self, day: pd.Timestamp) -> str:
+        """State key of one day's partition."""
+        return f"{self.name}.{day:%Y-%m-%d}"
+
+    def load(self, day: pd.Timestamp) -> pd.DataFrame:
+        """Load the partial aggregates of one day, including staged folds.
+
+        Args:
+            day: Day of the window starts
+
+        Returns:
+            pd.DataFrame: Stored partials with string series keys (empty if none)
+        """
+        key = self._key(day)
+        if key in self._pending:
+            return self._pending[key]
+        table = self.state.load_table(key)
+        if table is None:
+            return pd.DataFrame(columns=PARTIAL_COLUMNS)
+        return table.to_pandas()
+
+    def fold(self, partials: pd.DataFrame) -> pd.DataFrame:
+        """Merge new partial aggregates into the state and stage the result.
+
+        Args:
+            partials: Partial aggregates computed from new rows only
+
+        Returns:
+            pd.DataFrame: Updated partials of every window touched by ``partials``,
+            with string series keys
+        """
+        if partials.empty:
+            return partials
+
+        # Persist plain strings so state does not depend on a processor's category codes
+        partials = partials.astype({'metric_name': str, 'source': str})
+        updated: List[pd.DataFrame] = []
+
+        for day, delta in partials.groupby(partials['timestamp'].dt.floor('D')):
+            stored = self.load(day)
+            merged = merge_partials(pd.concat([stored, delta], ignore_index=True) if len(stored) else delta)
+            merged = merged.astype({'value_count': 'int64'})
+            self._pending[self._key(day)] = merged
+            updated.append(merged.merge(delta[WINDOW_KEYS], on=WINDOW_KEYS))
+
+        logger.info(f"Folded {len(partials)} partial aggregates into {len(updated)} day partitions of {self.name}")
+        return pd.concat(updated, ignore_index=True)
+
+    def commit(self) -> None:
+        """Persist the partitions staged by ``fold`` since the last commit."""
+        for key, merged in list(self._pending.items()):
+            self.state.save_table(key, pa.Table.from_pandas(merged, preserve_index=False))
+        self._pending = {}
+
+    def discard(self) -> None:
+        """Drop staged partitions so they are never committed."""
+        self._pending = {}
+
+    def clear(self, days: List[pd.Timestamp]) -> None:
+        """Drop stored partials, e.g. before reprocessing days from scratch.
+
+        Args:
+            days: Days whose partitions are removed
+        """
+        for day in days:
+            self._pending.pop(self._key(day), None)
+            self.state.delete(self._key(day))
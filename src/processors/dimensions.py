@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import math
+from typing import Dict, Any, Iterable, List, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DimensionSet = Tuple[Tuple[str, str], ...]
+
+def canonicalize(dimensions: Any) -> DimensionSet:
+    """Canonical form of a dimension set: sorted (key, value) string pairs.
+
+    Dicts, JSON object text and ``(key, value)`` pair lists (Arrow maps) are
+    accepted; missing values are the empty set. Non-string values are
+    JSON-encoded so equal sets always produce the same pairs.
+
+    Args:
+        dimensions: Dimension set in any supported form
+
+    Returns:
+        DimensionSet: Sorted key/value pairs
+    """
+    if dimensions is None or (isinstance(dimensions, float) and math.isnan(dimensions)):
+        return ()
+    if isinstance(dimensions, str):
+        dimensions = json.loads(dimensions) if dimensions else {}
+    items = dimensions.items() if isinstance(dimensions, dict) else dimensions
+    return tuple(sorted(
+        (str(key), value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str))
+        for key, value in items
+    ))
+
+def dimension_id(pairs: DimensionSet) -> int:
+    """Stable signed 64-bit ID of a canonical dimension set.
+
+    The ID is a hash of the pairs, so it is the same across runs and
+    processes and can be persisted or joined on.
+
+    Args:
+        pairs: Canonical dimension set
+
+    Returns:
+        int: Dimension set ID
+    """
+    digest = hashlib.blake2b(json.dumps(pairs).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+class DimensionInterner:
+    """Interns dimension sets to int64 IDs so grouping and dedupe never hash dicts.
+
+    Each distinct set is canonicalized and hashed once; the ID -> dict
+    mapping is kept so dicts are only rebuilt when output is materialized.
+    """
+
+    def __init__(self):
+        """Initialize dimension interner."""
+        self.dimensions: Dict[int, Dict[str, str]] = {}
+        self._ids: Dict[DimensionSet, int] = {}
+
+    def intern(self, dimensions: Any) -> int:
+        """Get the ID of one dimension set, registering it if new.
+
+        Args:
+            dimensions: Dimension set as a dict, JSON text, pairs or None
+
+        Returns:
+            int: Dimension set ID
+
+        Raises:
+            ValueError: If two different sets hash to the same ID
+        """
+        pairs = canonicalize(dimensions)
+        interned = self._ids.get(pairs)
+        if interned is None:
+            interned = dimension_id(pairs)
+            existing = self.dimensions.get(interned)
+            if existing is not None and tuple(sorted(existing.items())) != pairs:
+                raise ValueError(f"Dimension ID collision for {dict(pairs)} and {existing}")
+            self._ids[pairs] = interned
+            self.dimensions[interned] = dict(pairs)
+        return interned
+
+    def encode(self, values: Iterable[Any]) -> np.ndarray:
+        """Intern a column of dimension sets.
+
+        Repeated dict objects (e.g. shared per metric by a collector) and
+        repeated JSON text are only canonicalized once per call.
+
+        Args:
+            values: Dimension sets per row
+
+        Returns:
+            np.ndarray: int64 ID per row
+        """
+        seen = {}
+        ids = []
+        for value in values:
+            # Dicts are unhashable; they are alive for the whole loop, so id() is stable
+            key = id(value) if isinstance(value, (dict, list)) else value
+            try:
+                interned = seen.get(key)
+            except TypeError:
+                key, interned = id(value), None
+            if interned is None:
+                interned = self.intern(value)
+                seen[key] = interned
+            ids.append(interned)
+        return np.array(ids, dtype=np.int64)
+
+    def decode(self, ids: Iterable[int]) -> List[Dict[str, str]]:
+        """Materialize dimension dicts for IDs.
+
+        Rows with the same ID share one dict object.
+
+        Args:
+            ids: Dimension set IDs
+
+        Returns:
+            List[Dict[str, str]]: Dimension dict per ID
+
+        Raises:
+            KeyError: If an ID was not interned by this interner
+        """
+        return [self.dimensions[int(value)] for value in ids]
+
+    def __len__(self) -> int:
+        return len(self.dimensions)
@@ -0,0 +1,147 @@
+import logging
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class CategoryRegistry:
+    """Append-only category list shared by every batch a processor sees.
+
+    Columns encoded against the same registry have identical categorical
+    dtypes once aligned, so concatenation, groupby and sorts stay on integer
+    codes instead of falling back to object strings.
+    """
+
+    def __init__(self):
+        """Initialize category registry."""
+        self.categories: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def index_of(self, value: str) -> int:
+        """Get the category code of a value, adding it if new.
+
+        Args:
+            value: Category value
+
+        Returns:
+            int: Category code
+        """
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self._index[value] = code
+        return code
+
+    @property
+    def dtype(self) -> pd.CategoricalDtype:
+        """Categorical dtype covering every value seen so far."""
+        return pd.CategoricalDtype(self.categories)
+
+    def encode(self, values: pd.Series, mapping: Optional[Dict[str, str]] = None) -> pd.Series:
+        """Encode a column as a categorical, renaming values through ``mapping``.
+
+        Only the distinct values are looked up in Python; rows are recoded
+        with a single vectorized take.
+
+        Args:
+            values: Column to encode
+            mapping: Optional value renames
+
+        Returns:
+            pd.Series: Categorical column with the registry's current dtype
+        """
+        codes, uniques = pd.factorize(values)
+        mapping = mapping or {}
+        # Trailing -1 so missing values (factorize code -1) stay missing
+        unique_codes = np.array(
+            [self.index_of(str(mapping.get(value, value))) for value in uniques] + [-1],
+            dtype=np.int64
+        )
+        return pd.Series(
+            pd.Categorical.from_codes(unique_codes[codes], dtype=self.dtype),
+            index=values.index,
+            name=values.name
+        )
+
+    def align(self, values: pd.Series) -> pd.Series:
+        """Widen an encoded column to the registry's current categories.
+
+        Categories are only ever appended, so existing codes stay valid.
+
+        Args:
+            values: Column encoded by this registry
+
+        Returns:
+            pd.Series: Column with the current dtype
+        """
+        if values.dtype == self.dtype:
+            return values
+        return pd.Series(
+            pd.Categorical.from_codes(values.cat.codes.to_numpy(), dtype=self.dtype),
+            index=values.index,
+            name=values.name
+        )
+
+class MetricNormalizer:
+    """Applies ``processors.metric_mappings`` and encodes metric/source columns as categoricals."""
+
+    def __init__(self, metric_mappings: Dict[str, Dict[str, str]]):
+        """Initialize metric normalizer.
+
+        Args:
+            metric_mappings: Per-source metric renames (source name -> {raw name: unified name})
+        """
+        self.metric_mappings = metric_mappings or {}
+        self.metric_names = CategoryRegistry()
+        self.sources = CategoryRegistry()
+
+    def normalize(self, df: pd.DataFrame, source: str) -> pd.DataFrame:
+        """Rename a source's metrics and encode ``metric_name`` and ``source``.
+
+        Args:
+            df: Frame with a ``metric_name`` column
+            source: Source name; selects the mapping and fills ``source``
+
+        Returns:
+            pd.DataFrame: Copy with categorical ``metric_name`` and ``source``
+        """
+        source_code = self.sources.index_of(source)
+        return df.assign(
+            metric_name=self.metric_names.encode(df['metric_name'], self.metric_mappings.get(source)),
+            source=pd.Categorical.from_codes(
+                np.full(len(df), source_code, dtype=np.int64), dtype=self.sources.dtype
+            )
+        )
+
+    def restore(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Encode already-normalized ``metric_name`` and ``source`` values (e.g. loaded from state).
+
+        Args:
+            df: Frame whose names have been mapped before
+
+        Returns:
+            pd.DataFrame: Copy with categorical ``metric_name`` and ``source``
+        """
+        return df.assign(
+            metric_name=self.metric_names.encode(df['metric_name']),
+            source=self.sources.encode(df['source'])
+        )
+
+    def align(self, frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+        """Give normalized frames identical categorical dtypes before they are combined.
+
+        Args:
+            frames: Frames returned by ``normalize``
+
+        Returns:
+            List[pd.DataFrame]: Frames sharing the current metric and source dtypes
+        """
+        return [
+            df.assign(
+                metric_name=self.metric_names.align(df['metric_name']),
+                source=self.sources.align(df['source'])
+            )
+            for df in frames
+        ]
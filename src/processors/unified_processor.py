@@ -1,12 +1,38 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 import numpy as np
+from .aggregates import (
+    WindowStateStore,
+    day_aligned_size,
+    finalize_partials,
+    merge_partials,
+    partial_aggregates,
+    resolve_rollups,
+    window_size
+)
 from .base_processor import BaseProcessor
+from .dimensions import DimensionInterner
+from .normalization import MetricNormalizer
+from .outliers import OutlierEngine
+from ..utils.arrow_utils import arrow_to_frame
+from ..utils.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_COLUMNS = [
+    'timestamp', 'metric_name', 'source', 'dimensions',
+    'value', 'value_min', 'value_max', 'value_count'
+]
+
+# Output shape while dimensions are still interned int64 codes
+INTERNED_COLUMNS = [
+    'timestamp', 'metric_name', 'source', 'dimension_id',
+    'value', 'value_min', 'value_max', 'value_count'
+]
+
 class UnifiedProcessor(BaseProcessor):
     """Processes and unifies metrics from different sources."""
 
@@ -15,111 +41,259 @@ class UnifiedProcessor(BaseProcessor):
         
         Args:
             config: Configuration dictionary
+        
+        Raises:
+            ValueError: If configured rollup windows do not nest, or window state
+                is enabled with an aggregation window that does not divide a day
         """
         super().__init__(config)
-        self.aggregation_window = config['processors']['unified'].get('aggregation_window', '1H')
-        self.outlier_threshold = config['processors']['unified'].get('outlier_threshold', 3.0)
+        unified_config = config['processors'].get('unified', {})
+        self.aggregation_window = unified_config.get('aggregation_window', '1h')
+        self.outliers = OutlierEngine(unified_config)
+        self.dimensions = DimensionInterner()
+        self.metric_mappings = config['processors'].get('metric_mappings', {})
+        self.normalizer = MetricNormalizer(self.metric_mappings)
+
+        # Rollup label -> window, finest first
+        self.rollups = resolve_rollups({
+            label: rollup['window'] for label, rollup in (unified_config.get('rollups') or {}).items()
+        })
+
+        # Persisted partial aggregates; without it every run aggregates its batch alone
+        window_state = unified_config.get('window_state', {})
+        self.window_state = None
+        self.rollup_states = {}
+        if window_state.get('enabled', False):
+            # State is partitioned by day, so windows must not straddle midnight
+            day_aligned_size('Aggregation', self.aggregation_window)
+            state = StateStore(config)
+            name = window_state.get('name', 'unified.windows')
+            self.window_state = WindowStateStore(state, name)
+            self.rollup_states = {label: WindowStateStore(state, f"{name}.{label}") for label in self.rollups}
 
-    def detect_outliers(self, group: pd.DataFrame) -> pd.Series:
-        """Detect outliers using Z-score method.
+    def _clean(self, processed_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+        """Combine standardized raw rows, drop duplicates and blank outliers.
         
         Args:
-            group: DataFrame group to check for outliers
+            processed_dfs: Standardized DataFrames, one per source
         
         Returns:
-            pd.Series: Boolean mask of outliers
+            pd.DataFrame: Raw rows with outlier values set to NaN
         """
-        z_scores = np.abs((group['value'] - group['value'].mean()) / group['value'].std())
-        return z_scores > self.outlier_threshold
+        # Combine all sources
+        unified_df = pd.concat(processed_dfs, ignore_index=True)
 
-    def process(self, data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Process and unify metrics from different sources.
+        # Remove duplicates
+        unified_df = unified_df.drop_duplicates()
+
+        # Sort by timestamp
+        unified_df = unified_df.sort_values('timestamp')
+
+        # Detect and handle outliers per (metric_name, source) series
+        outliers = self.outliers.detect(unified_df, ['metric_name', 'source'])
+        unified_df.loc[outliers, 'value'] = np.nan
+
+        return unified_df
+
+    def _finalize(self, partials: pd.DataFrame, window_state: Optional[WindowStateStore]) -> pd.DataFrame:
+        """Fold partials into window state, if enabled, and compute output statistics.
         
         Args:
-            data: Dictionary of DataFrames from different collectors
+            partials: Partial aggregates of this batch
+            window_state: State to fold into; None aggregates the batch alone
         
         Returns:
-            pd.DataFrame: Processed and unified data
+            pd.DataFrame: Aggregated data with interned ``dimension_id`` codes
+        """
+        if window_state is not None:
+            partials = self.normalizer.restore(window_state.fold(partials))
+        return finalize_partials(partials)[INTERNED_COLUMNS]
+
+    def aggregate(self, processed_dfs: List[pd.DataFrame]) -> pd.DataFrame:
+        """Combine standardized raw rows and aggregate them by window.
+        
+        With window state enabled, the batch's partial aggregates are folded
+        into the window state and every window they touch is emitted with
+        its statistics over all runs, not just this batch. The fold is only
+        persisted by ``commit_state()``.
+        
+        Args:
+            processed_dfs: Standardized DataFrames, one per source
+        
+        Returns:
+            pd.DataFrame: Aggregated data with interned ``dimension_id`` codes
+        """
+        # Aggregate by window into mergeable partials (sum, count, min, max, sum of squares)
+        partials = partial_aggregates(self._clean(processed_dfs), self.aggregation_window)
+        return self._finalize(partials, self.window_state)
+
+    def rollup(self, processed_dfs: List[pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Aggregate raw rows at every rollup resolution in a single pass.
+        
+        Raw rows are only aggregated at the finest resolution; coarser ones
+        merge those partials, so the input is scanned once however many
+        resolutions are configured. Each resolution has its own window state.
+        
+        Args:
+            processed_dfs: Standardized DataFrames, one per source
+        
+        Returns:
+            Dict[str, pd.DataFrame]: Aggregated data per rollup label, finest first
+        """
+        labels = list(self.rollups)
+        finest = partial_aggregates(self._clean(processed_dfs), self.rollups[labels[0]])
+        return {
+            label: self._finalize(
+                finest if label == labels[0] else merge_partials(finest, self.rollups[label]),
+                self.rollup_states.get(label)
+            )
+            for label in labels
+        }
+
+    def _window_states(self) -> List[WindowStateStore]:
+        """Every enabled window state, for the aggregation window and each rollup."""
+        states = list(self.rollup_states.values())
+        if self.window_state is not None:
+            states.insert(0, self.window_state)
+        return states
+
+    def commit_state(self) -> None:
+        """Persist the window state folded by ``process()`` and ``process_rollups()``.
+        
+        Call once the processed output has been stored; until then a failed
+        write can be retried by reprocessing the same batch.
+        """
+        for state in self._window_states():
+            state.commit()
+
+    def discard_state(self) -> None:
+        """Drop folded window state whose processed output was not stored."""
+        for state in self._window_states():
+            state.discard()
+
+    def _standardize(
+        self,
+        data: Dict[str, Union[pd.DataFrame, pa.Table, pa.RecordBatch]]
+    ) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+        """Bring every source into the processor's column layout.
+        
+        Args:
+            data: Dictionary of DataFrames or Arrow data from different collectors
+        
+        Returns:
+            Tuple[List[pd.DataFrame], List[pd.DataFrame]]: Raw rows and pre-aggregated rows
         
         Raises:
-            ValueError: If data validation fails
+            ValueError: If there is no data
         """
-        start_time = datetime.now()
-        try:
-            if not data:
-                raise ValueError("No data to process")
+        if not data:
+            raise ValueError("No data to process")
 
-            processed_dfs = []
+        processed_dfs = []
+        aggregated_dfs = []
 
-            # Process each source
-            for source, df in data.items():
-                if df.empty:
-                    continue
+        # Process each source
+        for source, df in data.items():
+            if isinstance(df, (pa.Table, pa.RecordBatch)):
+                df = arrow_to_frame(df)
 
-                # Standardize column names
-                df = df.rename(columns={
-                    'metric_id': 'metric_name',
-                    'name': 'metric_name',
-                    'metadata': 'dimensions',
-                    'attributes': 'dimensions'
-                })
+            if df.empty:
+                continue
 
-                # Ensure timestamp is datetime
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # Pre-aggregated input (e.g. MongoDB pushdown) is already in output shape
+            if 'value_count' in df.columns:
+                df = self.normalizer.normalize(df, source)
+                df['dimension_id'] = self.dimensions.encode(df['dimensions'])
+                aggregated_dfs.append(df[INTERNED_COLUMNS])
+                continue
 
-                # Add source column
-                df['source'] = source
+            # Standardize column names
+            df = df.rename(columns={
+                'metric_id': 'metric_name',
+                'name': 'metric_name',
+                'metadata': 'dimensions',
+                'attributes': 'dimensions'
+            })
 
-                # Handle missing dimensions
-                if 'dimensions' not in df.columns:
-                    df['dimensions'] = None
+            # Ensure timestamp is datetime
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
 
-                # Select required columns
-                df = df[['timestamp', 'metric_name', 'value', 'source', 'dimensions']]
+            # Apply metric mappings; encode metric_name and source as categoricals
+            df = self.normalizer.normalize(df, source)
 
-                processed_dfs.append(df)
+            # Intern dimension sets so grouping and dedupe run on int64 codes
+            if 'dimensions' in df.columns:
+                df['dimension_id'] = self.dimensions.encode(df['dimensions'])
+            else:
+                df['dimension_id'] = self.dimensions.intern(None)
 
-            if not processed_dfs:
-                return pd.DataFrame(columns=['timestamp', 'metric_name', 'value', 'source', 'dimensions'])
+            # Select required columns
+            df = df[['timestamp', 'metric_name', 'value', 'source', 'dimension_id']]
+
+            processed_dfs.append(df)
+
+        # Later sources may have added categories; align so concat stays categorical
+        return self.normalizer.align(processed_dfs), aggregated_dfs
 
-            # Combine all sources
-            unified_df = pd.concat(processed_dfs, ignore_index=True)
+    def _materialize(self, aggregated_dfs: List[pd.DataFrame]) -> Tuple[pd.DataFrame, float]:
+        """Combine aggregated frames into validated output rows.
+        
+        Args:
+            aggregated_dfs: Aggregated frames with interned ``dimension_id`` codes
+        
+        Returns:
+            Tuple[pd.DataFrame, float]: Output rows and their data quality score
+        
+        Raises:
+            ValueError: If data validation fails
+        """
+        unified_df = pd.concat(self.normalizer.align(aggregated_dfs), ignore_index=True)
 
-            # Remove duplicates
-            unified_df = unified_df.drop_duplicates()
+        # Calculate data quality score while dimensions are still int codes
+        quality_score = self.calculate_data_quality(unified_df)
 
-            # Sort by timestamp
-            unified_df = unified_df.sort_values('timestamp')
+        # Materialize dimension dicts for output; rows with the same set share one dict
+        unified_df['dimensions'] = self.dimensions.decode(unified_df['dimension_id'])
+        unified_df = unified_df[OUTPUT_COLUMNS]
 
-            # Detect and handle outliers
-            grouped = unified_df.groupby(['metric_name', 'source'])
-            outliers = grouped.apply(self.detect_outliers).reset_index(level=[0, 1], drop=True)
-            unified_df.loc[outliers, 'value'] = np.nan
+        # Validate processed data
+        self.validate_schema(unified_df)
 
-            # Aggregate by window
-            unified_df = unified_df.set_index('timestamp').groupby([
-                pd.Grouper(freq=self.aggregation_window),
-                'metric_name',
-                'source',
-                'dimensions'
-            ]).agg({
-                'value': ['mean', 'min', 'max', 'count']
-            }).reset_index()
+        return unified_df, quality_score
 
-            # Flatten column names
-            unified_df.columns = [
-                'timestamp', 'metric_name', 'source', 'dimensions',
-                'value_mean', 'value_min', 'value_max', 'value_count'
-            ]
+    def process(self, data: Dict[str, Union[pd.DataFrame, pa.Table, pa.RecordBatch]]) -> pd.DataFrame:
+        """Process and unify metrics from different sources.
+        
+        Arrow input (``RAW_METRIC_SCHEMA``) is converted once, with metric
+        names as categoricals and metadata maps as dicts. Metric names are
+        renamed through ``processors.metric_mappings`` and, with the source,
+        encoded as categoricals shared across batches. Dimension sets are
+        interned to int64 IDs for dedupe and grouping, and dicts are only
+        materialized for the output rows.
+        
+        With window state enabled, call ``commit_state()`` once the result
+        has been stored, or ``discard_state()`` if storing it failed.
+        
+        Args:
+            data: Dictionary of DataFrames or Arrow data from different collectors
+        
+        Returns:
+            pd.DataFrame: Processed and unified data
+        
+        Raises:
+            ValueError: If data validation fails
+        """
+        start_time = datetime.now()
+        try:
+            processed_dfs, aggregated_dfs = self._standardize(data)
 
-            # Use mean as the main value
-            unified_df = unified_df.rename(columns={'value_mean': 'value'})
+            if not processed_dfs and not aggregated_dfs:
+                return pd.DataFrame(columns=['timestamp', 'metric_name', 'value', 'source', 'dimensions'])
 
-            # Validate processed data
-            self.validate_schema(unified_df)
+            if processed_dfs:
+                aggregated_dfs.insert(0, self.aggregate(processed_dfs))
 
-            # Calculate data quality score
-            quality_score = self.calculate_data_quality(unified_df)
+            unified_df, quality_score = self._materialize(aggregated_dfs)
 
             # Update metrics
             self.update_metrics(start_time, len(unified_df), quality_score)
@@ -127,13 +301,79 @@ class UnifiedProcessor(BaseProcessor):
             return unified_df
 
         except Exception as e:
+            self.discard_state()
             self.update_metrics(start_time, 0, 0.0, error=True)
             logger.error(f"Error processing data: {str(e)}")
             raise
 
+    def process_rollups(
+        self,
+        data: Dict[str, Union[pd.DataFrame, pa.Table, pa.RecordBatch]]
+    ) -> Dict[str, pd.DataFrame]:
+        """Process metrics into every resolution in ``processors.unified.rollups``.
+        
+        Pre-aggregated input has no sum of squares to merge, so it is only
+        added to the resolution whose window equals ``aggregation_window``.
+        Folded window state is committed as for ``process()``.
+        
+        Args:
+            data: Dictionary of DataFrames or Arrow data from different collectors
+        
+        Returns:
+            Dict[str, pd.DataFrame]: Processed data per rollup label, finest first
+        
+        Raises:
+            ValueError: If no rollups are configured or data validation fails
+        """
+        start_time = datetime.now()
+        try:
+            if not self.rollups:
+                raise ValueError("No rollups configured in processors.unified.rollups")
+
+            processed_dfs, aggregated_dfs = self._standardize(data)
+            levels = self.rollup(processed_dfs) if processed_dfs else {}
+
+            passthrough = next(
+                (label for label, window in self.rollups.items()
+                 if window_size(window) == window_size(self.aggregation_window)),
+                None
+            ) if aggregated_dfs else None
+            if aggregated_dfs and passthrough is None:
+                logger.warning(
+                    f"No rollup matches aggregation window {self.aggregation_window}, "
+                    f"dropping {sum(len(df) for df in aggregated_dfs)} pre-aggregated rows"
+                )
+
+            results = {}
+            quality_score = None
+            for label in self.rollups:
+                frames = [levels[label]] if label in levels else []
+                if label == passthrough:
+                    frames.extend(aggregated_dfs)
+                if not frames:
+                    results[label] = pd.DataFrame(columns=OUTPUT_COLUMNS)
+                    continue
+                results[label], score = self._materialize(frames)
+                # Quality of the finest resolution with data
+                if quality_score is None:
+                    quality_score = score
+
+            self.update_metrics(start_time, sum(len(df) for df in results.values()), quality_score or 0.0)
+
+            return results
+
+        except Exception as e:
+            self.discard_state()
+            self.update_metrics(start_time, 0, 0.0, error=True)
+            logger.error(f"Error processing rollups: {str(e)}")
+            raise
+
     def health_check(self) -> bool:
         """Check processor health.
         
+        The test row is aggregated on its own, without folding it into
+        window state or counting it in the processor metrics.
+        
         Returns:
             bool: True if processor is healthy
         """
@@ -149,7 +389,9 @@ class UnifiedProcessor(BaseProcessor):
             }
             
             # Try to process it
-            result = self.process(test_data)
+            processed_dfs, _ = self._standardize(test_data)
+            partials = partial_aggregates(self._clean(processed_dfs), self.aggregation_window)
+            result, _ = self._materialize([self._finalize(partials, None)])
             return len(result) > 0
         except Exception as e:
             logger.error(f"Processor health check failed: {str(e)}")
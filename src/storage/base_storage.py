@@ -5,6 +5,7 @@ import logging
 from datetime import datetime
 from pyiceberg.schema import Schema
 from pyiceberg.table import Table
+from ..utils.health import HealthRegistry
 from ..utils.iceberg_utils import IcebergTableManager
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ class BaseStorage(ABC):
         """
         self.config = config
         self.iceberg = IcebergTableManager(config)
+        self.health = HealthRegistry.get_instance(config)
         self.metrics = {
             'last_write_time': None,
             'records_written': 0,
@@ -96,14 +98,19 @@ class BaseStorage(ABC):
         }
         self._write_count = 0
 
-    @abstractmethod
-    def health_check(self) -> bool:
-        """Check storage health.
+    def health_check(self, force: bool = False) -> bool:
+        """Check storage health with a read-only catalog probe.
+        
+        Nothing is written, so checks create no snapshots. Every storage
+        on the same catalog shares one cached result and circuit breaker.
+        
+        Args:
+            force: Probe even if a cached result is still fresh
         
         Returns:
-            bool: True if storage is healthy
+            bool: True if the catalog is reachable
         """
-        raise NotImplementedError("Storage classes must implement health_check method")
+        return self.health.check(f"iceberg.{self.iceberg.catalog_name}", self.iceberg.ping, force)
 
     def __str__(self) -> str:
         """String representation of the storage.
@@ -1,7 +1,11 @@
+import json
 import logging
-from typing import Dict, Any, Optional
+from functools import reduce
+from typing import Dict, Any, Optional, Tuple, Union
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
+from pyiceberg.expressions import And, BooleanExpression, EqualTo, In, Or
 from pyiceberg.schema import Schema
 from pyiceberg.types import (
     TimestampType,
@@ -14,6 +18,9 @@ from .base_storage import BaseStorage
 
 logger = logging.getLogger(__name__)
 
+# Columns identifying a stored window; dimensions are a map and cannot be filtered on
+WINDOW_COLUMNS = ['timestamp', 'metric_name', 'source']
+
 class ProcessedStorage(BaseStorage):
     """Storage implementation for processed metrics data using Iceberg."""
 
@@ -22,6 +29,7 @@ class ProcessedStorage(BaseStorage):
         super().__init__(config)
         self.warehouse_namespace = config['storage'].get('processed_namespace', 'processed')
         self.schema_version = config['storage'].get('schema_version', 'v1')
+        self.rollups = config.get('processors', {}).get('unified', {}).get('rollups') or {}
 
     def get_schema(self) -> Schema:
         """Get Iceberg schema for processed metrics.
@@ -50,24 +58,103 @@ class ProcessedStorage(BaseStorage):
             ]
         )
 
+    def _window_filter(self, keys: pd.DataFrame) -> BooleanExpression:
+        """Row filter matching every window in ``keys``.
+        
+        Args:
+            keys: Rows with ``WINDOW_COLUMNS``
+        
+        Returns:
+            BooleanExpression: Filter on window start, metric and source
+        """
+        # Timestamp literals as epoch microseconds; naive timestamps are UTC
+        micros = (pd.to_datetime(keys['timestamp'], utc=True) - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(microseconds=1)
+        keys = pd.DataFrame({
+            'metric_name': keys['metric_name'].astype(str),
+            'source': keys['source'].astype(str),
+            'timestamp': micros
+        })
+        clauses = [
+            And(EqualTo('metric_name', metric), EqualTo('source', source), In('timestamp', set(windows['timestamp'])))
+            for (metric, source), windows in keys.groupby(['metric_name', 'source'])
+        ]
+        return reduce(Or, clauses)
+
+    def _series_keys(self, df: pd.DataFrame) -> pd.Series:
+        """Window start, metric, source and dimension set of every row as one comparable key."""
+        dimensions = df['dimensions'] if 'dimensions' in df.columns else pd.Series(None, index=df.index)
+        return pd.Series(list(zip(
+            pd.to_datetime(df['timestamp'], utc=True),
+            df['metric_name'].astype(str),
+            df['source'].astype(str),
+            dimensions.map(lambda d: json.dumps(sorted(dict(d).items())) if isinstance(d, (dict, list)) else '[]')
+        )), index=df.index)
+
+    def _replace_windows(
+        self,
+        table,
+        data: Union[pd.DataFrame, pa.Table]
+    ) -> Tuple[Union[pd.DataFrame, pa.Table], BooleanExpression]:
+        """Rows and filter that overwrite the stored windows of ``data``.
+        
+        Iceberg cannot filter on the ``dimensions`` map, so the filter covers
+        whole (window, metric, source) groups; stored rows of those groups
+        whose dimension set is not in ``data`` are read back and rewritten.
+        
+        Args:
+            table: Existing Iceberg table
+            data: New rows
+        
+        Returns:
+            Tuple[Union[pd.DataFrame, pa.Table], BooleanExpression]: Rows to write and the rows they replace
+        """
+        if isinstance(data, pa.Table):
+            keys = data.select([name for name in data.column_names if name in (*WINDOW_COLUMNS, 'dimensions')]).to_pandas()
+        else:
+            keys = data
+        window_filter = self._window_filter(keys)
+
+        stored = self.iceberg.read_table(table, filters=[window_filter])
+        if len(stored) == 0:
+            return data, window_filter
+        untouched = stored[~self._series_keys(stored).isin(set(self._series_keys(keys)))]
+        if len(untouched) == 0:
+            return data, window_filter
+
+        # Arrow maps convert to key/value pairs; write every dimension set as a dict
+        new_rows = data.to_pandas() if isinstance(data, pa.Table) else data
+        untouched, new_rows = [
+            df.assign(dimensions=df['dimensions'].map(lambda d: dict(d) if isinstance(d, (dict, list)) else {}))
+            for df in (untouched, new_rows)
+        ]
+        # Iceberg returns timestamps without a zone
+        if isinstance(new_rows['timestamp'].dtype, pd.DatetimeTZDtype) and untouched['timestamp'].dt.tz is None:
+            untouched['timestamp'] = untouched['timestamp'].dt.tz_localize('UTC')
+        return pd.concat([untouched, new_rows], ignore_index=True), window_filter
+
     def store(
         self,
-        data: pd.DataFrame,
-        table_name: Optional[str] = None
+        data: Union[pd.DataFrame, pa.Table, pa.RecordBatch],
+        table_name: Optional[str] = None,
+        granularity: str = 'day'
     ) -> bool:
         """Store processed metrics data in Iceberg table.
         
         Args:
-            data: DataFrame to store
+            data: DataFrame or Arrow data to store
             table_name: Optional custom table name
+            granularity: Time partition granularity used if the table is created
         
         Returns:
             bool: True if storage was successful
         """
         start_time = datetime.now()
         try:
-            if data.empty:
-                logger.warning("Empty DataFrame provided, skipping storage")
+            if isinstance(data, pa.RecordBatch):
+                data = pa.Table.from_batches([data])
+
+            if len(data) == 0:
+                logger.warning("Empty data provided, skipping storage")
                 return False
 
             # Default table name: processed.metrics_v1
@@ -78,17 +165,29 @@ class ProcessedStorage(BaseStorage):
             try:
                 table = self.iceberg.load_table(table_name)
                 logger.info(f"Using existing table: {table_name}")
+                created = False
             except Exception:
                 logger.info(f"Creating new table: {table_name}")
                 table = self.iceberg.create_time_partitioned_table(
                     table_name=table_name,
                     schema=self.get_schema(),
                     timestamp_column='timestamp',
-                    granularity='day'
+                    granularity=granularity
                 )
+                created = True
+
+            # Windows re-emitted with merged statistics replace their stored rows
+            columns = data.column_names if isinstance(data, pa.Table) else data.columns
+            window_filter = None
+            if not created and set(WINDOW_COLUMNS) <= set(columns):
+                data, window_filter = self._replace_windows(table, data)
+            overwrite = window_filter is not None
 
             # Write data
-            success = self.iceberg.write_dataframe(table, data)
+            if isinstance(data, pa.Table):
+                success = self.iceberg.write_arrow(table, data, overwrite, window_filter)
+            else:
+                success = self.iceberg.write_dataframe(table, data, overwrite, window_filter)
             
             if success:
                 self.update_metrics(start_time, len(data))
@@ -109,27 +208,31 @@ class ProcessedStorage(BaseStorage):
             logger.error(f"Error storing processed data: {str(e)}")
             raise
 
-    def health_check(self) -> bool:
-        """Check processed storage health.
+    def rollup_table_name(self, label: str) -> str:
+        """Table holding one rollup resolution.
+        
+        Args:
+            label: Rollup label (e.g. ``1h``)
         
         Returns:
-            bool: True if storage is healthy
+            str: Table name, e.g. ``processed.metrics_1h_v1``
         """
-        try:
-            # Create test data
-            test_data = pd.DataFrame({
-                'timestamp': [datetime.now()],
-                'metric_name': ['test_metric'],
-                'value': [1.0],
-                'source': ['test'],
-                'dimensions': [{'test': 'value'}],
-                'value_min': [1.0],
-                'value_max': [1.0],
-                'value_count': [1]
-            })
-            
-            # Try to write test data
-            return self.store(test_data, table_name=f"{self.warehouse_namespace}.health_check")
-        except Exception as e:
-            logger.error(f"Processed storage health check failed: {str(e)}")
-            return False
+        return f"{self.warehouse_namespace}.metrics_{label}_{self.schema_version}"
+
+    def store_rollups(self, rollups: Dict[str, Union[pd.DataFrame, pa.Table, pa.RecordBatch]]) -> Dict[str, bool]:
+        """Store each rollup resolution in its own table.
+        
+        Tables are partitioned by the rollup's ``partition`` setting in
+        ``processors.unified.rollups`` (default ``day``).
+        
+        Args:
+            rollups: Processed data per rollup label, as returned by ``UnifiedProcessor.process_rollups``
+        
+        Returns:
+            Dict[str, bool]: Whether each resolution was stored
+        """
+        results = {}
+        for label, data in rollups.items():
+            granularity = self.rollups.get(label, {}).get('partition', 'day')
+            results[label] = self.store(data, self.rollup_table_name(label), granularity)
+        return results
@@ -1,6 +1,7 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 from pyiceberg.schema import Schema
 from pyiceberg.types import (
@@ -35,11 +36,11 @@ class RawStorage(BaseStorage):
             names=["timestamp", "metric_name", "value", "metadata"]
         )
 
-    def store(self, data: pd.DataFrame, source: str) -> bool:
+    def store(self, data: Union[pd.DataFrame, pa.Table, pa.RecordBatch], source: str) -> bool:
         """Store raw metrics data in Iceberg table.
         
         Args:
-            data: DataFrame to store
+            data: DataFrame or Arrow data to store
             source: Data source identifier
         
         Returns:
@@ -47,8 +48,11 @@ class RawStorage(BaseStorage):
         """
         start_time = datetime.now()
         try:
-            if data.empty:
-                logger.warning("Empty DataFrame provided, skipping storage")
+            if isinstance(data, pa.RecordBatch):
+                data = pa.Table.from_batches([data])
+
+            if len(data) == 0:
+                logger.warning("Empty data provided, skipping storage")
                 return False
 
             # Validate source
@@ -72,7 +76,10 @@ class RawStorage(BaseStorage):
                 )
 
             # Write data
-            success = self.iceberg.write_dataframe(table, data)
+            if isinstance(data, pa.Table):
+                success = self.iceberg.write_arrow(table, data)
+            else:
+                success = self.iceberg.write_dataframe(table, data)
             
             if success:
                 self.update_metrics(start_time, len(data))
@@ -86,24 +93,3 @@ class RawStorage(BaseStorage):
             self.update_metrics(start_time, 0, error=True)
             logger.error(f"Error storing raw data: {str(e)}")
             raise
-
-    def health_check(self) -> bool:
-        """Check raw storage health.
-        
-        Returns:
-            bool: True if storage is healthy
-        """
-        try:
-            # Create test data
-            test_data = pd.DataFrame({
-                'timestamp': [datetime.now()],
-                'metric_name': ['test_metric'],
-                'value': [1.0],
-                'metadata': [{'test': 'value'}]
-            })
-            
-            # Try to write test data
-            return self.store(test_data, source='health_check')
-        except Exception as e:
-            logger.error(f"Raw storage health check failed: {str(e)}")
-            return False
@@ -6,6 +6,13 @@ from .metrics import MetricsTracker
 from .validation import DataValidator
 from .aws_utils import S3Client
 from .iceberg_utils import IcebergTableManager
+from .state_store import StateStore
+from .connection_registry import ConnectionRegistry
+from .rate_limiter import TokenBucket, get_token_bucket
+from .response_cache import ResponseCache
+from .health import CircuitBreaker, CircuitOpenError, HealthRegistry
+from .fan_out import fan_out
+from .arrow_utils import RAW_METRIC_SCHEMA, build_record_batch, frame_to_record_batch, arrow_to_frame
 
 __all__ = [
     'ConfigLoader',
@@ -13,5 +20,18 @@ __all__ = [
     'MetricsTracker',
     'DataValidator',
     'S3Client',
-    'IcebergTableManager'
+    'IcebergTableManager',
+    'StateStore',
+    'ConnectionRegistry',
+    'TokenBucket',
+    'get_token_bucket',
+    'ResponseCache',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'HealthRegistry',
+    'fan_out',
+    'RAW_METRIC_SCHEMA',
+    'build_record_batch',
+    'frame_to_record_batch',
+    'arrow_to_frame'
 ]
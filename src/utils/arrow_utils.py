@@ -0,0 +1,158 @@
+import json
+import logging
+import math
+from typing import Dict, Any, Iterable, Optional, Union
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# Output contract for collectors; matches RawStorage.get_schema(). Timestamps
+# are UTC without a zone so they map onto Iceberg's TimestampType.
+RAW_METRIC_SCHEMA = pa.schema([
+    pa.field('timestamp', pa.timestamp('us')),
+    pa.field('metric_name', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('value', pa.float64()),
+    pa.field('metadata', pa.map_(pa.string(), pa.string()))
+])
+
+def _map_items(value: Any) -> list:
+    """Flatten one metadata value (dict or JSON object text) into string pairs."""
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return [
+        (str(key), item if item is None or isinstance(item, str) else json.dumps(item, default=str))
+        for key, item in value.items()
+    ]
+
+def to_map_array(values: Iterable[Any], extra: Optional[Dict[str, str]] = None) -> pa.MapArray:
+    """Convert metadata values into a ``map<string, string>`` array.
+
+    Values may be dicts, JSON object text or missing (stored as an empty
+    map). Non-string entries are JSON-encoded. Each distinct value is only
+    flattened once, so shared dicts and repeated JSON text are cheap.
+
+    Args:
+        values: Metadata per row
+        extra: Entries added to every row's map (e.g. the source target)
+
+    Returns:
+        pa.MapArray: Metadata column
+    """
+    extra_items = [(str(key), str(item)) for key, item in (extra or {}).items()]
+    offsets = [0]
+    keys = []
+    items = []
+    flattened = {}
+
+    for value in values:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            pairs = extra_items
+        else:
+            # Dicts are unhashable; they are alive for the whole loop, so id() is stable
+            cache_key = id(value) if isinstance(value, dict) else value
+            pairs = flattened.get(cache_key)
+            if pairs is None:
+                pairs = _map_items(value)
+                if extra_items:
+                    pairs = [pair for pair in pairs if pair[0] not in (extra or {})] + extra_items
+                flattened[cache_key] = pairs
+
+        keys.extend(pair[0] for pair in pairs)
+        items.extend(pair[1] for pair in pairs)
+        offsets.append(offsets[-1] + len(pairs))
+
+    return pa.MapArray.from_arrays(
+        pa.array(offsets, pa.int32()),
+        pa.array(keys, pa.string()),
+        pa.array(items, pa.string())
+    )
+
+def build_record_batch(
+    timestamp: Any,
+    metric_name: Any,
+    value: Any,
+    metadata: Any,
+    extra: Optional[Dict[str, str]] = None
+) -> pa.RecordBatch:
+    """Build a record batch in ``RAW_METRIC_SCHEMA`` from column values.
+
+    Columns may be Arrow arrays, pandas Series or lists. Zoned timestamps are
+    converted to UTC; naive ones are taken as UTC already.
+
+    Args:
+        timestamp: Sample times
+        metric_name: Metric names
+        value: Metric values
+        metadata: Metadata per row as dicts, JSON text or a map array
+        extra: Entries added to every row's metadata
+
+    Returns:
+        pa.RecordBatch: Metrics batch
+    """
+    timestamps = timestamp if isinstance(timestamp, (pa.Array, pa.ChunkedArray)) else pa.array(timestamp)
+    if timestamps.type.tz is not None:
+        timestamps = timestamps.cast(pa.timestamp(timestamps.type.unit, tz='UTC'))
+    timestamps = timestamps.cast(pa.timestamp('us'))
+
+    names = metric_name if isinstance(metric_name, (pa.Array, pa.ChunkedArray)) else pa.array(metric_name, pa.string())
+    if not pa.types.is_dictionary(names.type):
+        names = names.cast(pa.string()).dictionary_encode()
+    names = names.cast(RAW_METRIC_SCHEMA.field('metric_name').type)
+
+    values = value if isinstance(value, (pa.Array, pa.ChunkedArray)) else pa.array(value, from_pandas=True)
+    values = values.cast(pa.float64())
+
+    if isinstance(metadata, (pa.Array, pa.ChunkedArray)) and pa.types.is_map(metadata.type) and not extra:
+        maps = metadata.cast(RAW_METRIC_SCHEMA.field('metadata').type)
+    else:
+        if isinstance(metadata, (pa.Array, pa.ChunkedArray)):
+            metadata = metadata.to_pylist()
+        elif isinstance(metadata, pd.Series):
+            metadata = metadata.tolist()
+        maps = to_map_array(metadata, extra)
+
+    columns = [
+        column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+        for column in (timestamps, names, values, maps)
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=RAW_METRIC_SCHEMA)
+
+def frame_to_record_batch(
+    df: pd.DataFrame,
+    metric_column: str = 'metric_name',
+    metadata_column: str = 'metadata',
+    extra: Optional[Dict[str, str]] = None
+) -> pa.RecordBatch:
+    """Convert a collected DataFrame chunk into ``RAW_METRIC_SCHEMA``.
+
+    Args:
+        df: Collected metrics chunk
+        metric_column: Column holding the metric name
+        metadata_column: Column holding metadata; missing means empty maps
+        extra: Entries added to every row's metadata
+
+    Returns:
+        pa.RecordBatch: Metrics batch
+    """
+    metadata = df[metadata_column] if metadata_column in df.columns else [None] * len(df)
+    return build_record_batch(
+        pd.to_datetime(df['timestamp'], utc=True),
+        df[metric_column].astype(str),
+        pd.to_numeric(df['value']),
+        metadata,
+        extra
+    )
+
+def arrow_to_frame(data: Union[pa.Table, pa.RecordBatch]) -> pd.DataFrame:
+    """Convert Arrow metrics into a DataFrame in a single pass.
+
+    Dictionary columns become categoricals and map columns become dicts.
+
+    Args:
+        data: Arrow table or record batch
+
+    Returns:
+        pd.DataFrame: Metrics
+    """
+    return data.to_pandas(maps_as_pydicts='strict')
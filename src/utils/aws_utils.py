@@ -1,6 +1,6 @@
 import boto3
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,224 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+import psycopg2
+import pymongo
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+logger = logging.getLogger(__name__)
+
+class ConnectionRegistry:
+    """Process-wide registry of pooled MongoDB clients and PostgreSQL pools.
+
+    Clients and pools are keyed by URI/DSN and shared by every collector, so
+    repeated collections and health checks reuse established connections
+    instead of paying TCP, TLS and auth handshakes each time.
+
+    PostgreSQL pools are closed after ``idle_timeout_seconds`` without a
+    borrower. Borrowers beyond a pool's ``max_connections`` wait up to
+    ``acquire_timeout_seconds`` for a connection to be returned instead of
+    failing with ``PoolError`` straight away. MongoDB clients live until ``close_all()``: callers hold them
+    for as long as a tail or backfill runs, and each client already closes
+    its own idle sockets after ``max_idle_time_ms``.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize connection registry.
+
+        Args:
+            config: Configuration dictionary; pool settings are read from ``connections``
+        """
+        settings = (config or {}).get('connections', {})
+        self.mongodb_options = settings.get('mongodb', {})
+        self.postgres_options = settings.get('postgres', {})
+        self.idle_timeout = settings.get('idle_timeout_seconds', 600)
+        self.acquire_timeout = self.postgres_options.get('acquire_timeout_seconds', 30)
+
+        self._lock = threading.Lock()
+        self._mongo_clients = {}
+        self._postgres_pools = {}
+        # One slot per pooled connection; getconn() raises rather than blocks when none is free
+        self._postgres_slots = {}
+        self._last_used = {}
+        self._borrowed = {}
+        # Per-DSN locks serializing pool creation, so a slow connect only blocks its own DSN
+        self._creating = {}
+
+    @classmethod
+    def get_instance(cls, config: Optional[Dict[str, Any]] = None) -> 'ConnectionRegistry':
+        """Get the process-wide registry, creating it on first use.
+
+        Args:
+            config: Configuration dictionary used when the registry is created
+
+        Returns:
+            ConnectionRegistry: Shared registry
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(config)
+                atexit.register(cls._instance.close_all)
+            return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Close and drop the process-wide registry."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close_all()
+                cls._instance = None
+
+    def get_mongo_client(self, uri: str, **options) -> pymongo.MongoClient:
+        """Get the shared MongoClient for a URI.
+
+        Args:
+            uri: MongoDB connection URI
+            **options: Extra MongoClient options (e.g. readPreference)
+
+        Returns:
+            pymongo.MongoClient: Long-lived client with its own connection pool
+        """
+        key = ('mongodb', uri, tuple(sorted(options.items())))
+        with self._lock:
+            client = self._mongo_clients.get(key)
+            if client is None:
+                client = pymongo.MongoClient(
+                    uri,
+                    maxPoolSize=self.mongodb_options.get('max_pool_size', 10),
+                    minPoolSize=self.mongodb_options.get('min_pool_size', 0),
+                    maxIdleTimeMS=self.mongodb_options.get('max_idle_time_ms', 300000),
+                    **options
+                )
+                self._mongo_clients[key] = client
+                logger.info("Created pooled MongoDB client")
+            return client
+
+    def _borrow_postgres_pool(
+        self,
+        key: Tuple,
+        dsn: Dict[str, Any]
+    ) -> Tuple[ThreadedConnectionPool, threading.BoundedSemaphore]:
+        """Get or create the pool for a DSN and count a borrow against it.
+
+        The pool connects ``min_connections`` on creation, which can take up
+        to ``connect_timeout`` against a dead host. It is therefore built
+        outside the registry lock, under a lock private to its DSN.
+
+        Returns:
+            Tuple[ThreadedConnectionPool, threading.BoundedSemaphore]: Pool and its connection slots
+        """
+        with self._lock:
+            pool = self._postgres_pools.get(key)
+            if pool is None:
+                create_lock = self._creating.setdefault(key, threading.Lock())
+            else:
+                self._borrowed[key] += 1
+                self._last_used[key] = time.monotonic()
+                return pool, self._postgres_slots[key]
+
+        with create_lock:
+            with self._lock:
+                pool = self._postgres_pools.get(key)
+                if pool is not None:
+                    self._borrowed[key] += 1
+                    self._last_used[key] = time.monotonic()
+                    return pool, self._postgres_slots[key]
+
+            max_connections = self.postgres_options.get('max_connections', 10)
+            pool = ThreadedConnectionPool(
+                self.postgres_options.get('min_connections', 1),
+                max_connections,
+                **dsn
+            )
+            slots = threading.BoundedSemaphore(max_connections)
+            logger.info(f"Created PostgreSQL pool for {dsn.get('host')}:{dsn.get('port')}")
+
+            with self._lock:
+                self._postgres_pools[key] = pool
+                self._postgres_slots[key] = slots
+                self._borrowed[key] = 1
+                self._last_used[key] = time.monotonic()
+                self._creating.pop(key, None)
+            return pool, slots
+
+    @contextmanager
+    def postgres_connection(self, **dsn):
+        """Borrow a pooled PostgreSQL connection.
+
+        Args:
+            **dsn: psycopg2 connection parameters (host, port, database, user, password)
+
+        Yields:
+            psycopg2.extensions.connection: Database connection, returned to the pool on exit
+
+        Raises:
+            PoolError: If no connection is returned within ``acquire_timeout_seconds``
+        """
+        key = ('postgres',) + tuple(sorted(dsn.items()))
+        self.evict_idle()
+        pool, slots = self._borrow_postgres_pool(key, dsn)
+
+        acquired = False
+        conn = None
+        broken = False
+        try:
+            # Wait for a free connection instead of letting getconn() fail on an exhausted pool
+            acquired = slots.acquire(timeout=self.acquire_timeout)
+            if not acquired:
+                raise PoolError(
+                    f"no PostgreSQL connection to {dsn.get('host')} freed within {self.acquire_timeout}s"
+                )
+            conn = pool.getconn()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Do not hand a dead connection to the next borrower
+            broken = True
+            raise
+        finally:
+            if conn is not None:
+                try:
+                    pool.putconn(conn, close=broken)
+                except PoolError:
+                    # The pool was closed while this connection was borrowed
+                    conn.close()
+            if acquired:
+                slots.release()
+            with self._lock:
+                if key in self._borrowed:
+                    self._borrowed[key] -= 1
+                    self._last_used[key] = time.monotonic()
+
+    def evict_idle(self) -> None:
+        """Close PostgreSQL pools that have had no borrower within the idle timeout."""
+        now = time.monotonic()
+        with self._lock:
+            for key, last_used in list(self._last_used.items()):
+                if now - last_used < self.idle_timeout or self._borrowed.get(key, 0) > 0:
+                    continue
+                self._close(key)
+
+    def _close(self, key: Tuple) -> None:
+        """Close a single client or pool. Caller must hold the lock."""
+        try:
+            if key in self._mongo_clients:
+                self._mongo_clients.pop(key).close()
+            elif key in self._postgres_pools:
+                self._postgres_pools.pop(key).closeall()
+                self._postgres_slots.pop(key, None)
+                self._borrowed.pop(key, None)
+        except Exception as e:
+            logger.error(f"Error closing pooled connection: {str(e)}")
+        finally:
+            self._last_used.pop(key, None)
+
+    def close_all(self) -> None:
+        """Close every pooled client and connection."""
+        with self._lock:
+            for key in list(self._mongo_clients) + list(self._postgres_pools):
+                self._close(key)
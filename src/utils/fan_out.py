@@ -0,0 +1,117 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+def fan_out(
+    producers: List[Callable[[], Iterable[Any]]],
+    max_workers: int,
+    queue_size: int,
+    ordered: bool = False,
+    task_timeout: Optional[float] = None,
+    on_done: Optional[Callable[[int], None]] = None,
+    on_error: Optional[Callable[[int, Exception], None]] = None,
+    wait: bool = True
+) -> Iterator[Any]:
+    """Run producers on a thread pool and yield their items through bounded queues.
+
+    A producer that runs ahead blocks on its full queue instead of buffering
+    its whole output. With ``ordered`` every producer has its own queue and
+    items are yielded producer by producer; otherwise they share one queue
+    and are yielded as they arrive. Closing the generator stops every
+    producer at its next item.
+
+    Args:
+        producers: Callables returning the items of one task each
+        max_workers: Maximum tasks running at once
+        queue_size: Items buffered per queue
+        ordered: Yield tasks in order instead of interleaving them
+        task_timeout: Seconds after which a running task is abandoned with a ``TimeoutError``
+        on_done: Called with the task index once a task is exhausted
+        on_error: Called with the task index and error of a failed task; None re-raises
+        wait: Wait for running producers when the generator closes
+
+    Yields:
+        Any: Items from every producer
+
+    Raises:
+        Exception: A producer's error, if ``on_error`` is not given
+    """
+    if not producers:
+        return
+
+    done = object()
+    stop = threading.Event()
+    abandoned = set()
+    started_at = {}
+    if ordered:
+        queues = [queue.Queue(maxsize=queue_size) for _ in producers]
+    else:
+        queues = [queue.Queue(maxsize=queue_size)] * len(producers)
+
+    def put(task: int, item: Any) -> bool:
+        while not stop.is_set() and task not in abandoned:
+            try:
+                queues[task].put((task, item), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(task: int) -> None:
+        started_at[task] = time.monotonic()
+        try:
+            for item in producers[task]():
+                if not put(task, item):
+                    return
+            put(task, done)
+        except Exception as e:
+            put(task, e)
+
+    def fail(task: int, error: Exception) -> None:
+        if on_error is None:
+            raise error
+        on_error(task, error)
+
+    def expire() -> None:
+        # Give up on tasks that have run past their deadline
+        now = time.monotonic()
+        for task in sorted(pending):
+            started = started_at.get(task)
+            if started is not None and now - started > task_timeout:
+                abandoned.add(task)
+                pending.discard(task)
+                fail(task, TimeoutError(f"no result within {task_timeout}s"))
+
+    # Tasks start in submission order, so in ordered mode the task being read is always running
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(producers)))
+    pending = set(range(len(producers)))
+    for task in range(len(producers)):
+        executor.submit(produce, task)
+
+    try:
+        while pending:
+            source = queues[min(pending)] if ordered else queues[0]
+            try:
+                task, item = source.get(timeout=0.1)
+            except queue.Empty:
+                task, item = None, None
+
+            if task in pending:
+                if item is done:
+                    pending.discard(task)
+                    if on_done is not None:
+                        on_done(task)
+                elif isinstance(item, Exception):
+                    pending.discard(task)
+                    fail(task, item)
+                else:
+                    yield item
+
+            # Checked on every pass so busy tasks cannot hide a hung one
+            if task_timeout is not None:
+                expire()
+    finally:
+        stop.set()
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when a dependency is skipped because its circuit is open."""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one dependency.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    callers skip the dependency without touching it. Once ``reset_timeout``
+    has passed a single trial call is let through (half-open); its outcome
+    closes the circuit again or re-opens it for another timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """Initialize circuit breaker.
+
+        Args:
+            name: Dependency name, used in logs
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds an open circuit waits before a trial call
+        """
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call to the dependency may go ahead.
+
+        In the half-open state only one caller gets through until it reports
+        its outcome.
+
+        Returns:
+            bool: False if the dependency should be skipped
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit for {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            reopen = self._trial_in_flight or self.opened_at is not None
+            if reopen or self.failures >= self.failure_threshold:
+                if not reopen:
+                    logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+class HealthRegistry:
+    """Process-wide health results and circuit breakers keyed by dependency.
+
+    Probe results are cached for ``cache_ttl_seconds`` so frequent health
+    checks do not add load, and a dependency whose circuit is open is
+    reported unhealthy without being probed at all.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize health registry.
+
+        Args:
+            config: Configuration dictionary; settings are read from ``health``
+        """
+        settings = (config or {}).get('health', {})
+        self.cache_ttl = settings.get('cache_ttl_seconds', 30)
+        self.failure_threshold = settings.get('failure_threshold', 3)
+        self.reset_timeout = settings.get('reset_timeout_seconds', 60)
+        self.probe_timeout = settings.get('probe_timeout_seconds', 5)
+
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._results = {}
+
+    @classmethod
+    def get_instance(cls, config: Optional[Dict[str, Any]] = None) -> 'HealthRegistry':
+        """Get the process-wide registry, creating it on first use.
+
+        Args:
+            config: Configuration dictionary used when the registry is created
+
+        Returns:
+            HealthRegistry: Shared registry
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(config)
+            return cls._instance
+
+    @classmethod
+    def reset_instance(cls) -> None:
+        """Drop the process-wide registry."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        """Get the circuit breaker for a dependency, creating it on first use.
+
+        Args:
+            name: Dependency name (e.g. ``postgres.orders-primary``)
+
+        Returns:
+            CircuitBreaker: Shared breaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.failure_threshold, self.reset_timeout)
+                self._breakers[name] = breaker
+            return breaker
+
+    def check(self, name: str, probe: Callable[[], bool], force: bool = False) -> bool:
+        """Check a dependency, reusing a recent result.
+
+        Args:
+            name: Dependency name
+            probe: Cheap read-only check returning True if healthy; exceptions count as unhealthy
+            force: Probe even if a cached result is still fresh
+
+        Returns:
+            bool: True if the dependency is healthy
+        """
+        with self._lock:
+            cached = self._results.get(name)
+        if not force and cached is not None and time.monotonic() - cached[1] < self.cache_ttl:
+            return cached[0]
+
+        breaker = self.breaker(name)
+        if not breaker.allow():
+            logger.warning(f"Skipping health probe for {name}: circuit open")
+            return False
+
+        try:
+            healthy = bool(probe())
+        except Exception as e:
+            logger.error(f"Health probe for {name} failed: {str(e)}")
+            healthy = False
+
+        if healthy:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        with self._lock:
+            self._results[name] = (healthy, time.monotonic())
+        return healthy
+
+    def record_success(self, name: str) -> None:
+        """Report a successful call to a dependency.
+
+        Args:
+            name: Dependency name
+        """
+        self.breaker(name).record_success()
+
+    def record_failure(self, name: str) -> None:
+        """Report a failed call to a dependency and drop its cached result.
+
+        Args:
+            name: Dependency name
+        """
+        self.breaker(name).record_failure()
+        with self._lock:
+            self._results.pop(name, None)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Last known health of every dependency.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Cached result, result age and circuit state per dependency
+        """
+        now = time.monotonic()
+        with self._lock:
+            results = dict(self._results)
+            breakers = dict(self._breakers)
+        return {
+            name: {
+                'healthy': results[name][0] if name in results else None,
+                'age_seconds': now - results[name][1] if name in results else None,
+                'circuit': breaker.state
+            }
+            for name, breaker in breakers.items()
+        }
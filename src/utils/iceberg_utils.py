@@ -1,6 +1,7 @@
 import logging
 from typing import Dict, Any, List, Optional
 from pyiceberg.catalog import load_catalog
+from pyiceberg.expressions import BooleanExpression
 from pyiceberg.schema import Schema
 from pyiceberg.table import Table
 from pyiceberg.partitioning import PartitionSpec
@@ -10,6 +11,7 @@ from pyiceberg.transforms import (
     BucketTransform
 )
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,18 @@ class IcebergTableManager:
         
         self.catalog = load_catalog(self.catalog_name, **self.catalog_config)
 
+    def ping(self) -> bool:
+        """Check that the catalog answers a read-only request.
+        
+        Returns:
+            bool: True if the catalog is reachable
+        
+        Raises:
+            Exception: If the catalog request fails
+        """
+        self.catalog.list_namespaces()
+        return True
+
     def create_table(
         self,
         table_name: str,
@@ -93,40 +107,68 @@ class IcebergTableManager:
             logger.error(f"Error loading table {table_name}: {str(e)}")
             raise
 
-    def write_dataframe(
+    def write_arrow(
         self,
         table: Table,
-        df: pd.DataFrame,
-        overwrite: bool = False
+        data: pa.Table,
+        overwrite: bool = False,
+        overwrite_filter: Optional[BooleanExpression] = None
     ) -> bool:
-        """Write DataFrame to Iceberg table.
+        """Write an Arrow table to an Iceberg table.
+        
+        Arrow data is handed to the Parquet writer as is, without another copy.
         
         Args:
             table: Target Iceberg table
-            df: DataFrame to write
+            data: Arrow table to write
             overwrite: Whether to overwrite existing data
+            overwrite_filter: Rows replaced by an overwrite (defaults to the entire table)
         
         Returns:
             bool: True if write successful
         """
         try:
-            # Convert DataFrame to PyArrow table
-            arrow_table = df.to_arrow_table()
-            
-            if overwrite:
+            if overwrite and overwrite_filter is not None:
+                # Replace only the rows matching the filter
+                table.overwrite(data, overwrite_filter=overwrite_filter)
+            elif overwrite:
                 # Overwrite entire table
-                with table.new_overwrite() as overwrite:
-                    overwrite.overwrite_table(arrow_table)
+                table.overwrite(data)
             else:
                 # Append to table
-                with table.new_append() as append:
-                    append.append_table(arrow_table)
+                table.append(data)
             
             return True
         except Exception as e:
             logger.error(f"Error writing to table {table.name}: {str(e)}")
             return False
 
+    def write_dataframe(
+        self,
+        table: Table,
+        df: pd.DataFrame,
+        overwrite: bool = False,
+        overwrite_filter: Optional[BooleanExpression] = None
+    ) -> bool:
+        """Write DataFrame to Iceberg table.
+        
+        Args:
+            table: Target Iceberg table
+            df: DataFrame to write
+            overwrite: Whether to overwrite existing data
+            overwrite_filter: Rows replaced by an overwrite (defaults to the entire table)
+        
+        Returns:
+            bool: True if write successful
+        """
+        try:
+            # Convert DataFrame to PyArrow table
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+        except Exception as e:
+            logger.error(f"Error converting data for table {table.name}: {str(e)}")
+            return False
+        return self.write_arrow(table, arrow_table, overwrite, overwrite_filter)
+
     def read_table(
         self,
         table: Table,
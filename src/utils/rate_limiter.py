@@ -0,0 +1,101 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every request against one quota."""
+
+    def __init__(self, rate: float, capacity: int, jitter: float = 0.0):
+        """Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+            jitter: Upper bound of the random delay added after a pause, in seconds
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.jitter = jitter
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill. Caller must hold the lock."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available and consume it.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if self._paused_until > now:
+                    # Spread waiters out so they do not all retry at once
+                    wait = self._paused_until - now + random.uniform(0, self.jitter)
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given time (e.g. after a Retry-After).
+
+        Args:
+            seconds: Pause duration
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            # Whatever burst was saved up is no longer trustworthy
+            self._tokens = 0.0
+            self._updated = now
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def get_token_bucket(key: str, rate: float, capacity: int, jitter: float = 0.0) -> TokenBucket:
+    """Get the process-wide token bucket for a quota key.
+
+    Collectors hitting the same account share one budget. The first caller's
+    rate and capacity win; later callers asking for different ones get the
+    existing bucket and a warning.
+
+    Args:
+        key: Quota identifier (e.g. ``newrelic:<account_id>``)
+        rate: Tokens added per second
+        capacity: Maximum burst size
+        jitter: Upper bound of the random delay added after a pause, in seconds
+
+    Returns:
+        TokenBucket: Shared bucket
+    """
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, capacity, jitter)
+        elif (bucket.rate, bucket.capacity) != (rate, capacity):
+            logger.warning(
+                f"Token bucket {key} already limits to {bucket.rate}/s with capacity {bucket.capacity}; "
+                f"ignoring {rate}/s with capacity {capacity}"
+            )
+        return bucket
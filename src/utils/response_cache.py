@@ -0,0 +1,204 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """On-disk cache of HTTP response bodies with TTLs and an LRU size cap.
+
+    Each entry is a body file plus a JSON metadata file holding the
+    validators (``ETag``/``Last-Modified``) used to revalidate it. Entries
+    stored without a TTL never expire and are only removed by eviction.
+
+    Entry sizes and recency are indexed in memory, loaded from the directory
+    once at startup, so writes do not rescan the cache. Entries written by
+    other processes sharing the directory are picked up on the next start.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 100 * 1024 * 1024):
+        """Initialize response cache.
+
+        Args:
+            path: Cache directory
+            max_bytes: Total body size kept on disk before least recently used entries are evicted
+        """
+        self.cache_dir = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Body size per key, least recently used first
+        self._index = OrderedDict()
+        self._total = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Index the entries already on disk, ordered by last use."""
+        entries = []
+        for meta_path in self.cache_dir.glob('*.meta.json'):
+            try:
+                with open(meta_path, 'r') as f:
+                    size = json.load(f).get('size', 0)
+                entries.append((meta_path.stat().st_mtime, meta_path.name[:-len('.meta.json')], size))
+            except (OSError, ValueError):
+                continue
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total += size
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key from a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        raw = json.dumps([method.upper(), url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.meta.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.body"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up an entry, fresh or stale.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry metadata with the body under ``body``, or None
+        """
+        meta_path = self._meta_path(key)
+        try:
+            with open(meta_path, 'r') as f:
+                entry = json.load(f)
+            with open(self._body_path(key), 'rb') as f:
+                entry['body'] = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+            self.delete(key)
+            return None
+
+        # Mark as recently used for LRU eviction; the mtime carries it across restarts
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without revalidation.
+
+        Args:
+            entry: Entry returned by ``get``
+
+        Returns:
+            bool: True if the entry has no expiry or has not expired yet
+        """
+        expires_at = entry.get('expires_at')
+        return expires_at is None or time.time() < expires_at
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        ttl: Optional[float] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        extra: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Store a response body.
+
+        Args:
+            key: Cache key
+            body: Raw response body
+            ttl: Seconds the entry stays fresh; None means it never expires
+            etag: ``ETag`` response header
+            last_modified: ``Last-Modified`` response header
+            extra: Additional JSON-serializable metadata (e.g. pagination links)
+        """
+        meta = {
+            'expires_at': None if ttl is None else time.time() + ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': len(body),
+            'extra': extra or {}
+        }
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Body first: an entry only exists once its metadata is in place
+            self._write_atomic(self._body_path(key), body)
+            self._write_atomic(self._meta_path(key), json.dumps(meta).encode())
+            self._total += len(body) - self._index.pop(key, 0)
+            self._index[key] = len(body)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def refresh(self, key: str, entry: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Extend an entry after a ``304 Not Modified`` revalidation.
+
+        Args:
+            key: Cache key
+            entry: Entry returned by ``get``
+            ttl: New freshness lifetime in seconds; None means it never expires
+        """
+        meta = {name: value for name, value in entry.items() if name != 'body'}
+        meta['expires_at'] = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._write_atomic(self._meta_path(key), json.dumps(meta).encode())
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if it exists.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry's files and drop it from the index. Caller must hold the lock."""
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        self._total -= self._index.pop(key, 0)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file via rename so readers never see partial content."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under ``max_bytes``. Caller must hold the lock."""
+        while self._total > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
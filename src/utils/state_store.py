@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Any, IO, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+class StateStore:
+    """Persist pipeline state: small values (watermarks, tokens) as JSON, tables as Parquet."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize state store.
+
+        Args:
+            config: Configuration dictionary; ``state.path`` sets the state directory
+        """
+        self.config = config
+        self.state_dir = Path(config.get('state', {}).get('path', '.state'))
+
+    def _path(self, key: str, suffix: str = '.json') -> Path:
+        """Map a state key to its file path."""
+        safe_key = re.sub(r'[^A-Za-z0-9_.-]', '_', key)
+        return self.state_dir / f"{safe_key}{suffix}"
+
+    def _write_atomic(self, key: str, path: Path, mode: str, write: Callable[[IO], None]) -> None:
+        """Write a state file via a temporary file renamed over the previous state."""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, mode) as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            logger.error(f"Error saving state {key}: {str(e)}")
+            raise
+
+    def load(self, key: str, default: Optional[Any] = None) -> Any:
+        """Load a state value.
+
+        Args:
+            key: State key
+            default: Value returned if no state has been saved
+
+        Returns:
+            Any: Stored value or default
+        """
+        path = self._path(key)
+        if not path.exists():
+            return default
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error loading state {key}: {str(e)}")
+            raise
+
+    def save(self, key: str, value: Any) -> None:
+        """Atomically save a state value.
+
+        The value is written to a temporary file and renamed over the
+        previous state, so a crash never leaves a partially written file.
+
+        Args:
+            key: State key
+            value: JSON-serializable value
+        """
+        self._write_atomic(key, self._path(key), 'w', lambda f: json.dump(value, f))
+
+    def load_table(self, key: str) -> Optional[pa.Table]:
+        """Load a table saved with ``save_table``.
+
+        Args:
+            key: State key
+
+        Returns:
+            Optional[pa.Table]: Stored table, or None if no table has been saved
+        """
+        path = self._path(key, '.parquet')
+        if not path.exists():
+            return None
+
+        try:
+            return pq.read_table(path)
+        except (OSError, pa.ArrowException) as e:
+            logger.error(f"Error loading state {key}: {str(e)}")
+            raise
+
+    def save_table(self, key: str, table: pa.Table) -> None:
+        """Atomically save a table as Parquet.
+
+        Args:
+            key: State key
+            table: Table to store
+        """
+        self._write_atomic(key, self._path(key, '.parquet'), 'wb', lambda f: pq.write_table(table, f))
+
+    def delete(self, key: str) -> None:
+        """Delete a state value or table if it exists.
+
+        Args:
+            key: State key
+        """
+        for path in (self._path(key), self._path(key, '.parquet')):
+            if path.exists():
+                path.unlink()
@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime
+import pandas as pd
+from src.collectors.base_collector import BaseCollector
+from src.utils.arrow_utils import RAW_METRIC_SCHEMA
+
+class StaticCollector(BaseCollector):
+    output_columns = ['timestamp', 'metric_name', 'value']
+
+    def __init__(self, config, chunks):
+        super().__init__(config)
+        self.chunks = chunks
+
+    def collect_iter(self, chunk_rows=None, commit=None):
+        for chunk in self.chunks:
+            self.validate_data(chunk)
+            yield chunk
+
+    def probe(self):
+        return True
+
+def test_base_collector_is_abstract(test_config):
+    with pytest.raises(TypeError):
+        BaseCollector(test_config)
+
+def test_base_collector_collect_combines_chunks(test_config):
+    chunk = pd.DataFrame({
+        'timestamp': [datetime(2024, 1, 1)], 'metric_name': ['latency'], 'value': [1.0]
+    })
+    collector = StaticCollector(test_config, [chunk, chunk])
+
+    assert len(collector.collect()) == 2
+    assert list(StaticCollector(test_config, []).collect().columns) == collector.output_columns
+
+@pytest.mark.parametrize("frame,message", [
+    (pd.DataFrame({'timestamp': [datetime(2024, 1, 1)], 'value': [1.0]}), 'Missing required columns'),
+    (pd.DataFrame({'timestamp': ['bad'], 'metric_name': ['m'], 'value': [1.0]}), 'timestamp'),
+    (pd.DataFrame({'timestamp': [datetime(2024, 1, 1)], 'metric_name': ['m'], 'value': ['x']}), 'value'),
+])
+def test_base_collector_validate_data(test_config, frame, message):
+    collector = StaticCollector(test_config, [])
+    with pytest.raises(ValueError, match=message):
+        collector.validate_data(frame)
+
+def test_base_collector_collect_arrow_converts_chunks(test_config):
+    chunk = pd.DataFrame({
+        'timestamp': [datetime(2024, 1, 1)], 'metric_name': ['latency'], 'value': [1],
+        'metadata': [{'host': 'a', 'port': 5432}]
+    })
+    collector = StaticCollector(test_config, [chunk, chunk])
+
+    table = collector.collect_arrow()
+
+    assert table.schema.equals(RAW_METRIC_SCHEMA)
+    assert table.num_rows == 2
+    assert table.column('value').to_pylist() == [1.0, 1.0]
+    assert table.column('metadata').to_pylist()[0] == [('host', 'a'), ('port', '5432')]
+
+def test_base_collector_update_metrics(test_config):
+    collector = StaticCollector(test_config, [])
+    collector.update_metrics(datetime.now(), 10)
+    collector.update_metrics(datetime.now(), 0, error=True)
+
+    metrics = collector.get_metrics()
+    assert metrics['records_collected'] == 10
+    assert metrics['collection_errors'] == 1
+    assert metrics['last_collection_time'] is not None
+    assert str(collector) == "StaticCollector(records=10, errors=1)"
+
+    collector.reset_metrics()
+    assert collector.get_metrics()['records_collected'] == 0
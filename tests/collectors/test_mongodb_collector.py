@@ -1,7 +1,10 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import bson
+import threading
 from src.collectors.mongodb_collector import MongoDBCollector
 
 @pytest.fixture
@@ -131,3 +134,297 @@ def test_mongodb_collector_data_validation(mock_client, test_config):
     collector = MongoDBCollector(test_config)
     with pytest.raises(ValueError):
         collector.collect()
+
+@pytest.fixture
+def incremental_config(test_config, tmp_path):
+    test_config['state'] = {'path': str(tmp_path)}
+    return test_config
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_watermark_advances(mock_client, incremental_config, mock_mongodb_data):
+    """Test MongoDB collector persists and reuses the (timestamp, _id) watermark."""
+    documents = [dict(doc, _id=i) for i, doc in enumerate(mock_mongodb_data)]
+    mock_collection = Mock()
+    mock_collection.find.return_value = documents
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    assert collector.load_watermark() is None
+
+    collector.collect()
+    first_query = mock_collection.find.call_args.args[0]
+    assert first_query == {}
+    assert collector.load_watermark() == {'timestamp': datetime(2024, 1, 1, 0, 0), '_id': 1}
+
+    # A new collector instance resumes from the persisted watermark
+    mock_collection.find.return_value = []
+    MongoDBCollector(incremental_config).collect()
+    second_query = mock_collection.find.call_args.args[0]
+    assert second_query == {
+        '$or': [
+            {'timestamp': {'$gt': datetime(2024, 1, 1, 0, 0)}},
+            {'timestamp': datetime(2024, 1, 1, 0, 0), '_id': {'$gt': 1}}
+        ]
+    }
+    assert mock_collection.find.call_args.kwargs['sort'] == [('timestamp', 1), ('_id', 1)]
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_deferred_watermark_commit(mock_client, incremental_config, mock_mongodb_data):
+    """Test watermark is only persisted on explicit commit when auto-commit is off."""
+    incremental_config['collectors']['mongodb']['auto_commit_watermark'] = False
+    mock_collection = Mock()
+    mock_collection.find.return_value = [dict(doc, _id=i) for i, doc in enumerate(mock_mongodb_data)]
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    collector.collect()
+    assert collector.load_watermark() is None
+
+    collector.commit_state()
+    assert collector.load_watermark()['_id'] == 1
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_raw_batches(mock_client, incremental_config, mock_mongodb_data):
+    """Test raw BSON batches are copied into typed columns."""
+    incremental_config['collectors']['mongodb']['raw_batches'] = True
+    documents = [dict(doc, _id=i) for i, doc in enumerate(mock_mongodb_data)]
+    batches = [bson.encode(documents[0]), bson.encode(documents[1])]
+    mock_collection = Mock()
+    mock_collection.find_raw_batches.return_value = batches
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    result = collector.collect()
+
+    assert list(result.columns) == ['timestamp', 'metric_id', 'value', 'metadata']
+    assert result['value'].dtype == 'float64'
+    assert pd.api.types.is_datetime64_any_dtype(result['timestamp'])
+    assert result['timestamp'].iloc[0] == pd.Timestamp('2024-01-01 00:00')
+    assert result['metric_id'].tolist() == ['response_time_ms', 'error_count']
+    assert result['metadata'].iloc[0] == {'service': 'api'}
+    assert mock_collection.find_raw_batches.call_args.kwargs['projection'] == {
+        'timestamp': 1, 'metric_id': 1, 'value': 1, 'metadata': 1
+    }
+    assert collector.load_watermark() == {'timestamp': datetime(2024, 1, 1, 0, 0), '_id': 1}
+    mock_collection.find.assert_not_called()
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_parallel_timestamp_scans(mock_client, incremental_config):
+    """Test range-partitioned scans cover every document exactly once, in order."""
+    incremental_config['collectors']['mongodb']['parallel_scans'] = 3
+    documents = [
+        {
+            '_id': i,
+            'timestamp': datetime(2024, 1, 1) + timedelta(minutes=7 * i),
+            'metric_id': f'metric_{i}',
+            'value': i,
+            'metadata': {'service': 'api'}
+        }
+        for i in range(20)
+    ]
+
+    def find(query, **kwargs):
+        bounds = query['timestamp']
+        upper = bounds.get('$lt')
+        return [
+            doc for doc in documents
+            if doc['timestamp'] >= bounds['$gte']
+            and (doc['timestamp'] < upper if upper is not None else doc['timestamp'] <= bounds['$lte'])
+        ]
+
+    mock_collection = Mock()
+    mock_collection.find_one.side_effect = [documents[0], documents[-1]]
+    mock_collection.find.side_effect = find
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    result = collector.collect()
+
+    assert mock_collection.find.call_count == 3
+    assert result['metric_id'].tolist() == [f'metric_{i}' for i in range(20)]
+    assert collector.load_watermark()['_id'] == 19
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_parallel_id_scans_stream_in_time_order(mock_client, incremental_config):
+    """Test _id ranges, which overlap in time, are merged by timestamp as they stream."""
+    incremental_config['collectors']['mongodb'].update({'parallel_scans': 3, 'partition_field': '_id'})
+    # _ids are assigned round-robin, so every _id range spans the whole time range
+    documents = [
+        {
+            '_id': (i % 3) * 100 + i,
+            'timestamp': datetime(2024, 1, 1) + timedelta(minutes=i // 2),
+            'metric_id': f'metric_{i}',
+            'value': i,
+            'metadata': {'service': 'api'}
+        }
+        for i in range(30)
+    ]
+
+    def find(query, **kwargs):
+        bounds = query['_id']
+        upper = bounds.get('$lt')
+        matched = [
+            doc for doc in documents
+            if doc['_id'] >= bounds['$gte']
+            and (doc['_id'] < upper if upper is not None else doc['_id'] <= bounds['$lte'])
+        ]
+        return sorted(matched, key=lambda doc: (doc['timestamp'], doc['_id']))
+
+    mock_collection = Mock()
+    mock_collection.aggregate.return_value = [
+        {'_id': {'min': 0, 'max': 100}}, {'_id': {'min': 100, 'max': 200}}, {'_id': {'min': 200, 'max': 300}}
+    ]
+    mock_collection.find.side_effect = find
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    chunks = list(collector.collect_iter(chunk_rows=4))
+
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    streamed = pd.concat(chunks, ignore_index=True)
+    assert streamed['timestamp'].is_monotonic_increasing
+    assert sorted(streamed['metric_id']) == sorted(doc['metric_id'] for doc in documents)
+    last = max(documents, key=lambda doc: (doc['timestamp'], doc['_id']))
+    assert collector.load_watermark() == {'timestamp': last['timestamp'], '_id': last['_id']}
+
+@pytest.mark.parametrize("raw_batches", [False, True])
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_collect_iter_chunks(mock_client, incremental_config, raw_batches):
+    """Test collect_iter yields fixed-size chunks and only then advances the watermark."""
+    incremental_config['collectors']['mongodb']['raw_batches'] = raw_batches
+    documents = [
+        {
+            '_id': i,
+            'timestamp': datetime(2024, 1, 1) + timedelta(minutes=i),
+            'metric_id': f'metric_{i}',
+            'value': i,
+            'metadata': {'service': 'api'}
+        }
+        for i in range(5)
+    ]
+    mock_collection = Mock()
+    mock_collection.find.return_value = documents
+    mock_collection.find_raw_batches.return_value = [
+        b''.join(bson.encode(doc) for doc in documents[:3]),
+        b''.join(bson.encode(doc) for doc in documents[3:])
+    ]
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    chunks = collector.collect_iter(chunk_rows=2)
+
+    first = next(chunks)
+    assert len(first) == 2
+    assert collector.load_watermark() is None
+
+    rest = list(chunks)
+    assert [len(chunk) for chunk in rest] == [2, 1]
+    assert pd.concat([first] + rest)['metric_id'].tolist() == [f'metric_{i}' for i in range(5)]
+    assert collector.load_watermark()['_id'] == 4
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_raw_batches_copy_each_row_once(mock_client, incremental_config, monkeypatch):
+    """Test splitting one large batch into chunks does not re-copy the buffered remainder."""
+    from src.collectors import mongodb_collector
+    incremental_config['collectors']['mongodb']['raw_batches'] = True
+    documents = [
+        {
+            '_id': i,
+            'timestamp': datetime(2024, 1, 1) + timedelta(minutes=i),
+            'metric_id': f'metric_{i}',
+            'value': i,
+            'metadata': {}
+        }
+        for i in range(5)
+    ]
+    mock_collection = Mock()
+    mock_collection.find_raw_batches.return_value = [b''.join(bson.encode(doc) for doc in documents)]
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    copied = []
+    concatenate = np.concatenate
+
+    def counting(arrays, *args, **kwargs):
+        result = concatenate(arrays, *args, **kwargs)
+        copied.append(len(result))
+        return result
+
+    monkeypatch.setattr(mongodb_collector.np, 'concatenate', counting)
+    chunks = list(MongoDBCollector(incremental_config).collect_iter(chunk_rows=1))
+
+    assert [chunk['metric_id'].tolist() for chunk in chunks] == [[f'metric_{i}'] for i in range(5)]
+    # Timestamps and values, one row each per chunk
+    assert sum(copied) == 10
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_collect_aggregated(mock_client, test_config):
+    """Test server-side pre-aggregation returns processor-shaped rows."""
+    mock_collection = Mock()
+    mock_collection.aggregate.return_value = [
+        {
+            'timestamp': datetime(2024, 1, 1, 0, 0),
+            'metric_name': 'response_time_ms',
+            'dimensions': {'service': 'api'},
+            'value': 100.0,
+            'value_min': 90.0,
+            'value_max': 110.0,
+            'value_count': 3
+        }
+    ]
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(test_config)
+    result = collector.collect_aggregated(window='15min', start=datetime(2024, 1, 1))
+
+    pipeline = mock_collection.aggregate.call_args.args[0]
+    assert pipeline[0] == {'$match': {'timestamp': {'$gte': datetime(2024, 1, 1)}}}
+    assert pipeline[1]['$group']['_id']['timestamp'] == {
+        '$dateTrunc': {'date': '$timestamp', 'unit': 'minute', 'binSize': 15}
+    }
+    assert list(result.columns) == [
+        'timestamp', 'metric_name', 'source', 'dimensions',
+        'value', 'value_min', 'value_max', 'value_count'
+    ]
+    assert result['source'].tolist() == ['mongodb']
+
+def test_mongodb_collector_unsupported_window(test_config):
+    """Test windows that $dateTrunc cannot express are rejected."""
+    collector = MongoDBCollector(test_config)
+    with pytest.raises(ValueError):
+        collector.build_aggregation_pipeline('1Q')
+
+@patch('pymongo.MongoClient')
+def test_mongodb_collector_tail_micro_batches(mock_client, incremental_config, mock_mongodb_data):
+    """Test change stream tailing flushes micro-batches and persists the resume token."""
+    changes = [{'fullDocument': doc} for doc in mock_mongodb_data]
+    tokens = iter([{'_data': 'token-1'}, {'_data': 'token-2'}])
+
+    stream = MagicMock()
+    stream.__enter__.return_value = stream
+    stream.try_next.side_effect = changes + [None] * 100
+    type(stream).resume_token = property(lambda self: next(tokens))
+
+    mock_collection = Mock()
+    mock_collection.watch.return_value = stream
+    mock_client.return_value.__getitem__.return_value.__getitem__.return_value = mock_collection
+
+    collector = MongoDBCollector(incremental_config)
+    stop = threading.Event()
+    batches = []
+
+    def handler(df):
+        batches.append(df)
+        stop.set()
+
+    collector.tail(handler, stop_event=stop, max_batch_rows=2)
+
+    assert len(batches) == 1
+    assert batches[0]['metric_id'].tolist() == ['response_time_ms', 'error_count']
+    assert collector.load_resume_token() == {'_data': 'token-1'}
+    assert mock_collection.watch.call_args.kwargs['resume_after'] is None
+
+    # Restart resumes after the delivered batch
+    stop.clear()
+    stream.try_next.side_effect = lambda: stop.set()
+    collector.tail(handler, stop_event=stop, max_batch_rows=2)
+    assert mock_collection.watch.call_args.kwargs['resume_after'] == {'_data': 'token-1'}
@@ -1,8 +1,14 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pandas as pd
+import requests
 from src.collectors.newrelic_collector import NewRelicCollector
+from src.utils.arrow_utils import RAW_METRIC_SCHEMA
 
 @pytest.fixture
 def mock_newrelic_data():
@@ -38,7 +44,7 @@ def test_newrelic_collector_init(test_config):
     assert collector.api_key == test_config['collectors']['newrelic']['api_key']
     assert collector.account_id == test_config['collectors']['newrelic']['account_id']
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_newrelic_collector_collect(mock_get, test_config, mock_newrelic_data):
     """Test NewRelic metrics collection."""
     # Setup mock
@@ -58,7 +64,7 @@ def test_newrelic_collector_collect(mock_get, test_config, mock_newrelic_data):
     assert 'name' in result.columns
     assert 'value' in result.columns
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_newrelic_collector_rate_limiting(mock_get, test_config):
     """Test NewRelic collector rate limiting handling."""
     # Setup mock for rate limit response
@@ -78,7 +84,7 @@ def test_newrelic_collector_rate_limiting(mock_get, test_config):
     (500, "Internal Server Error"),
     (503, "Service Unavailable")
 ])
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_newrelic_collector_error_handling(mock_get, test_config, error_code, error_message):
     """Test NewRelic collector error handling."""
     # Setup mock for error response
@@ -93,7 +99,7 @@ def test_newrelic_collector_error_handling(mock_get, test_config, error_code, er
         collector.collect()
     assert error_message in str(exc_info.value)
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_newrelic_collector_pagination(mock_get, test_config):
     """Test NewRelic collector pagination handling."""
     # Setup mock responses for pagination
@@ -113,3 +119,441 @@ def test_newrelic_collector_pagination(mock_get, test_config):
     assert isinstance(result, pd.DataFrame)
     assert len(result) == 2
     assert mock_get.call_count == 2
+
+@patch('requests.Session.get')
+def test_newrelic_collector_collect_iter_chunks(mock_get, test_config, mock_newrelic_data):
+    """Test NewRelic collector streams fixed-size chunks across pages."""
+    first_page = dict(mock_newrelic_data, next_page=2)
+    second_page = dict(mock_newrelic_data, next_page=None)
+    mock_get.side_effect = [
+        Mock(status_code=200, json=lambda: first_page),
+        Mock(status_code=200, json=lambda: second_page)
+    ]
+
+    collector = NewRelicCollector(test_config)
+    chunks = list(collector.collect_iter(chunk_rows=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert list(chunks[0].columns) == ['timestamp', 'name', 'value', 'attributes']
+
+@patch('requests.Session.get')
+def test_newrelic_collector_concurrent_pages_in_order(mock_get, test_config):
+    """Test pages advertised by the Link header are fetched concurrently and kept in order."""
+    test_config['collectors']['newrelic']['concurrency'] = 3
+
+    def page_response(url, headers=None, params=None, timeout=None):
+        page = params['page']
+        body = {
+            'metric_data': {'metrics': [{
+                'name': f'metric_{page}',
+                'timeslices': [{'from': '2024-01-01T00:00:00Z', 'values': {'value': page}}]
+            }]},
+            'next_page': page + 1 if page < 5 else None
+        }
+        return Mock(
+            status_code=200,
+            json=lambda: body,
+            links={'last': {'url': 'https://api.newrelic.com/v2/metrics?page=5'}}
+        )
+
+    mock_get.side_effect = page_response
+
+    collector = NewRelicCollector(test_config)
+    result = collector.collect()
+
+    assert result['name'].tolist() == [f'metric_{page}' for page in range(1, 6)]
+    assert sorted(call.kwargs['params']['page'] for call in mock_get.call_args_list) == [1, 2, 3, 4, 5]
+
+@patch('requests.Session.get')
+def test_newrelic_collector_speculative_pages_discarded(mock_get, test_config):
+    """Test speculative pages past the end are discarded, even if they fail."""
+    test_config['collectors']['newrelic']['concurrency'] = 4
+
+    def page_response(url, headers=None, params=None, timeout=None):
+        page = params['page']
+        if page > 2:
+            return Mock(status_code=404, raise_for_status=Mock(side_effect=requests.exceptions.HTTPError("404")))
+        body = {
+            'metric_data': {'metrics': [{
+                'name': f'metric_{page}',
+                'timeslices': [{'from': '2024-01-01T00:00:00Z', 'values': {'value': page}}]
+            }]},
+            'next_page': 2 if page == 1 else None
+        }
+        return Mock(status_code=200, json=lambda: body, links={})
+
+    mock_get.side_effect = page_response
+
+    collector = NewRelicCollector(test_config)
+    result = collector.collect()
+
+    assert result['name'].tolist() == ['metric_1', 'metric_2']
+
+@pytest.fixture
+def newrelic_stub_server():
+    """Local NewRelic stand-in that rate limits the first request."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(time.monotonic())
+            if len(requests_seen) == 1:
+                self.send_response(429)
+                self.send_header('Retry-After', '0.3')
+                self.end_headers()
+                return
+            body = json.dumps({
+                'metric_data': {'metrics': [{
+                    'name': 'response_time',
+                    'timeslices': [{'from': '2024-01-01T00:00:00Z', 'values': {'average': 1.0}}]
+                }]},
+                'next_page': None
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2", requests_seen
+    server.shutdown()
+
+def test_newrelic_collector_honors_retry_after(test_config, newrelic_stub_server):
+    """Test a 429 with Retry-After pauses the shared budget before retrying."""
+    base_url, requests_seen = newrelic_stub_server
+    test_config['collectors']['newrelic']['base_url'] = base_url
+    test_config['collectors']['newrelic']['rate_limit'] = {'jitter_seconds': 0.0}
+
+    collector = NewRelicCollector(test_config)
+    result = collector.collect()
+
+    assert len(result) == 1
+    assert len(requests_seen) == 2
+    assert requests_seen[1] - requests_seen[0] >= 0.3
+
+@patch('requests.Session.get')
+def test_newrelic_collector_flattening(mock_get, test_config):
+    """Test timeslices are flattened with vectorized timestamps and shared attributes."""
+    page = {
+        'metric_data': {'metrics': [{
+            'name': 'response_time',
+            'metric_type': 'gauge',
+            'unit': 'ms',
+            'timeslices': [
+                {'from': '2024-01-01T00:00:00+00:00', 'values': {'average': 1.0}},
+                {'from': '2024-01-01T00:01:00+00:00', 'values': {'average': 2.0}}
+            ]
+        }]},
+        'next_page': None
+    }
+    mock_get.return_value = Mock(status_code=200, json=lambda: page, links={})
+
+    collector = NewRelicCollector(test_config)
+    result = collector.collect()
+
+    assert str(result['timestamp'].dt.tz) == 'UTC'
+    assert result['timestamp'].tolist() == [
+        pd.Timestamp('2024-01-01T00:00:00Z'), pd.Timestamp('2024-01-01T00:01:00Z')
+    ]
+    assert result['value'].tolist() == [1.0, 2.0]
+    assert result['attributes'].iloc[0] == {'metric_type': 'gauge', 'unit': 'ms'}
+    assert result['attributes'].iloc[0] is result['attributes'].iloc[1]
+
+@patch('requests.Session.get')
+def test_newrelic_collector_arrow_batches(mock_get, test_config):
+    """Test REST timeslices are built straight into RAW_METRIC_SCHEMA batches."""
+    page = {
+        'metric_data': {'metrics': [{
+            'name': 'response_time',
+            'metric_type': 'gauge',
+            'unit': 'ms',
+            'timeslices': [
+                {'from': '2024-01-01T00:00:00+00:00', 'values': {'average': 1.0}},
+                {'from': '2024-01-01T00:01:00+00:00', 'values': {'average': 2.0}}
+            ]
+        }]},
+        'next_page': None
+    }
+    mock_get.return_value = Mock(status_code=200, json=lambda: page, links={})
+
+    collector = NewRelicCollector(test_config)
+    table = collector.collect_arrow()
+
+    assert table.schema.equals(RAW_METRIC_SCHEMA)
+    assert table.column('timestamp').to_pylist() == [datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 1)]
+    assert table.column('metric_name').to_pylist() == ['response_time', 'response_time']
+    assert table.column('value').to_pylist() == [1.0, 2.0]
+    assert table.column('metadata').to_pylist()[0] == [('metric_type', 'gauge'), ('unit', 'ms')]
+    assert collector.metrics['records_collected'] == 2
+
+@pytest.fixture
+def nerdgraph_stub_server():
+    """Local NerdGraph stand-in returning a recorded TIMESERIES response."""
+    bodies = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            bodies.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            body = json.dumps({'data': {'actor': {'account': {'nrql': {'results': [
+                {'beginTimeSeconds': 1704067200, 'endTimeSeconds': 1704067260,
+                 'appName': 'api', 'duration': 0.25, 'error.count': 2},
+                {'beginTimeSeconds': 1704067260, 'endTimeSeconds': 1704067320,
+                 'appName': 'api', 'duration': 0.5, 'error.count': None}
+            ]}}}}}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/graphql", bodies
+    server.shutdown()
+
+def test_newrelic_collector_nrql_timeseries(test_config, nerdgraph_stub_server, tmp_path):
+    """Test the NRQL backend batches metrics and reshapes TIMESERIES results."""
+    endpoint, bodies = nerdgraph_stub_server
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['newrelic'].update({
+        'account_id': '12345',
+        'query_backend': 'nrql',
+        'metrics': [{'name': 'duration'}, {'name': 'error.count'}],
+        'nrql': {'endpoint': endpoint, 'facets': ['appName']}
+    })
+
+    collector = NewRelicCollector(test_config)
+    result = collector.collect()
+
+    assert len(bodies) == 1
+    nrql = bodies[0]['variables']['nrql']
+    assert 'average(`duration`) AS `duration`' in nrql
+    assert 'FACET `appName`' in nrql and 'TIMESERIES 1 minute' in nrql
+    assert bodies[0]['variables']['accountId'] == 12345
+
+    assert list(result.columns) == ['timestamp', 'name', 'value', 'attributes']
+    assert sorted(zip(result['name'], result['value'])) == [
+        ('duration', 0.25), ('duration', 0.5), ('error.count', 2.0)
+    ]
+    assert result['timestamp'].min() == pd.Timestamp('2024-01-01T00:00:00Z')
+    assert result['attributes'].iloc[0] == {'appName': 'api'}
+
+def test_newrelic_collector_nrql_batches_queries(test_config):
+    """Test metrics are split across queries by metrics_per_query."""
+    test_config['collectors']['newrelic'].update({
+        'metrics': [{'name': f'm{i}'} for i in range(5)],
+        'nrql': {'metrics_per_query': 2}
+    })
+
+    collector = NewRelicCollector(test_config)
+    queries = collector.build_nrql_queries()
+
+    assert [names for names, _ in queries] == [['m0', 'm1'], ['m2', 'm3'], ['m4']]
+
+def test_newrelic_collector_nrql_windows_follow_watermarks(test_config, nerdgraph_stub_server, tmp_path):
+    """Test NRQL queries cover the closed windows past the watermarks and advance them."""
+    endpoint, bodies = nerdgraph_stub_server
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['newrelic'].update({
+        'account_id': '12345',
+        'query_backend': 'nrql',
+        'metrics': [{'name': 'duration'}, {'name': 'error.count'}],
+        'nrql': {'endpoint': endpoint}
+    })
+    collector = NewRelicCollector(test_config)
+    start = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=10)
+    collector.state.save(collector.watermark_key, {'duration': start.isoformat(), 'error.count': start.isoformat()})
+    end = collector.build_request_windows()[-1][2]
+
+    collector.collect()
+
+    nrql = bodies[0]['variables']['nrql']
+    assert f"SINCE {int(start.timestamp() * 1000)} UNTIL {int(end.timestamp() * 1000)}" in nrql
+    assert collector.load_watermarks() == {'duration': end, 'error.count': end}
+
+def test_newrelic_collector_nrql_windows_fit_bucket_limit(test_config, tmp_path):
+    """Test a multi-hour catch-up is split into queries under NerdGraph's bucket limit."""
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['newrelic'].update({
+        'query_backend': 'nrql',
+        'metrics': [{'name': 'duration'}],
+        'window': {'period_seconds': 60, 'lag_seconds': 0},
+        'nrql': {'max_buckets': 366}
+    })
+    collector = NewRelicCollector(test_config)
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    collector.state.save(collector.watermark_key, {'duration': (now - timedelta(hours=12)).isoformat()})
+
+    windows = collector.build_request_windows(now)
+    queries = collector.build_nrql_queries(windows)
+
+    assert len(queries) == 2
+    assert all((end - start) <= timedelta(minutes=366) for _, start, end in windows)
+    assert windows[0][1] == now - timedelta(hours=12) and windows[-1][2] == now
+    assert all('TIMESERIES 1 minute' in nrql for _, nrql in queries)
+
+    collector.period = 300
+    assert 'TIMESERIES 5 minutes' in collector.build_nrql_queries(windows)[0][1]
+
+@pytest.fixture
+def windowed_config(test_config, tmp_path):
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['newrelic'].update({
+        'metrics': [{'name': 'response_time'}, {'name': 'error_rate'}],
+        'query_limit': 10,
+        'window': {'period_seconds': 60, 'lookback_minutes': 30, 'lag_seconds': 0}
+    })
+    return test_config
+
+def test_newrelic_collector_request_windows(windowed_config):
+    """Test windows end at the last closed period and respect query_limit."""
+    collector = NewRelicCollector(windowed_config)
+    now = datetime(2024, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+    windows = collector.build_request_windows(now)
+
+    end = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert [(w[1], w[2]) for w in windows] == [
+        (end - timedelta(minutes=30), end - timedelta(minutes=20)),
+        (end - timedelta(minutes=20), end - timedelta(minutes=10)),
+        (end - timedelta(minutes=10), end)
+    ]
+    assert all(w[0] == ['response_time', 'error_rate'] for w in windows)
+
+def test_newrelic_collector_request_windows_wait_for_lag(windowed_config):
+    """Test windows stop at the last period that closed at least lag_seconds ago."""
+    windowed_config['collectors']['newrelic']['window']['lag_seconds'] = 120
+    collector = NewRelicCollector(windowed_config)
+    now = datetime(2024, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+    windows = collector.build_request_windows(now)
+
+    assert windows[-1][2] == datetime(2024, 1, 1, 11, 58, tzinfo=timezone.utc)
+
+@patch('requests.Session.get')
+def test_newrelic_collector_windowed_fetch_advances_watermarks(mock_get, windowed_config):
+    """Test only configured metrics are requested and each run resumes at its watermark."""
+    page = {'metric_data': {'metrics': [{
+        'name': 'response_time',
+        'timeslices': [{'from': '2024-01-01T00:00:00Z', 'values': {'average': 1.0}}]
+    }]}, 'next_page': None}
+    mock_get.return_value = Mock(status_code=200, json=lambda: page, links={})
+    windowed_config['collectors']['newrelic']['query_limit'] = 1000
+
+    collector = NewRelicCollector(windowed_config)
+    collector.collect()
+
+    params = mock_get.call_args.kwargs['params']
+    assert params['names[]'] == ['response_time', 'error_rate']
+    assert params['period'] == 60
+    watermarks = collector.load_watermarks()
+    assert set(watermarks) == {'response_time', 'error_rate'}
+    assert watermarks['response_time'].isoformat() == params['to']
+
+    # Nothing new to fetch until the next period closes
+    mock_get.reset_mock()
+    collector.build_request_windows = lambda: [
+        (['response_time'], watermarks['response_time'],
+         watermarks['response_time'] + timedelta(minutes=1))
+    ]
+    collector.collect()
+    assert mock_get.call_args.kwargs['params']['from'] == watermarks['response_time'].isoformat()
+
+@patch('requests.Session.get')
+def test_newrelic_collector_requests_time_out(mock_get, windowed_config):
+    """Test every API request is bounded by request_timeout_seconds."""
+    mock_get.return_value = Mock(status_code=200, json=lambda: {'metric_data': {'metrics': []}}, links={})
+    windowed_config['collectors']['newrelic']['request_timeout_seconds'] = 5
+
+    NewRelicCollector(windowed_config).collect()
+
+    assert mock_get.call_args_list
+    assert all(call.kwargs['timeout'] == 5 for call in mock_get.call_args_list)
+
+@patch('requests.Session.get')
+def test_newrelic_collector_watermarks_not_committed_on_error(mock_get, windowed_config):
+    """Test a failed run leaves the watermarks untouched."""
+    mock_get.side_effect = requests.exceptions.ConnectionError("boom")
+
+    collector = NewRelicCollector(windowed_config)
+    with pytest.raises(requests.exceptions.RequestException):
+        collector.collect()
+
+    assert collector.load_watermarks() == {}
+
+@pytest.fixture
+def etag_stub_server():
+    """Local NewRelic stand-in that honours If-None-Match."""
+    requests_seen = []
+    body = json.dumps({'metric_data': {'metrics': []}, 'next_page': None}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.headers.get('If-None-Match'))
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2", requests_seen
+    server.shutdown()
+
+def test_newrelic_collector_response_cache_revalidates(test_config, etag_stub_server, tmp_path):
+    """Test cached responses are served while fresh and revalidated with ETags once stale."""
+    base_url, requests_seen = etag_stub_server
+    test_config['collectors']['newrelic'].update({
+        'base_url': base_url,
+        'cache': {'enabled': True, 'path': str(tmp_path), 'ttl_seconds': 60}
+    })
+
+    collector = NewRelicCollector(test_config)
+    endpoint = f"accounts/{collector.account_id}/applications"
+    assert collector._make_request(endpoint)
+    assert collector._make_request(endpoint)
+    assert requests_seen == [None]
+
+    # Entries stored already stale are revalidated and reused on 304
+    collector.cache.delete(collector.cache.make_key(
+        'GET', f"{base_url}/accounts/test_account/applications", None
+    ))
+    collector.cache_ttl = -1
+    assert collector._make_request(endpoint)
+    assert collector._make_request(endpoint)
+    assert collector._make_request(endpoint)
+    assert requests_seen == [None, None, '"v1"', '"v1"']
+
+def test_newrelic_collector_closed_windows_are_immutable(test_config, tmp_path):
+    """Test windows that already ended are cached without expiry."""
+    test_config['collectors']['newrelic']['cache'] = {'enabled': True, 'path': str(tmp_path)}
+    collector = NewRelicCollector(test_config)
+
+    assert collector._cache_ttl_for({'to': '2024-01-01T00:00:00+00:00'}) is None
+    future = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    assert collector._cache_ttl_for({'to': future}) == 60
+    assert collector._cache_ttl_for({'page': 1}) == 60
+
+    # A window that only just ended may still receive late data
+    recent = (datetime.now(timezone.utc) - timedelta(seconds=30)).isoformat()
+    assert collector._cache_ttl_for({'to': recent}) == 60
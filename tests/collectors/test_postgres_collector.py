@@ -1,8 +1,13 @@
+import json
+import time
 import pytest
-from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+from datetime import datetime, timedelta, timezone
 import pandas as pd
-from src.collectors.postgres_collector import PostgresCollector
+import psycopg2
+import pyarrow as pa
+from src.collectors.postgres_collector import PostgresCollector, bind_named_params, decode_metadata
+from src.utils.arrow_utils import RAW_METRIC_SCHEMA
 
 @pytest.fixture
 def mock_postgres_data():
@@ -22,9 +27,9 @@ def test_postgres_collector_init(test_config):
 def test_postgres_collector_collect(mock_connect, test_config, mock_postgres_data):
     """Test PostgreSQL metrics collection."""
     # Setup mock
-    mock_cursor = Mock()
-    mock_cursor.fetchall.return_value = mock_postgres_data
-    mock_connect.return_value.cursor.return_value = mock_cursor
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [mock_postgres_data, []]
+    mock_connect.return_value.cursor.return_value.__enter__.return_value = mock_cursor
 
     # Test collection
     collector = PostgresCollector(test_config)
@@ -52,9 +57,9 @@ def test_postgres_collector_connection_error(mock_connect, test_config):
 def test_postgres_collector_query_error(mock_connect, test_config):
     """Test PostgreSQL collector query error handling."""
     # Setup mock
-    mock_cursor = Mock()
+    mock_cursor = MagicMock()
     mock_cursor.execute.side_effect = Exception("Query failed")
-    mock_connect.return_value.cursor.return_value = mock_cursor
+    mock_connect.return_value.cursor.return_value.__enter__.return_value = mock_cursor
 
     # Test collection
     collector = PostgresCollector(test_config)
@@ -66,9 +71,9 @@ def test_postgres_collector_query_error(mock_connect, test_config):
 def test_postgres_collector_empty_results(mock_connect, test_config):
     """Test PostgreSQL collector with empty results."""
     # Setup mock
-    mock_cursor = Mock()
-    mock_cursor.fetchall.return_value = []
-    mock_connect.return_value.cursor.return_value = mock_cursor
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [[], []]
+    mock_connect.return_value.cursor.return_value.__enter__.return_value = mock_cursor
 
     # Test collection
     collector = PostgresCollector(test_config)
@@ -80,18 +85,434 @@ def test_postgres_collector_empty_results(mock_connect, test_config):
 
 @patch('psycopg2.connect')
 def test_postgres_collector_connection_cleanup(mock_connect, test_config):
-    """Test PostgreSQL collector connection cleanup."""
+    """Test PostgreSQL collector returns connections to the shared pool."""
     # Setup mocks
-    mock_cursor = Mock()
-    mock_connection = Mock()
+    mock_cursor = MagicMock()
+    mock_connection = MagicMock(closed=False)
     mock_connect.return_value = mock_connection
-    mock_connection.cursor.return_value = mock_cursor
-    mock_cursor.fetchall.return_value = []
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_cursor.fetchmany.return_value = []
+
+    # Test collection twice
+    collector = PostgresCollector(test_config)
+    collector.collect()
+    collector.collect()
+
+    # Verify the pooled connection was reused rather than reopened and closed
+    mock_connect.assert_called_once()
+    mock_connection.close.assert_not_called()
+
+@patch('psycopg2.connect')
+def test_postgres_collector_collect_iter_chunks(mock_connect, test_config, mock_postgres_data):
+    """Test PostgreSQL collector streams fixed-size chunks with fetchmany."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [mock_postgres_data[:1], mock_postgres_data[1:], []]
+    mock_connect.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+
+    collector = PostgresCollector(test_config)
+    chunks = list(collector.collect_iter(chunk_rows=1))
+
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    mock_cursor.fetchmany.assert_called_with(1)
+
+@patch('psycopg2.connect')
+def test_postgres_collector_server_side_cursor(mock_connect, test_config):
+    """Test the cursor mode reads through a named cursor and keeps metadata as text."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchmany.side_effect = [
+        [(datetime(2024, 1, 1), 'query_time', 1.5, '{"calls": 3}')], []
+    ]
+    mock_connection = MagicMock(closed=False)
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_connect.return_value = mock_connection
+
+    collector = PostgresCollector(test_config)
+    result = collector.collect()
+
+    assert mock_connection.cursor.call_args.kwargs['name'].startswith('metrics_')
+    assert mock_cursor.itersize == collector.chunk_rows
+    assert result['metadata'].tolist() == ['{"calls": 3}']
+    assert decode_metadata(result)['metadata'].tolist() == [{'calls': 3}]
+
+@patch('psycopg2.connect')
+def test_postgres_collector_copy_to_arrow(mock_connect, test_config):
+    """Test the COPY mode parses CSV output into typed, chunked frames."""
+    csv_output = (
+        b'timestamp,metric_name,value,metadata\n'
+        b'2024-01-01 00:00:00+00,query_time,1.5,"{""calls"": 3}"\n'
+        b'2024-01-01 00:00:00+00,connections,4,\n'
+        b'2024-01-01 00:00:00+00,table_stats,10,"{""table"": ""t""}"\n'
+    )
+    mock_cursor = MagicMock()
+    mock_cursor.copy_expert.side_effect = lambda sql, sink: sink.write(csv_output)
+    mock_connection = MagicMock(closed=False)
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_connect.return_value = mock_connection
+    test_config['collectors']['postgres']['fetch_mode'] = 'copy'
+
+    collector = PostgresCollector(test_config)
+    chunks = list(collector.collect_iter(chunk_rows=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert 'TO STDOUT' in mock_cursor.copy_expert.call_args.args[0]
+    result = pd.concat(chunks, ignore_index=True)
+    assert str(result['timestamp'].dt.tz) == 'UTC'
+    assert result['value'].tolist() == [1.5, 4.0, 10.0]
+    assert result['metadata'].iloc[0] == '{"calls": 3}'
+    assert pd.isna(result['metadata'].iloc[1])
+
+@patch('psycopg2.connect')
+def test_postgres_collector_copy_arrow_batches(mock_connect, test_config):
+    """Test COPY output is emitted as RAW_METRIC_SCHEMA batches tagged with the target."""
+    csv_output = (
+        b'timestamp,metric_name,value,metadata\n'
+        b'2024-01-01 02:00:00+02,query_time,1.5,"{""calls"": 3}"\n'
+        b'2024-01-01 00:00:00+00,connections,4,\n'
+    )
+    mock_cursor = MagicMock()
+    mock_cursor.copy_expert.side_effect = lambda sql, sink: sink.write(csv_output)
+    mock_connection = MagicMock(closed=False)
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_connect.return_value = mock_connection
+    test_config['collectors']['postgres']['fetch_mode'] = 'copy'
+
+    collector = PostgresCollector(test_config)
+    batches = list(collector.collect_arrow_iter())
+
+    assert all(batch.schema.equals(RAW_METRIC_SCHEMA) for batch in batches)
+    rows = pa.Table.from_batches(batches).to_pylist()
+    assert [row['timestamp'] for row in rows] == [datetime(2024, 1, 1), datetime(2024, 1, 1)]
+    assert [row['metric_name'] for row in rows] == ['query_time', 'connections']
+    target = collector.targets[0]['name']
+    assert rows[0]['metadata'] == [('calls', '3'), ('target', target)]
+    assert rows[1]['metadata'] == [('target', target)]
+
+@patch('psycopg2.connect')
+def test_postgres_collector_copy_error(mock_connect, test_config):
+    """Test a failing COPY surfaces the database error."""
+    mock_cursor = MagicMock()
+    mock_cursor.copy_expert.side_effect = psycopg2.ProgrammingError("permission denied")
+    mock_connection = MagicMock(closed=False)
+    mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+    mock_connect.return_value = mock_connection
+    test_config['collectors']['postgres']['fetch_mode'] = 'copy'
 
-    # Test collection
     collector = PostgresCollector(test_config)
+    with pytest.raises(psycopg2.ProgrammingError, match="permission denied"):
+        collector.collect()
+
+def test_postgres_collector_rejects_unknown_fetch_mode(test_config):
+    test_config['collectors']['postgres']['fetch_mode'] = 'fetchall'
+    with pytest.raises(ValueError):
+        PostgresCollector(test_config)
+
+def _target_connection(rows, delay=0.0):
+    """Mock connection whose named cursor returns ``rows`` after ``delay`` seconds."""
+    def fetchmany(size):
+        time.sleep(delay)
+        return rows.pop(0) if rows else []
+
+    cursor = MagicMock()
+    cursor.fetchmany.side_effect = fetchmany
+    connection = MagicMock(closed=False)
+    connection.cursor.return_value.__enter__.return_value = cursor
+    return connection
+
+@pytest.fixture
+def multi_target_config(test_config):
+    test_config['collectors']['postgres'].update({
+        'targets': [
+            {'name': 'a', 'host': 'db-a'},
+            {'name': 'b', 'host': 'db-b'},
+            {'name': 'c', 'host': 'db-c'}
+        ],
+        'max_workers': 3,
+        'target_timeout_seconds': 0.5
+    })
+    return test_config
+
+@patch('psycopg2.connect')
+def test_postgres_collector_fans_out_targets(mock_connect, multi_target_config, mock_postgres_data):
+    """Test every target is queried and rows are tagged with their target."""
+    connections = {
+        host: _target_connection([list(mock_postgres_data)])
+        for host in ('db-a', 'db-b', 'db-c')
+    }
+    mock_connect.side_effect = lambda **dsn: connections[dsn['host']]
+
+    collector = PostgresCollector(multi_target_config)
+    result = collector.collect()
+
+    assert sorted(result['target'].unique()) == ['a', 'b', 'c']
+    assert len(result) == 6
+    assert collector.failed_targets == {}
+    assert collector.targets[1]['user'] == multi_target_config['collectors']['postgres']['user']
+    dsn = mock_connect.call_args.kwargs
+    assert dsn['connect_timeout'] == 10
+    assert 'statement_timeout=500' in dsn['options']
+
+@patch('psycopg2.connect')
+def test_postgres_collector_isolates_failed_targets(mock_connect, multi_target_config, mock_postgres_data):
+    """Test a dead host and a hung host do not stall the healthy target."""
+    def connect(**dsn):
+        if dsn['host'] == 'db-a':
+            raise psycopg2.OperationalError("could not connect")
+        if dsn['host'] == 'db-b':
+            return _target_connection([list(mock_postgres_data)], delay=3.0)
+        return _target_connection([list(mock_postgres_data)])
+    mock_connect.side_effect = connect
+
+    collector = PostgresCollector(multi_target_config)
+    started = time.monotonic()
+    result = collector.collect()
+
+    assert time.monotonic() - started < 2.0
+    assert result['target'].unique().tolist() == ['c']
+    assert set(collector.failed_targets) == {'a', 'b'}
+    assert 'could not connect' in collector.failed_targets['a']
+
+@patch('psycopg2.connect')
+def test_postgres_collector_skips_target_with_open_circuit(mock_connect, multi_target_config, mock_postgres_data):
+    """Test a target that keeps failing is skipped without connecting."""
+    multi_target_config['health'] = {'failure_threshold': 1, 'reset_timeout_seconds': 60}
+    hosts = []
+
+    def connect(**dsn):
+        hosts.append(dsn['host'])
+        if dsn['host'] == 'db-a':
+            raise psycopg2.OperationalError("could not connect")
+        return _target_connection([list(mock_postgres_data)])
+    mock_connect.side_effect = connect
+
+    collector = PostgresCollector(multi_target_config)
     collector.collect()
+    hosts.clear()
+    collector.collect()
+
+    assert 'db-a' not in hosts
+    assert set(collector.failed_targets) == {'a'}
+    assert 'circuit open' in collector.failed_targets['a']
+    assert not collector.health_check()
+
+def test_postgres_collector_rejects_duplicate_targets(test_config):
+    test_config['collectors']['postgres']['targets'] = [{'host': 'db'}, {'host': 'db'}]
+    with pytest.raises(ValueError):
+        PostgresCollector(test_config)
+
+def _statements(taken_at, stats_reset, rows):
+    return pd.DataFrame(
+        [(taken_at, stats_reset, f"10:1:{queryid}", str(queryid), calls, total) for queryid, calls, total in rows],
+        columns=['taken_at', 'stats_reset', 'statement_key', 'queryid', 'calls', 'total_exec_time']
+    )
+
+@pytest.fixture
+def delta_collector(test_config, tmp_path):
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['postgres']['statements'] = {'mode': 'delta'}
+    return PostgresCollector(test_config)
+
+def test_postgres_statement_deltas_emit_only_moved_counters(delta_collector):
+    """Test unchanged statements are dropped and moved ones become interval deltas."""
+    t0 = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    reset = datetime(2023, 12, 31, tzinfo=timezone.utc)
+
+    deltas, baseline = delta_collector.compute_statement_deltas(
+        _statements(t0, reset, [(1, 100, 500.0), (2, 10, 20.0)]), None
+    )
+    assert deltas.empty
+
+    deltas, _ = delta_collector.compute_statement_deltas(
+        _statements(t0 + timedelta(seconds=60), reset, [(1, 160, 800.0), (2, 10, 20.0), (3, 6, 12.0)]),
+        baseline
+    )
+
+    values = {(row.metric_name, json.loads(row.metadata)['queryid']): row.value for row in deltas.itertuples()}
+    assert values == {
+        ('query_count', '1'): 60.0, ('query_time', '1'): 5.0, ('query_rate', '1'): 1.0,
+        ('query_count', '3'): 6.0, ('query_time', '3'): 2.0, ('query_rate', '3'): 0.1
+    }
+    assert json.loads(deltas['metadata'].iloc[0])['interval_seconds'] == 60.0
+
+def test_postgres_statement_deltas_detect_reset(delta_collector):
+    """Test pg_stat_statements_reset() and per-statement counter regressions count from zero."""
+    t0 = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+    _, baseline = delta_collector.compute_statement_deltas(
+        _statements(t0, t0 - timedelta(days=1), [(1, 100, 500.0), (2, 50, 50.0)]), None
+    )
+
+    # Global reset 30s before the next snapshot: rates cover only the time since the reset
+    reset = t0 + timedelta(seconds=30)
+    deltas, _ = delta_collector.compute_statement_deltas(
+        _statements(t0 + timedelta(seconds=60), reset, [(1, 3, 6.0)]), baseline
+    )
+    counts = deltas.set_index('metric_name')['value']
+    assert counts['query_count'] == 3.0
+    assert counts['query_rate'] == 0.1
+
+    # Single statement restarted without a global reset
+    deltas, _ = delta_collector.compute_statement_deltas(
+        _statements(t0 + timedelta(seconds=60), t0 - timedelta(days=1), [(1, 4, 8.0), (2, 55, 60.0)]),
+        baseline
+    )
+    counts = deltas[deltas['metric_name'] == 'query_count']
+    assert dict(zip(
+        counts['metadata'].map(lambda m: json.loads(m)['queryid']), counts['value']
+    )) == {'1': 4.0, '2': 5.0}
+
+@patch('psycopg2.connect')
+def test_postgres_collector_commits_statement_snapshot(mock_connect, delta_collector):
+    """Test delta mode drops raw statement rows and stores the snapshot after collection."""
+    named_cursor = MagicMock()
+    named_cursor.fetchmany.side_effect = [[]]
+    snapshot_cursor = MagicMock()
+    snapshot_cursor.fetchall.return_value = [
+        (datetime(2024, 1, 1, tzinfo=timezone.utc), None, '10:1:1', '1', 5, 10.0)
+    ]
+    connection = MagicMock(closed=False)
+    connection.cursor.side_effect = lambda name=None: MagicMock(
+        __enter__=Mock(return_value=named_cursor if name else snapshot_cursor),
+        __exit__=Mock(return_value=False)
+    )
+    mock_connect.return_value = connection
+
+    result = delta_collector.collect()
+
+    assert result.empty
+    assert 'pg_stat_statements\n' not in named_cursor.execute.call_args.args[0]
+    snapshot = delta_collector.state.load('postgres.localhost:5432/test_db.pg_stat_statements')
+    assert snapshot['counters'] == {'10:1:1': [5, 10.0]}
+
+def test_postgres_collector_failed_target_keeps_snapshot(multi_target_config, tmp_path):
+    """Test a target failing after its snapshot was staged does not store that snapshot."""
+    multi_target_config['state'] = {'path': str(tmp_path)}
+    multi_target_config['collectors']['postgres']['statements'] = {'mode': 'delta'}
+    collector = PostgresCollector(multi_target_config)
+
+    def iter_target(target, *args):
+        collector.stage_state(collector._snapshot_key(target), {'counters': {}})
+        if target['name'] == 'a':
+            raise psycopg2.OperationalError("server closed the connection")
+        yield from ()
+
+    with patch.object(collector, '_iter_target', side_effect=iter_target):
+        collector.collect()
+
+    assert set(collector.failed_targets) == {'a'}
+    assert collector.state.load(collector._snapshot_key(collector.targets[0])) is None
+    assert collector.state.load(collector._snapshot_key(collector.targets[1])) == {'counters': {}}
+
+def test_bind_named_params():
+    """Test :name placeholders are bound while casts and literal % survive."""
+    query = "SELECT metadata::text FROM t WHERE ts >= :start_time AND name LIKE 'a%'"
+    assert bind_named_params(query) == (
+        "SELECT metadata::text FROM t WHERE ts >= %(start_time)s AND name LIKE 'a%%'"
+    )
+
+@pytest.fixture
+def query_config(test_config, tmp_path):
+    test_config['state'] = {'path': str(tmp_path)}
+    test_config['collectors']['postgres'].update({
+        'query_mode': 'query',
+        'metrics_query': "SELECT * FROM performance_metrics WHERE timestamp >= :start_time",
+        'incremental': {'initial_lookback_hours': 12, 'lag_seconds': 60, 'range_split_hours': 6}
+    })
+    return test_config
+
+def test_postgres_collector_incremental_query(query_config):
+    """Test metrics_query is bounded by :end_time and requires :start_time."""
+    collector = PostgresCollector(query_config)
+    assert collector.metrics_query == (
+        "SELECT * FROM (SELECT * FROM performance_metrics WHERE timestamp >= %(start_time)s) "
+        "bounded WHERE timestamp < %(end_time)s"
+    )
+
+    query_config['collectors']['postgres']['metrics_query'] = "SELECT * FROM performance_metrics"
+    with pytest.raises(ValueError):
+        PostgresCollector(query_config)
+
+def test_postgres_collector_plans_query_ranges(query_config):
+    """Test the first run backfills the lookback in sub-ranges ending at now - lag."""
+    collector = PostgresCollector(query_config)
+    now = datetime(2024, 1, 2, 0, 1, tzinfo=timezone.utc)
+    end = now - timedelta(seconds=60)
+
+    ranges = collector.plan_query_ranges(collector.targets[0], now)
+
+    assert ranges == [
+        {'start_time': end - timedelta(hours=12), 'end_time': end - timedelta(hours=6)},
+        {'start_time': end - timedelta(hours=6), 'end_time': end}
+    ]
+
+    collector.state.save('postgres.localhost:5432/test_db.start_time', (end - timedelta(hours=1)).isoformat())
+    assert len(collector.plan_query_ranges(collector.targets[0], now)) == 1
+
+@patch('psycopg2.connect')
+def test_postgres_collector_reads_ranges_in_parallel(mock_connect, query_config):
+    """Test each sub-range is read with its own parameters and the watermark advances."""
+    executed = []
+
+    def make_connection(**dsn):
+        cursor = MagicMock()
+        cursor.description = [('value',), ('timestamp',), ('metric_name',), ('metadata',)]
+        pending = []
+
+        def execute(query, params):
+            executed.append(params)
+            # A pooled connection may serve both ranges; each execute gets one row
+            pending[:] = [[(1.0, datetime(2024, 1, 1), 'latency', None)], []]
+
+        cursor.execute.side_effect = execute
+        cursor.fetchmany.side_effect = lambda size: pending.pop(0)
+        connection = MagicMock(closed=False)
+        connection.cursor.return_value.__enter__.return_value = cursor
+        return connection
+    mock_connect.side_effect = make_connection
+
+    collector = PostgresCollector(query_config)
+    result = collector.collect()
+
+    first, second = sorted(executed, key=lambda params: params['start_time'])
+    assert first['end_time'] == second['start_time']
+    assert result['value'].tolist() == [1.0, 1.0]
+    assert collector.load_watermark(collector.targets[0]) == second['end_time']
+
+@patch('psycopg2.connect')
+def test_postgres_collector_ranges_fit_connection_pool(mock_connect, query_config):
+    """Test more sub-ranges than pooled connections are read without exhausting the pool."""
+    query_config['collectors']['postgres']['max_workers'] = 8
+    query_config['collectors']['postgres']['incremental']['range_split_hours'] = 1
+    query_config['connections'] = {'postgres': {'min_connections': 1, 'max_connections': 2}}
+
+    def make_connection(**dsn):
+        cursor = MagicMock()
+        cursor.description = [('value',), ('timestamp',), ('metric_name',), ('metadata',)]
+        pending = []
+
+        def execute(query, params):
+            time.sleep(0.05)
+            pending[:] = [[(1.0, datetime(2024, 1, 1), 'latency', None)], []]
+
+        cursor.execute.side_effect = execute
+        cursor.fetchmany.side_effect = lambda size: pending.pop(0)
+        connection = MagicMock(closed=False)
+        connection.cursor.return_value.__enter__.return_value = cursor
+        return connection
+    mock_connect.side_effect = make_connection
+
+    collector = PostgresCollector(query_config)
+    result = collector.collect()
+
+    assert collector.max_workers == 2
+    assert collector.failed_targets == {}
+    assert len(result) == 12
+
+@patch('psycopg2.connect')
+def test_postgres_collector_failed_range_keeps_watermark(mock_connect, query_config):
+    """Test a failed sub-range leaves the watermark untouched."""
+    mock_connect.side_effect = psycopg2.OperationalError("could not connect")
+
+    collector = PostgresCollector(query_config)
+    with pytest.raises(psycopg2.OperationalError):
+        collector.collect()
 
-    # Verify cleanup
-    mock_cursor.close.assert_called_once()
-    mock_connection.close.assert_called_once()
+    assert collector.load_watermark(collector.targets[0]) is None
@@ -0,0 +1,181 @@
+import time
+import pytest
+from datetime import datetime
+import pandas as pd
+from src.collectors.base_collector import BaseCollector
+from src.collectors.runner import CollectorRunner
+from src.utils.health import CircuitOpenError
+
+class FakeCollector(BaseCollector):
+    """Collector yielding one row after a delay, optionally failing first."""
+
+    def __init__(self, config, delay=0.0, failures=0, error=None):
+        super().__init__(config)
+        self.delay = delay
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+
+    def collect_iter(self, chunk_rows=None, commit=None):
+        self.attempts += 1
+        time.sleep(self.delay)
+        if self.error is not None or self.attempts <= self.failures:
+            raise self.error or ConnectionError("source unavailable")
+        yield pd.DataFrame({'timestamp': [datetime(2024, 1, 1)], 'value': [1.0]})
+
+    def probe(self):
+        return self.error is None
+
+@pytest.fixture
+def runner_config(test_config):
+    test_config['collectors'].update({
+        'timeout_seconds': 1.0,
+        'retry_attempts': 3,
+        'retry_backoff_seconds': 0.01
+    })
+    return test_config
+
+def test_collector_runner_runs_concurrently(runner_config):
+    """Test total time is that of the slowest collector, not the sum."""
+    runner = CollectorRunner(runner_config, {
+        name: FakeCollector(runner_config, delay=0.3) for name in ('mongodb', 'newrelic', 'postgres')
+    })
+
+    started = time.monotonic()
+    results = runner.run()
+
+    assert time.monotonic() - started < 0.8
+    assert set(results) == {'mongodb', 'newrelic', 'postgres'}
+    assert runner.failed_collectors == {}
+
+def test_collector_runner_retries(runner_config):
+    """Test failed attempts are retried up to retry_attempts."""
+    flaky = FakeCollector(runner_config, failures=2)
+    broken = FakeCollector(runner_config, error=ValueError("bad data"))
+    runner = CollectorRunner(runner_config, {'flaky': flaky, 'broken': broken})
+
+    results = runner.run()
+
+    assert list(results) == ['flaky']
+    assert flaky.attempts == 3
+    assert broken.attempts == 3
+    assert runner.failed_collectors == {'broken': 'bad data'}
+
+def test_collector_runner_timeout_returns_partial_results(runner_config):
+    """Test a hung collector is abandoned after timeout_seconds."""
+    runner_config['collectors']['timeout_seconds'] = 0.3
+    runner = CollectorRunner(runner_config, {
+        'fast': FakeCollector(runner_config),
+        'hung': FakeCollector(runner_config, delay=2.0)
+    })
+
+    started = time.monotonic()
+    results = runner.run()
+
+    assert time.monotonic() - started < 1.0
+    assert list(results) == ['fast']
+    assert 'exceeded' in runner.failed_collectors['hung']
+
+class StagingCollector(FakeCollector):
+    """Collector whose stream keeps running after its last chunk, then stages a watermark."""
+
+    def collect_iter(self, chunk_rows=None, commit=None):
+        self.attempts += 1
+        yield pd.DataFrame({'timestamp': [datetime(2024, 1, 1)], 'value': [1.0]})
+        time.sleep(self.delay)
+        self.stage_state('staging.watermark', 'advanced')
+        if self.should_commit(commit):
+            self.commit_state()
+
+def test_collector_runner_commits_accepted_results(runner_config, tmp_path):
+    """Test staged state is committed once the runner accepts the result."""
+    runner_config['state'] = {'path': str(tmp_path)}
+    collector = StagingCollector(runner_config)
+    runner = CollectorRunner(runner_config, {'staging': collector})
+
+    assert list(runner.run()) == ['staging']
+    assert collector.state.load('staging.watermark') == 'advanced'
+
+def test_collector_runner_leaves_auto_commit_untouched(runner_config, tmp_path):
+    """Test a collector still commits on its own after being run by a runner."""
+    runner_config['state'] = {'path': str(tmp_path)}
+    collector = StagingCollector(runner_config)
+    CollectorRunner(runner_config, {'staging': collector}).run()
+    collector.state.save('staging.watermark', None)
+
+    assert collector.auto_commit is True
+    collector.collect()
+    assert collector.state.load('staging.watermark') == 'advanced'
+
+def test_collector_runner_timeout_leaves_state_uncommitted(runner_config, tmp_path):
+    """Test a collector finishing its stream past the budget never commits its state."""
+    runner_config['state'] = {'path': str(tmp_path)}
+    runner_config['collectors']['timeout_seconds'] = 0.2
+    slow = StagingCollector(runner_config, delay=0.5)
+    runner = CollectorRunner(runner_config, {'fast': FakeCollector(runner_config), 'slow': slow})
+
+    results = runner.run()
+    time.sleep(0.6)
+
+    assert list(results) == ['fast']
+    assert 'exceeded' in runner.failed_collectors['slow']
+    slow.commit_state()
+    assert slow.state.load('staging.watermark') is None
+
+class SocketTimeoutCollector(FakeCollector):
+    """Collector whose first attempt fails with the source's own TimeoutError."""
+
+    def collect_iter(self, chunk_rows=None, commit=None):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise TimeoutError("socket timed out")
+        yield pd.DataFrame({'timestamp': [datetime(2024, 1, 1)], 'value': [1.0]})
+
+def test_collector_runner_retries_source_timeouts(runner_config):
+    """Test a TimeoutError raised by the source is retried like any other error."""
+    collector = SocketTimeoutCollector(runner_config)
+    runner = CollectorRunner(runner_config, {'flaky': collector})
+
+    assert list(runner.run()) == ['flaky']
+    assert collector.attempts == 2
+    assert runner.failed_collectors == {}
+
+def test_collector_runner_raises_when_all_fail(runner_config):
+    runner_config['collectors']['retry_attempts'] = 1
+    runner = CollectorRunner(runner_config, {'broken': FakeCollector(runner_config, error=ValueError("down"))})
+
+    with pytest.raises(ValueError, match="down"):
+        runner.run()
+
+def test_collector_runner_health_check(runner_config):
+    runner = CollectorRunner(runner_config, {
+        'up': FakeCollector(runner_config),
+        'down': FakeCollector(runner_config, error=ValueError("down"))
+    })
+    assert runner.health_check() == {'up': True, 'down': False}
+
+def test_collector_runner_skips_open_circuit(runner_config):
+    """Test a collector that keeps failing is skipped without being run."""
+    runner_config['health'] = {'failure_threshold': 2, 'reset_timeout_seconds': 60}
+    runner_config['collectors']['retry_attempts'] = 1
+    broken = FakeCollector(runner_config, error=ConnectionError("down"))
+    runner = CollectorRunner(runner_config, {'broken': broken, 'ok': FakeCollector(runner_config)})
+
+    for _ in range(2):
+        runner.run()
+    assert broken.attempts == 2
+
+    results = runner.run()
+    assert broken.attempts == 2
+    assert set(results) == {'ok'}
+    assert 'circuit open' in runner.failed_collectors['broken']
+
+def test_collector_runner_all_circuits_open(runner_config):
+    runner_config['health'] = {'failure_threshold': 1, 'reset_timeout_seconds': 60}
+    runner_config['collectors']['retry_attempts'] = 1
+    runner = CollectorRunner(runner_config, {'broken': FakeCollector(runner_config, error=ValueError("down"))})
+
+    with pytest.raises(ValueError):
+        runner.run()
+    with pytest.raises(CircuitOpenError):
+        runner.run()
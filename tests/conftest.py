@@ -2,6 +2,22 @@ import pytest
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, Any
+from src.utils.connection_registry import ConnectionRegistry
+from src.utils.health import HealthRegistry
+
+@pytest.fixture(autouse=True)
+def reset_connection_registry():
+    """Give every test a fresh process-wide connection registry."""
+    ConnectionRegistry.reset_instance()
+    yield
+    ConnectionRegistry.reset_instance()
+
+@pytest.fixture(autouse=True)
+def reset_health_registry():
+    """Give every test fresh health results and circuit breakers."""
+    HealthRegistry.reset_instance()
+    yield
+    HealthRegistry.reset_instance()
 
 @pytest.fixture
 def test_config() -> Dict[str, Any]:
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.processors.aggregates import (
+    WindowStateStore,
+    finalize_partials,
+    merge_partials,
+    partial_aggregates,
+    resolve_rollups
+)
+from src.utils.state_store import StateStore
+
+def _rows(timestamps, values, metric='latency'):
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps),
+        'metric_name': [metric] * len(values),
+        'source': ['mongodb'] * len(values),
+        'dimension_id': [7] * len(values),
+        'value': values
+    })
+
+def test_partial_aggregates_skip_missing_values():
+    partials = partial_aggregates(_rows(['2024-01-01 00:10', '2024-01-01 00:20', '2024-01-01 00:30'], [1.0, 3.0, np.nan]), '1h')
+
+    assert len(partials) == 1
+    row = partials.iloc[0]
+    assert (row['value_sum'], row['value_count'], row['value_min'], row['value_max'], row['value_sumsq']) == (4.0, 2, 1.0, 3.0, 10.0)
+
+def test_merged_partials_match_single_pass():
+    rows = _rows(
+        ['2024-01-01 00:05', '2024-01-01 00:15', '2024-01-01 01:05', '2024-01-01 00:45'],
+        [2.0, 4.0, 10.0, 6.0]
+    )
+    split = pd.concat([partial_aggregates(rows.iloc[:2], '1h'), partial_aggregates(rows.iloc[2:], '1h')])
+
+    merged = merge_partials(split)
+
+    pd.testing.assert_frame_equal(merged, partial_aggregates(rows, '1h'))
+
+def test_finalize_partials_mean_and_empty_window():
+    partials = partial_aggregates(_rows(['2024-01-01 00:00', '2024-01-01 01:00'], [5.0, np.nan]), '1h')
+
+    result = finalize_partials(partials)
+
+    assert result['value'].iloc[0] == 5.0
+    assert np.isnan(result['value'].iloc[1])
+    assert result['value_count'].tolist() == [1, 0]
+
+@pytest.fixture
+def window_state(tmp_path):
+    return WindowStateStore(StateStore({'state': {'path': str(tmp_path)}}))
+
+def test_window_state_fold_merges_late_data(window_state):
+    window_state.fold(partial_aggregates(_rows(['2024-01-01 00:10', '2024-01-02 00:10'], [1.0, 5.0]), '1h'))
+
+    updated = window_state.fold(partial_aggregates(_rows(['2024-01-01 00:50'], [3.0]), '1h'))
+
+    # Only the touched window is emitted, with statistics over both runs
+    assert len(updated) == 1
+    assert updated['value_count'].tolist() == [2]
+    assert updated['value_sum'].tolist() == [4.0]
+    assert updated['value_sumsq'].tolist() == [10.0]
+    assert len(window_state.load(pd.Timestamp('2024-01-02'))) == 1
+
+def test_window_state_fold_only_touches_delta_days(window_state, tmp_path):
+    window_state.fold(partial_aggregates(_rows(['2024-01-01 00:10', '2024-01-02 00:10'], [1.0, 5.0]), '1h'))
+    window_state.commit()
+    day_one = tmp_path / 'unified.windows.2024-01-01.parquet'
+    before = day_one.stat().st_mtime_ns
+
+    window_state.fold(partial_aggregates(_rows(['2024-01-02 03:00'], [2.0]), '1h'))
+    window_state.commit()
+
+    assert day_one.stat().st_mtime_ns == before
+    assert len(window_state.load(pd.Timestamp('2024-01-02'))) == 2
+
+def test_window_state_fold_is_staged_until_commit(window_state, tmp_path):
+    """Test a discarded fold can be redone without counting its rows twice."""
+    partials = partial_aggregates(_rows(['2024-01-01 00:10'], [1.0]), '1h')
+
+    window_state.fold(partials)
+    assert list(tmp_path.iterdir()) == []
+    window_state.discard()
+
+    assert window_state.fold(partials)['value_count'].tolist() == [1]
+    window_state.commit()
+    assert (tmp_path / 'unified.windows.2024-01-01.parquet').exists()
+    assert window_state.load(pd.Timestamp('2024-01-01'))['value_count'].tolist() == [1]
+
+def test_window_state_clear(window_state):
+    window_state.fold(partial_aggregates(_rows(['2024-01-01 00:10'], [1.0]), '1h'))
+    window_state.clear([pd.Timestamp('2024-01-01')])
+    assert window_state.load(pd.Timestamp('2024-01-01')).empty
+
+def test_resolve_rollups_orders_finest_first():
+    assert list(resolve_rollups({'1d': '1D', '1m': '1min', '1h': 'h'})) == ['1m', '1h', '1d']
+
+@pytest.mark.parametrize("rollups", [
+    {'1w': '1W'},
+    {'7m': '7min'},
+    {'2m': '2min', '3m': '3min'},
+    {'month': 'MS'}
+])
+def test_resolve_rollups_rejects_windows_that_do_not_nest(rollups):
+    with pytest.raises(ValueError):
+        resolve_rollups(rollups)
+
+def test_rollup_by_merging_partials_matches_raw_aggregation():
+    rows = _rows(
+        ['2024-01-01 00:00:10', '2024-01-01 00:00:50', '2024-01-01 00:59:00', '2024-01-01 05:30:00'],
+        [1.0, 2.0, 3.0, 4.0]
+    )
+    minutes = partial_aggregates(rows, '1min')
+
+    pd.testing.assert_frame_equal(merge_partials(minutes, '1h'), partial_aggregates(rows, '1h'))
+    pd.testing.assert_frame_equal(merge_partials(minutes, '1D'), partial_aggregates(rows, '1D'))
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from src.processors.dimensions import DimensionInterner, canonicalize, dimension_id
+
+def test_canonicalize_is_order_and_form_independent():
+    expected = (('host', 'a'), ('port', '5432'))
+
+    assert canonicalize({'port': 5432, 'host': 'a'}) == expected
+    assert canonicalize('{"host": "a", "port": 5432}') == expected
+    assert canonicalize([('port', '5432'), ('host', 'a')]) == expected
+    assert canonicalize(None) == canonicalize(float('nan')) == canonicalize({}) == ()
+
+def test_dimension_id_is_stable():
+    # Stable across processes: never derived from Python's randomized hash()
+    assert dimension_id((('host', 'a'),)) == dimension_id((('host', 'a'),))
+    assert dimension_id((('host', 'a'),)) != dimension_id((('host', 'b'),))
+    assert -2 ** 63 <= dimension_id(()) < 2 ** 63
+
+def test_encode_interns_equal_sets():
+    interner = DimensionInterner()
+    shared = {'service': 'api'}
+
+    ids = interner.encode([shared, {'service': 'api'}, '{"service": "api"}', None, shared, {'list': [1, 2]}])
+
+    assert ids.dtype == np.int64
+    assert len(set(ids[:3].tolist())) == 1
+    assert ids[0] == ids[4] and ids[3] != ids[0]
+    assert len(interner) == 3
+
+def test_decode_shares_dicts():
+    interner = DimensionInterner()
+    ids = interner.encode([{'service': 'api'}, {'service': 'api'}, {'list': [1, 2]}])
+
+    decoded = interner.decode(ids)
+
+    assert decoded[0] == {'service': 'api'}
+    assert decoded[0] is decoded[1]
+    assert decoded[2] == {'list': '[1, 2]'}
+
+def test_decode_unknown_id():
+    with pytest.raises(KeyError):
+        DimensionInterner().decode([1])
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from src.processors.normalization import CategoryRegistry, MetricNormalizer
+
+def test_category_registry_encode_applies_mapping_and_keeps_missing():
+    registry = CategoryRegistry()
+    encoded = registry.encode(pd.Series(['a', None, 'b', 'a']), {'a': 'alpha'})
+
+    assert isinstance(encoded.dtype, pd.CategoricalDtype)
+    assert registry.categories == ['alpha', 'b']
+    assert encoded.cat.codes.tolist() == [0, -1, 1, 0]
+
+def test_category_registry_merges_renamed_values():
+    registry = CategoryRegistry()
+    encoded = registry.encode(pd.Series(['duration', 'latency']), {'duration': 'latency'})
+
+    assert registry.categories == ['latency']
+    assert encoded.tolist() == ['latency', 'latency']
+
+def test_category_registry_codes_are_stable_across_batches():
+    registry = CategoryRegistry()
+    first = registry.encode(pd.Series(['x', 'y']))
+    second = registry.encode(pd.Series(['z', 'x']))
+
+    assert first.cat.codes.tolist() == [0, 1]
+    assert second.cat.codes.tolist() == [2, 0]
+    aligned = registry.align(first)
+    assert aligned.dtype == second.dtype
+    assert aligned.tolist() == ['x', 'y']
+
+def test_metric_normalizer_maps_per_source():
+    normalizer = MetricNormalizer({
+        'mongodb': {'response_time_ms': 'latency'},
+        'newrelic': {'duration': 'latency'}
+    })
+    mongo = normalizer.normalize(pd.DataFrame({'metric_name': ['response_time_ms', 'duration']}), 'mongodb')
+    newrelic = normalizer.normalize(pd.DataFrame({'metric_name': ['duration']}), 'newrelic')
+
+    # Mappings only apply to their own source
+    assert mongo['metric_name'].tolist() == ['latency', 'duration']
+    assert newrelic['metric_name'].tolist() == ['latency']
+
+    combined = pd.concat(normalizer.align([mongo, newrelic]), ignore_index=True)
+    assert isinstance(combined['metric_name'].dtype, pd.CategoricalDtype)
+    assert isinstance(combined['source'].dtype, pd.CategoricalDtype)
+    assert combined['source'].tolist() == ['mongodb', 'mongodb', 'newrelic']
+
+def test_metric_normalizer_accepts_categorical_input():
+    normalizer = MetricNormalizer({'newrelic': {'duration': 'latency'}})
+    df = pd.DataFrame({'metric_name': pd.Categorical(['duration', 'errors', 'duration'])})
+
+    result = normalizer.normalize(df, 'newrelic')
+
+    assert result['metric_name'].tolist() == ['latency', 'errors', 'latency']
+    assert np.array_equal(result['metric_name'].cat.codes.to_numpy(), [0, 1, 0])
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.processors.outliers import OutlierEngine, register_outlier_method, OUTLIER_METHODS
+
+@pytest.fixture
+def series_frame():
+    values = [10.0, 11.0, 9.0, 10.0, 10.5, 9.5, 10.0, 11.0, 9.0, 10.0, 10.0, 500.0]
+    return pd.DataFrame({
+        'metric_name': ['latency'] * 12 + ['errors'] * 12,
+        'source': ['api'] * 24,
+        'value': values + values
+    })
+
+def _apply_outliers(df, threshold):
+    def detect(group):
+        return np.abs((group['value'] - group['value'].mean()) / group['value'].std()) > threshold
+    grouped = df.groupby(['metric_name', 'source'])
+    return grouped.apply(detect).reset_index(level=[0, 1], drop=True).reindex(df.index)
+
+def test_zscore_matches_groupby_apply():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'metric_name': rng.choice(['a', 'b', 'c'], 600),
+        'source': rng.choice(['x', 'y'], 600),
+        'value': rng.normal(0, 1, 600)
+    })
+    df.loc[[5, 50, 500], 'value'] = 25.0
+
+    mask = OutlierEngine({'outlier_threshold': 3.0}).detect(df)
+
+    assert mask.equals(_apply_outliers(df, 3.0).astype(bool))
+    assert mask[[5, 50, 500]].all()
+
+@pytest.mark.parametrize('method', ['zscore', 'mad', 'iqr'])
+def test_methods_flag_spike(series_frame, method):
+    mask = OutlierEngine({'outliers': {'method': method}}).detect(series_frame)
+
+    assert mask.tolist() == ([False] * 11 + [True]) * 2
+
+def test_mad_ignores_constant_series():
+    df = pd.DataFrame({'metric_name': ['a'] * 4, 'source': ['x'] * 4, 'value': [1.0, 1.0, 1.0, 2.0]})
+
+    assert not OutlierEngine({'outliers': {'method': 'mad'}}).detect(df).any()
+
+def test_per_metric_methods(series_frame):
+    # An impossible zscore threshold for latency, the MAD default for errors
+    engine = OutlierEngine({'outliers': {
+        'method': 'zscore', 'threshold': 100.0, 'metrics': {'errors': {'method': 'mad'}}
+    }})
+
+    mask = engine.detect(series_frame)
+
+    assert not mask[series_frame['metric_name'] == 'latency'].any()
+    assert mask[series_frame['metric_name'] == 'errors'].tolist() == [False] * 11 + [True]
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        OutlierEngine({'outliers': {'method': 'isolation_forest'}})
+
+def test_registered_method_is_selectable(series_frame, monkeypatch):
+    # Registered through monkeypatch so the entry is removed afterwards
+    monkeypatch.setitem(OUTLIER_METHODS, 'above', OUTLIER_METHODS['zscore'])
+    register_outlier_method('above', lambda values, codes, threshold: values > threshold, 100.0)
+
+    mask = OutlierEngine({'outliers': {'method': 'above'}}).detect(series_frame)
+
+    assert mask.sum() == 2
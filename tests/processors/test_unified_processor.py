@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 from src.processors.unified_processor import UnifiedProcessor
+from src.utils.arrow_utils import build_record_batch
 
 def test_unified_processor_init(test_config):
     processor = UnifiedProcessor(test_config)
@@ -37,3 +38,227 @@ def test_unified_processor_edge_cases(test_config, input_data, expected_metrics)
     processor = UnifiedProcessor(test_config)
     result = processor.process(input_data)
     assert len(result) == expected_metrics
+
+def test_unified_processor_passes_through_preaggregated(test_config):
+    processor = UnifiedProcessor(test_config)
+    preaggregated = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01 00:00', '2024-01-01 01:00']),
+        'metric_name': ['latency', 'latency'],
+        'source': ['mongodb', 'mongodb'],
+        'dimensions': [None, None],
+        'value': [100.0, 120.0],
+        'value_min': [90.0, 110.0],
+        'value_max': [110.0, 130.0],
+        'value_count': [10, 12]
+    })
+
+    result = processor.process({'mongodb_pushdown': preaggregated})
+
+    assert len(result) == 2
+    assert result['source'].tolist() == ['mongodb_pushdown'] * 2
+    assert result['value_count'].tolist() == [10, 12]
+
+@pytest.fixture
+def hourly_config(test_config):
+    test_config['processors']['unified'] = {'aggregation_window': '1h'}
+    return test_config
+
+def test_unified_processor_dedupes_dict_dimensions(hourly_config):
+    """Test duplicate rows with dict dimensions are dropped and grouped by dimension set."""
+    processor = UnifiedProcessor(hourly_config)
+    raw = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01 00:00', '2024-01-01 00:00', '2024-01-01 00:10', '2024-01-01 00:10']),
+        'metric_id': ['latency'] * 4,
+        'value': [10.0, 10.0, 20.0, 30.0],
+        'metadata': [{'host': 'a'}, {'host': 'a'}, {'host': 'a'}, {'host': 'b', 'port': 1}]
+    })
+
+    result = processor.process({'mongodb': raw}).sort_values('value_count', ascending=False)
+
+    assert result['dimensions'].tolist() == [{'host': 'a'}, {'host': 'b', 'port': '1'}]
+    assert result['value_count'].tolist() == [2, 1]
+    assert result['value'].tolist() == [15.0, 30.0]
+
+def test_unified_processor_accepts_arrow(hourly_config):
+    processor = UnifiedProcessor(hourly_config)
+    batch = build_record_batch(
+        pd.to_datetime(['2024-01-01 00:00', '2024-01-01 00:30']), ['cpu', 'cpu'], [1.0, 3.0],
+        [{'host': 'a'}, {'host': 'a'}]
+    )
+
+    result = processor.process({'postgres': batch})
+
+    assert len(result) == 1
+    assert result['value'].iloc[0] == 2.0
+    assert result['dimensions'].iloc[0] == {'host': 'a'}
+
+def test_unified_processor_applies_metric_mappings(hourly_config):
+    """Test per-source metric mappings unify names and output is categorical."""
+    processor = UnifiedProcessor(hourly_config)
+    timestamps = pd.to_datetime(['2024-01-01 00:00', '2024-01-01 00:30'])
+    mongodb = pd.DataFrame({
+        'timestamp': timestamps,
+        'metric_id': ['response_time_ms', 'error_count'],
+        'value': [100.0, 1.0]
+    })
+    newrelic = pd.DataFrame({
+        'timestamp': timestamps,
+        'name': ['duration', 'duration'],
+        'value': [200.0, 300.0]
+    })
+
+    result = processor.process({'mongodb': mongodb, 'newrelic': newrelic})
+
+    assert isinstance(result['metric_name'].dtype, pd.CategoricalDtype)
+    assert isinstance(result['source'].dtype, pd.CategoricalDtype)
+    rows = {(row.source, row.metric_name): row.value for row in result.itertuples()}
+    assert rows == {
+        ('mongodb', 'latency'): 100.0,
+        ('mongodb', 'errors'): 1.0,
+        ('newrelic', 'latency'): 250.0
+    }
+
+def test_unified_processor_folds_later_runs_into_window_state(hourly_config, tmp_path):
+    """Test data arriving in a later run updates its window instead of adding a row."""
+    hourly_config['state'] = {'path': str(tmp_path)}
+    hourly_config['processors']['unified']['window_state'] = {'enabled': True}
+
+    def run(timestamps, values):
+        processor = UnifiedProcessor(hourly_config)
+        result = processor.process({'mongodb': pd.DataFrame({
+            'timestamp': pd.to_datetime(timestamps),
+            'metric_id': ['response_time_ms'] * len(values),
+            'value': values,
+            'metadata': [{'host': 'a'}] * len(values)
+        })})
+        processor.commit_state()
+        return result
+
+    run(['2024-01-01 00:10', '2024-01-01 01:10'], [10.0, 50.0])
+    result = run(['2024-01-01 00:40'], [20.0])
+
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row['timestamp'] == pd.Timestamp('2024-01-01 00:00')
+    assert row['metric_name'] == 'latency'
+    assert row['dimensions'] == {'host': 'a'}
+    assert (row['value'], row['value_min'], row['value_max'], row['value_count']) == (15.0, 10.0, 20.0, 2)
+    assert isinstance(result['metric_name'].dtype, pd.CategoricalDtype)
+
+def test_unified_processor_uncommitted_batch_is_not_counted_twice(hourly_config, tmp_path):
+    """Test reprocessing a batch whose output was never stored does not double its counts."""
+    hourly_config['state'] = {'path': str(tmp_path)}
+    hourly_config['processors']['unified']['window_state'] = {'enabled': True}
+    processor = UnifiedProcessor(hourly_config)
+    batch = {'mongodb': _latency_rows(['2024-01-01 00:10', '2024-01-01 00:20'], [1.0, 3.0])}
+
+    processor.process(batch)
+    # The processed write failed; the batch is rerun
+    processor.discard_state()
+    result = processor.process(batch)
+    processor.commit_state()
+
+    assert result['value_count'].tolist() == [2]
+    assert UnifiedProcessor(hourly_config).window_state.load(pd.Timestamp('2024-01-01'))['value_count'].tolist() == [2]
+
+def test_unified_processor_window_state_requires_day_aligned_window(hourly_config, tmp_path):
+    hourly_config['state'] = {'path': str(tmp_path)}
+    hourly_config['processors']['unified'].update({'aggregation_window': '7h', 'window_state': {'enabled': True}})
+
+    with pytest.raises(ValueError, match="evenly divide one day"):
+        UnifiedProcessor(hourly_config)
+
+def test_unified_processor_health_check_leaves_window_state(hourly_config, tmp_path):
+    """Test the health check does not fold its test row into persisted window state."""
+    hourly_config['state'] = {'path': str(tmp_path)}
+    hourly_config['processors']['unified']['window_state'] = {'enabled': True}
+    processor = UnifiedProcessor(hourly_config)
+
+    assert processor.health_check()
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.fixture
+def rollup_config(hourly_config):
+    hourly_config['processors']['unified']['rollups'] = {
+        '1d': {'window': '1D', 'partition': 'month'},
+        '1m': {'window': '1min'},
+        '1h': {'window': '1h'}
+    }
+    return hourly_config
+
+def _latency_rows(timestamps, values):
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps),
+        'metric_id': ['latency'] * len(values),
+        'value': values,
+        'metadata': [{'host': 'a'}] * len(values)
+    })
+
+def test_unified_processor_rollups_match_single_resolution_runs(rollup_config):
+    """Test every rollup resolution equals aggregating the raw rows at that window."""
+    raw = _latency_rows(
+        ['2024-01-01 00:00:10', '2024-01-01 00:00:40', '2024-01-01 00:30:00', '2024-01-01 02:00:00'],
+        [1.0, 3.0, 5.0, 7.0]
+    )
+
+    rollups = UnifiedProcessor(rollup_config).process_rollups({'mongodb': raw})
+
+    assert list(rollups) == ['1m', '1h', '1d']
+    for label, window in [('1m', '1min'), ('1h', '1h'), ('1d', '1D')]:
+        rollup_config['processors']['unified']['aggregation_window'] = window
+        expected = UnifiedProcessor(rollup_config).process({'mongodb': raw})
+        pd.testing.assert_frame_equal(
+            rollups[label].astype({'metric_name': str, 'source': str}),
+            expected.astype({'metric_name': str, 'source': str})
+        )
+    assert rollups['1d']['value_count'].tolist() == [4]
+
+def test_unified_processor_rollups_scan_raw_rows_once(rollup_config, monkeypatch):
+    """Test only the finest resolution is aggregated from raw rows."""
+    from src.processors import unified_processor
+    windows = []
+    original = unified_processor.partial_aggregates
+
+    def spy(df, window):
+        windows.append(window)
+        return original(df, window)
+
+    monkeypatch.setattr(unified_processor, 'partial_aggregates', spy)
+    UnifiedProcessor(rollup_config).process_rollups({'mongodb': _latency_rows(['2024-01-01 00:00'], [1.0])})
+
+    assert windows == ['1min']
+
+def test_unified_processor_rollups_fold_into_per_resolution_state(rollup_config, tmp_path):
+    """Test late data updates the windows of every resolution."""
+    rollup_config['state'] = {'path': str(tmp_path)}
+    rollup_config['processors']['unified']['window_state'] = {'enabled': True}
+
+    processor = UnifiedProcessor(rollup_config)
+    processor.process_rollups({'mongodb': _latency_rows(['2024-01-01 00:00', '2024-01-01 03:00'], [1.0, 9.0])})
+    processor.commit_state()
+    rollups = UnifiedProcessor(rollup_config).process_rollups({'mongodb': _latency_rows(['2024-01-01 00:10'], [3.0])})
+
+    assert rollups['1m']['value_count'].tolist() == [1]
+    assert rollups['1h']['value'].tolist() == [2.0]
+    assert rollups['1d']['value_count'].tolist() == [3]
+    assert rollups['1d']['value_max'].tolist() == [9.0]
+
+def test_unified_processor_rollups_route_preaggregated_to_matching_window(rollup_config):
+    preaggregated = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01 00:00']),
+        'metric_name': ['latency'],
+        'dimensions': [None],
+        'value': [100.0],
+        'value_min': [90.0],
+        'value_max': [110.0],
+        'value_count': [10]
+    })
+
+    rollups = UnifiedProcessor(rollup_config).process_rollups({'mongodb': preaggregated})
+
+    assert len(rollups['1h']) == 1
+    assert rollups['1m'].empty and rollups['1d'].empty
+
+def test_unified_processor_process_rollups_requires_config(hourly_config):
+    with pytest.raises(ValueError):
+        UnifiedProcessor(hourly_config).process_rollups({'mongodb': _latency_rows(['2024-01-01 00:00'], [1.0])})
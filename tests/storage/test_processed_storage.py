@@ -133,3 +133,62 @@ def test_processed_storage_compression(mock_load_catalog, test_config, sample_pr
     call_args = mock_catalog.load_table.return_value.append.call_args
     assert 'compression' in call_args.kwargs
     assert call_args.kwargs['compression'] == 'zstd'
+
+@patch('src.utils.iceberg_utils.load_catalog')
+def test_processed_storage_store_rollups_uses_table_per_resolution(mock_load_catalog, test_config):
+    """Test each rollup resolution is written to its own table with its partitioning."""
+    test_config['processors']['unified'] = {'rollups': {'1h': {'window': '1h'}, '1d': {'window': '1D', 'partition': 'month'}}}
+    storage = ProcessedStorage(test_config)
+    storage.get_schema = Mock()
+    storage.iceberg.load_table = Mock(side_effect=Exception("missing"))
+    storage.iceberg.create_time_partitioned_table = Mock(return_value=Mock())
+    storage.iceberg.write_dataframe = Mock(return_value=True)
+
+    data = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01']),
+        'metric_name': ['latency'],
+        'value': [1.0],
+        'source': ['mongodb'],
+        'dimensions': [{'service': 'api'}]
+    })
+
+    results = storage.store_rollups({'1h': data, '1d': data})
+
+    assert results == {'1h': True, '1d': True}
+    created = {
+        call.kwargs['table_name']: call.kwargs['granularity']
+        for call in storage.iceberg.create_time_partitioned_table.call_args_list
+    }
+    assert created == {'processed.metrics_1h_v1': 'day', 'processed.metrics_1d_v1': 'month'}
+
+@patch('src.utils.iceberg_utils.load_catalog')
+def test_processed_storage_store_overwrites_touched_windows(mock_load_catalog, test_config):
+    """Test re-emitted windows replace their stored rows and other dimension sets are kept."""
+    storage = ProcessedStorage(test_config)
+    storage.iceberg.load_table = Mock(return_value=Mock())
+    storage.iceberg.write_dataframe = Mock(return_value=True)
+    storage.iceberg.read_table = Mock(return_value=pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01', '2024-01-01']),
+        'metric_name': ['latency', 'latency'],
+        'value': [1.0, 5.0],
+        'source': ['mongodb', 'mongodb'],
+        'dimensions': [[('service', 'api')], [('service', 'web')]]
+    }))
+
+    data = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01']),
+        'metric_name': ['latency'],
+        'value': [2.0],
+        'source': ['mongodb'],
+        'dimensions': [{'service': 'api'}]
+    })
+
+    assert storage.store(data) is True
+
+    _, written, overwrite, window_filter = storage.iceberg.write_dataframe.call_args.args
+    assert overwrite is True
+    assert storage.iceberg.read_table.call_args.kwargs['filters'] == [window_filter]
+    assert 'latency' in repr(window_filter) and '1704067200000000' in repr(window_filter)
+    assert sorted(zip(written['dimensions'].map(lambda d: d['service']), written['value'])) == [
+        ('api', 2.0), ('web', 5.0)
+    ]
@@ -127,3 +127,16 @@ def test_raw_storage_compression(mock_load_catalog, test_config, sample_raw_data
     call_args = mock_catalog.load_table.return_value.append.call_args
     assert 'compression' in call_args.kwargs
     assert call_args.kwargs['compression'] == 'snappy'
+
+@patch('src.utils.iceberg_utils.load_catalog')
+def test_raw_storage_health_check_is_read_only(mock_load_catalog, test_config, mock_catalog):
+    """Test health checks list namespaces instead of writing, and are cached."""
+    mock_load_catalog.return_value = mock_catalog
+
+    storage = RawStorage(test_config)
+    assert storage.health_check() is True
+    assert storage.health_check() is True
+
+    mock_catalog.list_namespaces.assert_called_once()
+    mock_catalog.create_table.assert_not_called()
+    mock_catalog.load_table.assert_not_called()
@@ -0,0 +1,53 @@
+from datetime import datetime
+import pandas as pd
+import pyarrow as pa
+from src.utils.arrow_utils import (
+    RAW_METRIC_SCHEMA,
+    arrow_to_frame,
+    build_record_batch,
+    frame_to_record_batch,
+    to_map_array
+)
+
+def test_to_map_array_accepts_dicts_json_and_missing():
+    shared = {'service': 'api'}
+    result = to_map_array([shared, '{"code": 500}', None, shared], extra={'target': 'db1'})
+
+    assert result.to_pylist() == [
+        [('service', 'api'), ('target', 'db1')],
+        [('code', '500'), ('target', 'db1')],
+        [('target', 'db1')],
+        [('service', 'api'), ('target', 'db1')]
+    ]
+
+def test_frame_to_record_batch_normalizes_types():
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-01T02:00:00+02:00', '2024-01-01T01:00:00+00:00'], utc=True),
+        'metric_id': ['latency', 'latency'],
+        'value': [1, 2],
+        'metadata': [{'host': 'a'}, None]
+    })
+
+    batch = frame_to_record_batch(df, metric_column='metric_id')
+
+    assert batch.schema.equals(RAW_METRIC_SCHEMA)
+    assert batch.column('timestamp').to_pylist() == [datetime(2024, 1, 1), datetime(2024, 1, 1, 1)]
+    assert batch.column('metric_name').dictionary.to_pylist() == ['latency']
+    assert batch.column('value').to_pylist() == [1.0, 2.0]
+
+def test_build_record_batch_keeps_map_arrays():
+    maps = to_map_array([{'host': 'a'}])
+    batch = build_record_batch(
+        pa.array([datetime(2024, 1, 1)], pa.timestamp('ms')), ['cpu'], [0.5], maps
+    )
+
+    assert batch.schema.equals(RAW_METRIC_SCHEMA)
+    assert batch.column('metadata').to_pylist() == [[('host', 'a')]]
+
+def test_arrow_to_frame_decodes_maps_and_dictionaries():
+    batch = build_record_batch([datetime(2024, 1, 1)], ['cpu'], [0.5], [{'host': 'a'}])
+
+    df = arrow_to_frame(batch)
+
+    assert isinstance(df['metric_name'].dtype, pd.CategoricalDtype)
+    assert df['metadata'].tolist() == [{'host': 'a'}]
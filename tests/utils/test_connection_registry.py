@@ -0,0 +1,157 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+import psycopg2
+from psycopg2.pool import PoolError
+from src.utils.connection_registry import ConnectionRegistry
+
+DSN = {'host': 'localhost', 'port': 5432, 'database': 'test_db', 'user': 'u', 'password': 'p'}
+
+@pytest.fixture
+def registry():
+    registry = ConnectionRegistry({'connections': {'idle_timeout_seconds': 60}})
+    yield registry
+    registry.close_all()
+
+@patch('pymongo.MongoClient')
+def test_mongo_client_shared_per_uri(mock_client, registry):
+    first = registry.get_mongo_client('mongodb://a')
+    second = registry.get_mongo_client('mongodb://a')
+    other = registry.get_mongo_client('mongodb://a', readPreference='secondaryPreferred')
+
+    assert first is second
+    assert mock_client.call_count == 2
+    assert other is mock_client.return_value
+
+@patch('psycopg2.connect')
+def test_postgres_connections_are_reused(mock_connect, registry):
+    mock_connect.return_value = MagicMock(closed=False)
+
+    with registry.postgres_connection(**DSN) as first:
+        pass
+    with registry.postgres_connection(**DSN) as second:
+        pass
+
+    assert first is second
+    mock_connect.assert_called_once_with(**DSN)
+
+@patch('psycopg2.connect')
+def test_postgres_broken_connection_is_discarded(mock_connect, registry):
+    broken, fresh = MagicMock(closed=False), MagicMock(closed=False)
+    mock_connect.side_effect = [broken, fresh]
+
+    with pytest.raises(psycopg2.OperationalError):
+        with registry.postgres_connection(**DSN):
+            raise psycopg2.OperationalError("server closed the connection")
+
+    broken.close.assert_called_once()
+    with registry.postgres_connection(**DSN) as conn:
+        assert conn is fresh
+
+@patch('psycopg2.connect')
+def test_idle_postgres_pools_are_evicted(mock_connect, registry):
+    mock_connect.return_value = MagicMock(closed=False)
+    registry.idle_timeout = 0
+    with registry.postgres_connection(**DSN):
+        pass
+    registry.evict_idle()
+
+    mock_connect.return_value.close.assert_called_once()
+
+@patch('psycopg2.connect')
+@patch('pymongo.MongoClient')
+def test_held_mongo_client_survives_idle_eviction(mock_client, mock_connect, registry):
+    """Test a client held by a long tail is not closed by another collector's call."""
+    mock_connect.return_value = MagicMock(closed=False)
+    registry.idle_timeout = 0
+    client = registry.get_mongo_client('mongodb://a')
+
+    with registry.postgres_connection(**DSN):
+        pass
+    registry.evict_idle()
+
+    client.close.assert_not_called()
+    assert registry.get_mongo_client('mongodb://a') is client
+
+@patch('pymongo.MongoClient')
+def test_close_all(mock_client, registry):
+    registry.get_mongo_client('mongodb://a')
+    registry.close_all()
+
+    mock_client.return_value.close.assert_called_once()
+
+@patch('psycopg2.connect')
+def test_slow_pool_creation_does_not_block_other_targets(mock_connect, registry):
+    """Test a dead host's connect does not hold the registry lock for other DSNs."""
+    dead = dict(DSN, host='dead')
+    connecting, release = threading.Event(), threading.Event()
+
+    def connect(**dsn):
+        if dsn['host'] == 'dead':
+            connecting.set()
+            release.wait(5)
+            raise psycopg2.OperationalError("timeout expired")
+        return MagicMock(closed=False)
+
+    mock_connect.side_effect = connect
+
+    def borrow_dead():
+        with pytest.raises(psycopg2.OperationalError):
+            with registry.postgres_connection(**dead):
+                pass
+
+    blocked = threading.Thread(target=borrow_dead)
+    blocked.start()
+    connecting.wait(5)
+    try:
+        started = time.monotonic()
+        with registry.postgres_connection(**DSN):
+            pass
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        blocked.join()
+
+@patch('psycopg2.connect')
+def test_exhausted_postgres_pool_waits_for_a_connection(mock_connect):
+    """Test a borrower past max_connections waits instead of raising PoolError."""
+    mock_connect.return_value = MagicMock(closed=False)
+    registry = ConnectionRegistry({'connections': {'postgres': {'max_connections': 1}}})
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with registry.postgres_connection(**DSN):
+            held.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    held.wait(5)
+    try:
+        threading.Timer(0.2, release.set).start()
+        started = time.monotonic()
+        with registry.postgres_connection(**DSN) as conn:
+            assert conn is mock_connect.return_value
+        assert time.monotonic() - started >= 0.15
+    finally:
+        release.set()
+        holder.join()
+        registry.close_all()
+
+@patch('psycopg2.connect')
+def test_exhausted_postgres_pool_times_out(mock_connect):
+    mock_connect.return_value = MagicMock(closed=False)
+    registry = ConnectionRegistry({
+        'connections': {'postgres': {'max_connections': 1, 'acquire_timeout_seconds': 0.1}}
+    })
+    try:
+        with registry.postgres_connection(**DSN):
+            with pytest.raises(PoolError, match="freed within"):
+                with registry.postgres_connection(**DSN):
+                    pass
+        # The timed-out borrower did not leak a slot
+        with registry.postgres_connection(**DSN):
+            pass
+    finally:
+        registry.close_all()
@@ -0,0 +1,110 @@
+import threading
+import time
+import pytest
+from src.utils.fan_out import fan_out
+
+def test_fan_out_ordered_yields_task_by_task():
+    def slow_first():
+        time.sleep(0.2)
+        yield from [1, 2]
+
+    items = list(fan_out([slow_first, lambda: [3, 4]], max_workers=2, queue_size=1, ordered=True))
+    assert items == [1, 2, 3, 4]
+
+def test_fan_out_unordered_yields_every_item():
+    producers = [lambda i=i: range(i * 10, i * 10 + 5) for i in range(4)]
+    items = list(fan_out(producers, max_workers=2, queue_size=2))
+    assert sorted(items) == [i * 10 + j for i in range(4) for j in range(5)]
+
+def test_fan_out_raises_producer_error():
+    def broken():
+        yield 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        list(fan_out([broken], max_workers=1, queue_size=1))
+
+def test_fan_out_reports_errors_and_completions():
+    done, failed = [], []
+
+    def broken():
+        raise ValueError("boom")
+
+    items = list(fan_out(
+        [lambda: [1], broken],
+        max_workers=2,
+        queue_size=1,
+        on_done=done.append,
+        on_error=lambda task, error: failed.append((task, str(error)))
+    ))
+    assert items == [1]
+    assert done == [0]
+    assert failed == [(1, "boom")]
+
+def test_fan_out_abandons_tasks_past_timeout():
+    release = threading.Event()
+    failed = []
+
+    def stuck():
+        release.wait(5)
+        yield 1
+
+    try:
+        items = list(fan_out(
+            [stuck, lambda: [2]],
+            max_workers=2,
+            queue_size=1,
+            task_timeout=0.2,
+            on_error=lambda task, error: failed.append((task, type(error))),
+            wait=False
+        ))
+    finally:
+        release.set()
+    assert items == [2]
+    assert failed == [(0, TimeoutError)]
+
+def test_fan_out_times_out_hung_task_while_others_produce():
+    release = threading.Event()
+    failed_at = []
+
+    def stuck():
+        release.wait(5)
+        yield -1
+
+    def quick(i):
+        time.sleep(0.03)
+        yield i
+
+    started = time.monotonic()
+    try:
+        items = list(fan_out(
+            [stuck] + [lambda i=i: quick(i) for i in range(20)],
+            max_workers=2,
+            queue_size=1,
+            task_timeout=0.2,
+            on_error=lambda task, error: failed_at.append(time.monotonic() - started),
+            wait=False
+        ))
+    finally:
+        release.set()
+    assert sorted(items) == list(range(20))
+    assert len(failed_at) == 1
+    # Timed out while the other tasks were still producing
+    assert failed_at[0] < 0.45
+
+def test_fan_out_close_stops_producers():
+    produced = []
+
+    def endless():
+        i = 0
+        while True:
+            produced.append(i)
+            yield i
+            i += 1
+
+    items = fan_out([endless], max_workers=1, queue_size=1)
+    assert next(items) == 0
+    items.close()
+    count = len(produced)
+    time.sleep(0.3)
+    assert len(produced) == count
@@ -0,0 +1,71 @@
+import time
+import pytest
+from src.utils.health import CircuitBreaker, HealthRegistry
+
+@pytest.fixture
+def health():
+    return HealthRegistry({'health': {
+        'cache_ttl_seconds': 60, 'failure_threshold': 2, 'reset_timeout_seconds': 0.05
+    }})
+
+def test_circuit_breaker_opens_after_threshold():
+    breaker = CircuitBreaker('db', failure_threshold=2, reset_timeout=60)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+def test_circuit_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker('db', failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A failed trial re-opens immediately; a successful one closes
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_health_check_results_are_cached(health):
+    calls = []
+
+    def probe():
+        calls.append(1)
+        return True
+
+    assert health.check('db', probe)
+    assert health.check('db', probe)
+    assert len(calls) == 1
+
+    assert health.check('db', probe, force=True)
+    assert len(calls) == 2
+
+def test_open_circuit_skips_probe(health):
+    calls = []
+
+    def probe():
+        calls.append(1)
+        raise ConnectionError("refused")
+
+    assert not health.check('db', probe, force=True)
+    assert not health.check('db', probe, force=True)
+    assert not health.check('db', probe, force=True)
+
+    assert len(calls) == 2
+    assert health.status()['db']['circuit'] == CircuitBreaker.OPEN
+
+def test_record_failure_drops_cached_result(health):
+    assert health.check('db', lambda: True)
+    health.record_failure('db')
+    health.record_failure('db')
+
+    assert not health.check('db', lambda: True)
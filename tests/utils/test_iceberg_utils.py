@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import Mock, patch
+import pandas as pd
+import pyarrow as pa
+from src.utils.iceberg_utils import IcebergTableManager
+
+@pytest.fixture
+def manager(test_config):
+    with patch('src.utils.iceberg_utils.load_catalog'):
+        yield IcebergTableManager(test_config)
+
+def test_write_arrow_appends_without_copy(manager):
+    table = Mock()
+    data = pa.table({'value': [1.0, 2.0]})
+
+    assert manager.write_arrow(table, data) is True
+    table.append.assert_called_once_with(data)
+
+def test_write_arrow_overwrite(manager):
+    table = Mock()
+    data = pa.table({'value': [1.0]})
+
+    assert manager.write_arrow(table, data, overwrite=True) is True
+    table.overwrite.assert_called_once_with(data)
+    table.append.assert_not_called()
+
+def test_write_arrow_reports_failure(manager):
+    table = Mock()
+    table.append.side_effect = ValueError("schema mismatch")
+
+    assert manager.write_arrow(table, pa.table({'value': [1.0]})) is False
+
+def test_write_dataframe_converts_once(manager):
+    table = Mock()
+    df = pd.DataFrame({'metric_name': ['cpu'], 'value': [0.5]})
+
+    assert manager.write_dataframe(table, df) is True
+    written = table.append.call_args.args[0]
+    assert isinstance(written, pa.Table)
+    assert written.column_names == ['metric_name', 'value']
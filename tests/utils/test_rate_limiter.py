@@ -0,0 +1,55 @@
+import time
+import threading
+import pytest
+from src.utils.rate_limiter import TokenBucket, get_token_bucket
+
+def test_token_bucket_allows_burst():
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.1
+
+def test_token_bucket_enforces_rate():
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    start = time.monotonic()
+    for _ in range(5):
+        bucket.acquire()
+    # One token up front, then four refills at 20/s
+    assert time.monotonic() - start >= 0.18
+
+def test_token_bucket_shared_across_threads():
+    bucket = TokenBucket(rate=50.0, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.09
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    bucket.pause(0.2)
+    waited = bucket.acquire()
+    assert waited >= 0.19
+
+def test_token_bucket_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+
+def test_get_token_bucket_shared_per_key():
+    first = get_token_bucket('newrelic:shared', rate=10.0, capacity=5)
+    assert get_token_bucket('newrelic:shared', rate=10.0, capacity=5) is first
+    assert get_token_bucket('newrelic:other', rate=10.0, capacity=5) is not first
+
+def test_get_token_bucket_conflicting_limits_share_budget(caplog):
+    """Test collectors on one account share a bucket even when configured differently."""
+    first = get_token_bucket('newrelic:conflict', rate=10.0, capacity=5)
+
+    with caplog.at_level('WARNING'):
+        second = get_token_bucket('newrelic:conflict', rate=2.0, capacity=1)
+
+    assert second is first
+    assert (second.rate, second.capacity) == (10.0, 5)
+    assert 'already limits' in caplog.text
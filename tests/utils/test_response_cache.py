@@ -0,0 +1,72 @@
+import os
+import time
+import pytest
+from src.utils.response_cache import ResponseCache
+
+@pytest.fixture
+def response_cache(tmp_path):
+    return ResponseCache(str(tmp_path), max_bytes=1024)
+
+def test_response_cache_key_ignores_param_order():
+    a = ResponseCache.make_key('GET', 'https://x/metrics', {'page': 1, 'period': 60})
+    b = ResponseCache.make_key('get', 'https://x/metrics', {'period': 60, 'page': 1})
+    assert a == b
+    assert a != ResponseCache.make_key('GET', 'https://x/metrics', {'page': 2, 'period': 60})
+
+def test_response_cache_put_and_get(response_cache):
+    response_cache.put('key', b'{"a": 1}', ttl=60, etag='"v1"', extra={'links': {}})
+    entry = response_cache.get('key')
+    assert entry['body'] == b'{"a": 1}'
+    assert entry['etag'] == '"v1"'
+    assert ResponseCache.is_fresh(entry)
+    assert response_cache.get('missing') is None
+
+def test_response_cache_expiry_and_refresh(response_cache):
+    response_cache.put('stale', b'{}', ttl=-1)
+    entry = response_cache.get('stale')
+    assert not ResponseCache.is_fresh(entry)
+
+    response_cache.refresh('stale', entry, ttl=None)
+    assert ResponseCache.is_fresh(response_cache.get('stale'))
+
+def test_response_cache_evicts_least_recently_used(response_cache, tmp_path):
+    response_cache.put('old', b'x' * 400)
+    response_cache.put('used', b'x' * 400)
+    past = time.time() - 100
+    os.utime(tmp_path / 'old.meta.json', (past, past))
+    os.utime(tmp_path / 'used.meta.json', (past - 10, past - 10))
+    response_cache.get('used')
+
+    response_cache.put('new', b'x' * 400)
+
+    assert response_cache.get('old') is None
+    assert response_cache.get('used') is not None
+    assert response_cache.get('new') is not None
+
+def test_response_cache_put_does_not_rescan_entries(response_cache, monkeypatch):
+    """Test writes use the in-memory index instead of reading every entry's metadata."""
+    response_cache.put('first', b'x' * 400)
+
+    def fail_load(f):
+        raise AssertionError("metadata read during put")
+
+    monkeypatch.setattr('src.utils.response_cache.json.load', fail_load)
+    response_cache.put('second', b'x' * 400)
+    response_cache.put('third', b'x' * 400)
+
+    monkeypatch.undo()
+    assert response_cache.get('first') is None
+    assert response_cache.get('third') is not None
+
+def test_response_cache_index_survives_restart(response_cache, tmp_path):
+    response_cache.put('old', b'x' * 400)
+    response_cache.put('used', b'x' * 400)
+    past = time.time() - 100
+    os.utime(tmp_path / 'old.meta.json', (past - 10, past - 10))
+    os.utime(tmp_path / 'used.meta.json', (past, past))
+
+    reopened = ResponseCache(str(tmp_path), max_bytes=1024)
+    reopened.put('new', b'x' * 400)
+
+    assert reopened.get('old') is None
+    assert reopened.get('used') is not None
@@ -0,0 +1,37 @@
+import pytest
+import pyarrow as pa
+from src.utils.state_store import StateStore
+
+@pytest.fixture
+def state_store(tmp_path):
+    return StateStore({'state': {'path': str(tmp_path)}})
+
+def test_state_store_load_default(state_store):
+    assert state_store.load('missing') is None
+    assert state_store.load('missing', default={}) == {}
+
+def test_state_store_save_and_load(state_store):
+    state_store.save('mongodb.db.metrics.watermark', {'timestamp': '2024-01-01T00:00:00'})
+    assert state_store.load('mongodb.db.metrics.watermark') == {'timestamp': '2024-01-01T00:00:00'}
+
+def test_state_store_overwrite_leaves_no_temp_files(state_store, tmp_path):
+    state_store.save('key', 1)
+    state_store.save('key', 2)
+    assert state_store.load('key') == 2
+    assert [p.name for p in tmp_path.iterdir()] == ['key.json']
+
+def test_state_store_delete(state_store):
+    state_store.save('key', 'value')
+    state_store.delete('key')
+    assert state_store.load('key') is None
+
+def test_state_store_save_and_load_table(state_store, tmp_path):
+    table = pa.table({'timestamp': [1, 2], 'value': [1.5, 2.5]})
+    assert state_store.load_table('windows.2024-01-01') is None
+
+    state_store.save_table('windows.2024-01-01', table)
+    assert state_store.load_table('windows.2024-01-01').equals(table)
+    assert [p.name for p in tmp_path.iterdir()] == ['windows.2024-01-01.parquet']
+
+    state_store.delete('windows.2024-01-01')
+    assert state_store.load_table('windows.2024-01-01') is None